@@ -2,11 +2,19 @@ from typing import List, Optional
 from decimal import Decimal
 from django.db import connection
 from shared.domain.value_objects import ClientId, MoneySigned, SellerId
+from shared.infrastructure.reference_data import reference_data
+from shared.infrastructure.stored_procedures import StoredProcedure, StoredProcedureRow
 from ..domain.entities import Cliente, ResumenCliente, ClientFilterCriteria
 from ..domain.repository import ClienteRepository
 from .models import ClienteModel
 
 
+class ResumenClienteRow(StoredProcedureRow):
+    """pp_consulta_edo_cuenta_consolidado_cliente: columnas usadas del resumen por cliente"""
+    __slots__ = ('por_vencer', 'cantidad_por_vencer', 'cantidad_vencidos', 'creditos', 'vencido', 'dias_promedio')
+    positions = {'por_vencer': 2, 'cantidad_por_vencer': 3, 'cantidad_vencidos': 4, 'creditos': 6, 'vencido': 11, 'dias_promedio': 14}
+
+
 class DjangoClienteRepository(ClienteRepository):
     
     def find_by_id(self, entity_id: ClientId) -> Optional[Cliente]:
@@ -31,12 +39,8 @@ class DjangoClienteRepository(ClienteRepository):
     def find_by_seller(self, seller_id: SellerId) -> List[Cliente]:
         cliente_models = ClienteModel.objects.all().order_by('dias_ult_fact', 'nombre')
         
-        if seller_id and seller_id.value != "-1":
-            seller_codes = []
-            if "," in seller_id.value:
-                seller_codes = [c.strip() for c in seller_id.value.split(",")]
-            else:
-                seller_codes.append(seller_id.value)
+        if seller_id and seller_id.codes:
+            seller_codes = seller_id.codes
             
             cliente_models = cliente_models.filter(vendedor_id__in=seller_codes).order_by('dias_ult_fact', 'nombre')
        
@@ -55,12 +59,8 @@ class DjangoClienteRepository(ClienteRepository):
         else:
             cliente_models = ClienteModel.objects.filter(nombre__icontains=nombre).order_by('dias_ult_fact','nombre')
         
-        if seller_id and seller_id.value != "-1":
-            seller_codes = [] 
-            if "," in seller_id.value: 
-                seller_codes = [c.strip() for c in seller_id.value.split(",")]
-            else:
-                seller_codes.append(seller_id.value)
+        if seller_id and seller_id.codes:
+            seller_codes = seller_id.codes
 
             cliente_models = cliente_models.filter(vendedor_id__in=seller_codes).order_by('dias_ult_fact', 'nombre')
         
@@ -74,12 +74,8 @@ class DjangoClienteRepository(ClienteRepository):
             qs = qs.filter(nombre__icontains=nombre)
 
         # Seller filter
-        if seller_id and seller_id.value != "-1":
-            seller_codes = []
-            if "," in seller_id.value:
-                seller_codes = [c.strip() for c in seller_id.value.split(",")]
-            else:
-                seller_codes.append(seller_id.value)
+        if seller_id and seller_id.codes:
+            seller_codes = seller_id.codes
             qs = qs.filter(vendedor_id__in=seller_codes)
 
         # Map numeric buckets
@@ -162,23 +158,20 @@ class DjangoClienteRepository(ClienteRepository):
             
             # Consulta simulada para obtener resumen de cobranzas
             # En una implementación real, esto vendría de las tablas de documentos/cobranzas
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                   EXEC [pp_consulta_edo_cuenta_consolidado_cliente] @co_cli = %s
-                """, [cliente_id.value])
-                
-                row = cursor.fetchone()
-                if row:
-                    #vencido, por_vencer, creditos, cantidad, dias_promedio = row
-                    vencido = row[11] if row[11] > 0 else 0
-                    por_vencer = row[2] if row[2] > 0 else 0
-                    creditos = row[6] if row[6] >= 0 else row[6] * -1
-                    cantidad_vencidos = row[4]
-                    cantidad_documentos = row[3] + row[4]
-                    dias_promedio = row[14]
-                else:
-                    # Datos de ejemplo si no hay documentos
-                    vencido, por_vencer, creditos, cantidad, dias_promedio = Decimal('0'), Decimal('0'), Decimal('0'), 0, 0
+            with StoredProcedure('[pp_consulta_edo_cuenta_consolidado_cliente]', {'co_cli': cliente_id.value}) as sp:
+                row = sp.one(ResumenClienteRow)
+
+            if row:
+                vencido = row.vencido if row.vencido > 0 else 0
+                por_vencer = row.por_vencer if row.por_vencer > 0 else 0
+                creditos = row.creditos if row.creditos >= 0 else row.creditos * -1
+                cantidad_vencidos = row.cantidad_vencidos
+                cantidad_documentos = row.cantidad_por_vencer + row.cantidad_vencidos
+                dias_promedio = row.dias_promedio
+            else:
+                # Datos de ejemplo si no hay documentos
+                vencido, por_vencer, creditos, dias_promedio = Decimal('0'), Decimal('0'), Decimal('0'), 0
+                cantidad_documentos, cantidad_vencidos = 0, 0
             
             # TODO: AGREGAR LOS CAMPOS QUE FALTAN EN EL S.P. 
             return ResumenCliente(
@@ -261,7 +254,7 @@ class DjangoClienteRepository(ClienteRepository):
             telefono=model.telefono,
             email=model.email,
             direccion=model.direccion,
-            vendedor=model.vendedor.nombre if model.vendedor else None,
+            vendedor=reference_data.vendedor_nombre(model.vendedor_id) if model.vendedor_id else None,
             dias_ult_fact=model.dias_ult_fact,
             dias_promedio_emision=model.dias_promedio_emision,
             vencido=model.vencido,
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional, List
+from typing import Dict, Optional, List
 from decimal import Decimal
 
 
@@ -61,6 +61,32 @@ class FiltroDocumentosRequest:
     fecha_desde: Optional[date] = None
     fecha_hasta: Optional[date] = None
 
+@dataclass
+class DocumentosPendientesPageRequest:
+    seller_id: str
+    cursor: Optional[str] = None
+    limit: int = 100
+
+
+@dataclass
+class DocumentosPendientesPageResponse:
+    documentos: List[DocumentoResponse]
+    next_cursor: Optional[str] = None
+
+@dataclass
+class EventosClientePageRequest:
+    client_id: str
+    since: Optional[date] = None
+    until: Optional[date] = None
+    cursor: Optional[str] = None
+    limit: int = 100
+
+
+@dataclass
+class EventosClientePageResponse:
+    eventos: List[Dict]
+    next_cursor: Optional[str] = None
+
 @dataclass
 class EventoResponse:
     id: str
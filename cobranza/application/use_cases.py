@@ -1,18 +1,22 @@
-from typing import List
+from typing import Dict, Iterator, List
 from django.template.loader import render_to_string
-import pdfkit
 
 from shared.application.use_case import UseCase
 from shared.domain.value_objects import DocumentId, ClientId, MoneySigned, SellerId
-from shared.domain.exceptions import EntityNotFoundException
-from ..domain.entities import Documento, TipoDocumento, EstadoDocumento, Evento
+from shared.domain.exceptions import EntityNotFoundException, ValidationException
+from shared.infrastructure.pdf_renderer import PdfDocument, PdfRenderer, pdf_renderer as default_pdf_renderer
+from shared.infrastructure.pdf_jobs import PdfBundleJobs, pdf_jobs as default_pdf_jobs
+from ..domain.entities import Documento, TipoDocumento, EstadoDocumento
 from ..domain.repository import DocumentoRepository, EventoRepository
 from .dtos import (
     CrearDocumentoRequest, 
     DocumentoResponse, 
     ResumenCobranzasResponse,
     FiltroDocumentosRequest,
-    EventoResponse
+    DocumentosPendientesPageRequest,
+    DocumentosPendientesPageResponse,
+    EventosClientePageRequest,
+    EventosClientePageResponse
 )
 
 
@@ -77,6 +81,22 @@ class ObtenerDocumentosUseCase(UseCase[FiltroDocumentosRequest, List[DocumentoRe
         )
 
 
+class StreamDocumentosUseCase(ObtenerDocumentosUseCase):
+    """Como ObtenerDocumentosUseCase pero como iterador; sin filtros recorre la tabla con un cursor del servidor"""
+
+    def __init__(self, documento_repository: DocumentoRepository, chunk_size: int = 2000):
+        super().__init__(documento_repository)
+        self.chunk_size = chunk_size
+
+    def execute(self, request: FiltroDocumentosRequest) -> Iterator[DocumentoResponse]:
+        if request.cliente_id or request.estado or (request.fecha_desde and request.fecha_hasta):
+            yield from super().execute(request)
+            return
+
+        for doc in self.documento_repository.iter_all(self.chunk_size):
+            yield self._to_response(doc)
+
+
 # class ObtenerResumenCobranzasUseCase(UseCase[str, ResumenCobranzasResponse]):
     
 #     def __init__(self, documento_repository: DocumentoRepository):
@@ -124,6 +144,18 @@ class ObtenerDocumentosVencidosUseCase(UseCase[None, List[DocumentoResponse]]):
         )
 
 
+class StreamDocumentosVencidosUseCase(ObtenerDocumentosVencidosUseCase):
+    """Documentos vencidos como iterador, para respuestas en streaming"""
+
+    def __init__(self, documento_repository: DocumentoRepository, chunk_size: int = 2000):
+        super().__init__(documento_repository)
+        self.chunk_size = chunk_size
+
+    def execute(self, _: None) -> Iterator[DocumentoResponse]:
+        for doc in self.documento_repository.iter_vencidos(self.chunk_size):
+            yield self._to_response(doc)
+
+
 class VerDocumentosPendientesUseCase(UseCase[str, List[DocumentoResponse]]):
     
     def __init__(self, documento_repository: DocumentoRepository):
@@ -155,63 +187,78 @@ class VerDocumentosPendientesUseCase(UseCase[str, List[DocumentoResponse]]):
         )
 
 
-class VerDocumentosPendientesClienteUseCase(UseCase[str, List[DocumentoResponse]]):
-    
+class VerDocumentosPendientesPaginadoUseCase(VerDocumentosPendientesUseCase):
+    """Documentos pendientes de a una página por vez (keyset sobre fecha_vencimiento, id)"""
+
+    def execute(self, request: DocumentosPendientesPageRequest) -> DocumentosPendientesPageResponse:
+        page = self.documento_repository.find_documentos_pendientes_page(
+            request.seller_id, request.cursor, request.limit
+        )
+
+        return DocumentosPendientesPageResponse(
+            documentos=[self._to_response(doc) for doc in page.items],
+            next_cursor=page.next_cursor
+        )
+
+
+class StreamDocumentosPendientesUseCase(VerDocumentosPendientesUseCase):
+    """Documentos pendientes como iterador, para respuestas en streaming"""
+
+    def __init__(self, documento_repository: DocumentoRepository, chunk_size: int = 2000):
+        super().__init__(documento_repository)
+        self.chunk_size = chunk_size
+
+    def execute(self, seller_id: str) -> Iterator[DocumentoResponse]:
+        for doc in self.documento_repository.iter_documentos_pendientes(seller_id, self.chunk_size):
+            yield self._to_response(doc)
+
+
+class ProyeccionDocumentosPendientesUseCase(UseCase[str, List[Dict]]):
+    """Lectura rápida de documentos pendientes: filas de respuesta sin construir entidades"""
+
     def __init__(self, documento_repository: DocumentoRepository):
         self.documento_repository = documento_repository
-    
-    def execute(self, client_id: str) -> List[DocumentoResponse]:
-        # Obtener todos los documentos pendientes (vencidos y por vencer)
-        documentos_pendientes = self.documento_repository.find_documentos_pendientes_cliente(client_id)
-        
-        return [self._to_response(doc) for doc in documentos_pendientes]
-    
-    def _to_response(self, documento: Documento) -> DocumentoResponse:
-        return DocumentoResponse(
-            id=documento.id.value,
-            cliente_id=documento.cliente_id.value,
-            numero=documento.numero,
-            tipo=documento.tipo.value,
-            monto=documento.monto.amount,
-            fecha_emision=documento.fecha_emision,
-            fecha_vencimiento=documento.fecha_vencimiento,
-            estado=documento.estado.value,
-            dias_vencimiento=documento.dias_vencimiento,
-            esta_vencido=documento.esta_vencido,
-            descripcion=documento.descripcion,
-            cliente_nombre=getattr(documento, 'cliente_nombre', ''),
-            vendedor_id=documento.vendedor_id.value,
-            empresa=documento.empresa,
-            saldo=documento.saldo.amount
-        )
 
+    def execute(self, seller_id: str) -> List[Dict]:
+        return self.documento_repository.find_documentos_pendientes_rows(seller_id)
+
+
+class ProyeccionDocumentosPendientesClienteUseCase(UseCase[str, List[Dict]]):
+    """Lectura rápida de documentos pendientes de un cliente: filas de respuesta sin construir entidades"""
+
+    def __init__(self, documento_repository: DocumentoRepository):
+        self.documento_repository = documento_repository
+
+    def execute(self, client_id: str) -> List[Dict]:
+        return self.documento_repository.find_documentos_pendientes_cliente_rows(client_id)
+
+
+class ProyeccionEventosClienteUseCase(UseCase[str, List[Dict]]):
+    """Lectura rápida de eventos de un cliente: filas de respuesta sin construir entidades"""
 
-class EventosClienteUseCase(UseCase[str, List[EventoResponse]]):
-    
     def __init__(self, evento_repository: EventoRepository):
         self.evento_repository = evento_repository
-    
-    def execute(self, client_id: str) -> List[EventoResponse]:
-        # Obtener todos los documentos pendientes (vencidos y por vencer)
-        documentos_pendientes = self.evento_repository.find_eventos_cliente(client_id)
-        
-        return [self._to_response(doc) for doc in documentos_pendientes]
-       
-    def _to_response(self, evento: Evento) -> EventoResponse:
-        return EventoResponse(
-            id=evento.id.value,
-            cliente_id=evento.cliente_id.value,
-            company_id=evento.company_id,
-            tipo=evento.tipo.value,
-            numero=evento.numero,
-            fecha_emision=evento.fecha_emision,
-            fecha_vencimiento=evento.fecha_vencimiento,
-            monto=evento.monto.amount,
-            saldo=evento.saldo.amount,
-            descripcion=evento.descripcion,
-            dias_vencimiento=evento.dias_vencimiento
+
+    def execute(self, client_id: str) -> List[Dict]:
+        return self.evento_repository.find_eventos_cliente_rows(client_id)
+
+
+class VerEventosClientePaginadoUseCase(UseCase[EventosClientePageRequest, EventosClientePageResponse]):
+    """Línea de tiempo del cliente de a una página (keyset sobre fec_emis, id), acotada por fechas"""
+
+    def __init__(self, evento_repository: EventoRepository):
+        self.evento_repository = evento_repository
+
+    def execute(self, request: EventosClientePageRequest) -> EventosClientePageResponse:
+        if request.since and request.until and request.since > request.until:
+            raise ValidationException("since debe ser anterior o igual a until")
+
+        page = self.evento_repository.find_eventos_cliente_page(
+            request.client_id, request.since, request.until, request.cursor, request.limit
         )
 
+        return EventosClientePageResponse(eventos=page.items, next_cursor=page.next_cursor)
+
 
 class VerDetalleDocumentoClienteUseCase(UseCase[str, DocumentoResponse]):
     
@@ -252,17 +299,52 @@ class VerDetalleDocumentoClienteUseCase(UseCase[str, DocumentoResponse]):
         )
 
 
-class CreateDocumentPdfUseCase(UseCase[str, bytes]):
+class VerDetallesDocumentosUseCase(VerDetalleDocumentoClienteUseCase):
+    """Detalle de varios documentos a la vez, por id; los no encontrados se omiten del resultado"""
+
+    def execute(self, documento_ids: List[str]) -> Dict[str, DocumentoResponse]:
+        detalles = self.documento_repository.get_detalles_documentos(documento_ids)
+
+        return {doc_id: self._to_response(documento) for doc_id, documento in detalles.items()}
+
+
+class CreateDocumentPdfUseCase(UseCase[str, PdfDocument]):
     """Genera un PDF de una factura/documento usando la plantilla invoices.html"""
 
-    def __init__(self, documento_repository: DocumentoRepository):
+    # Opciones básicas para wkhtmltopdf/pdfkit
+    options = {
+        'page-size': 'Letter',
+        'margin-top': '0.01in',
+        'margin-right': '0.01in',
+        'margin-bottom':'0.01in',
+        'margin-left':'0.01in',
+        'encoding': 'UTF-8',
+        'enable-local-file-access': None,
+        'quiet': ''
+    }
+
+    def __init__(self, documento_repository: DocumentoRepository, pdf_renderer: PdfRenderer = default_pdf_renderer):
         self.documento_repository = documento_repository
+        self.pdf_renderer = pdf_renderer
 
-    def execute(self, documento_id: str) -> bytes:
+    def execute(self, documento_id: str) -> PdfDocument:
         documento = self.documento_repository.get_detalle_documento(documento_id)
         if not documento:
             raise EntityNotFoundException(f"Documento con ID {documento_id} no encontrado")
 
+        return self._render([documento], name=f'documento {documento_id}')
+
+    def _render(self, documentos: List[Documento], name: str) -> PdfDocument:
+        """Todas las facturas van en un solo HTML (invoices.html pagina cada una) y un solo render"""
+        context = {
+            'facturas': [self._factura_context(documento) for documento in documentos]
+        }
+
+        html = render_to_string('invoices.html', context)
+
+        return self.pdf_renderer.render_document(html, self.options, name=name)
+
+    def _factura_context(self, documento: Documento) -> dict:
         # Adaptar datos al contexto esperado por templates/invoices.html
         productos = getattr(documento, 'productos', []) or []
 
@@ -278,7 +360,7 @@ class CreateDocumentPdfUseCase(UseCase[str, bytes]):
                 'tipoImpuesto': prod.get('tipo_impuesto', '')
             })
 
-        factura_ctx = {
+        return {
             'factura': documento.numero,
             'cliente': getattr(documento, 'cliente_nombre', ''),
             'rif': getattr(documento, 'cliente_rif', ''),
@@ -294,34 +376,46 @@ class CreateDocumentPdfUseCase(UseCase[str, bytes]):
             'tot_neto': float(getattr(documento, 'total', documento.monto.amount) or 0)
         }
 
-        context = {
-            'facturas': [factura_ctx]
-        }
 
-        html = render_to_string('invoices.html', context)
+class CreateDocumentsPdfUseCase(CreateDocumentPdfUseCase):
+    """Varias facturas en un solo PDF: por lista de IDs de documento o todas las pendientes de un cliente"""
 
-        # Opciones básicas para wkhtmltopdf/pdfkit
-        options = {
-            'page-size': 'Letter',
-            'margin-top': '0.01in',
-            'margin-right': '0.01in',
-            'margin-bottom':'0.01in',
-            'margin-left':'0.01in',
-            'encoding': 'UTF-8',
-            'enable-local-file-access': None,
-            'quiet': ''
-        }
+    MAX_DOCUMENTOS = 200
+
+    def execute(self, documento_ids: List[str]) -> PdfDocument:
+        if not documento_ids:
+            raise ValidationException("Debe indicar al menos un documento")
+        if len(documento_ids) > self.MAX_DOCUMENTOS:
+            raise ValidationException(f"Máximo {self.MAX_DOCUMENTOS} documentos por PDF")
+
+        detalles = self.documento_repository.get_detalles_documentos(documento_ids)
+        documentos = [detalles[doc_id] for doc_id in dict.fromkeys(documento_ids) if doc_id in detalles]
+        if not documentos:
+            raise EntityNotFoundException(f"Documentos {', '.join(documento_ids)} no encontrados")
 
-        pdf_bytes = pdfkit.from_string(html, False, options=options)
-        return pdf_bytes
+        return self._render(documentos, name=f'{len(documentos)} documentos')
+
+    def execute_cliente(self, client_id: str) -> PdfDocument:
+        # Uno más que el máximo para saber si se excede sin leer todos los pendientes
+        documentos = self.documento_repository.get_detalles_pendientes_cliente(client_id, limit=self.MAX_DOCUMENTOS + 1)
+        if not documentos:
+            raise EntityNotFoundException(f"El cliente {client_id} no tiene facturas pendientes")
+        if len(documentos) > self.MAX_DOCUMENTOS:
+            raise ValidationException(
+                f"El cliente {client_id} tiene más de {self.MAX_DOCUMENTOS} facturas pendientes: "
+                f"indique los documentos por ID (máximo {self.MAX_DOCUMENTOS} por PDF)"
+            )
+
+        return self._render(documentos, name=f'facturas pendientes {client_id}')
     
-class CreateBalancePdfUseCase(UseCase[str, bytes]):
+class CreateBalancePdfUseCase(UseCase[str, PdfDocument]):
     """Genera un PDF de un balance usando la plantilla balance.html"""
 
-    def __init__(self, documento_repository: DocumentoRepository):
+    def __init__(self, documento_repository: DocumentoRepository, pdf_renderer: PdfRenderer = default_pdf_renderer):
         self.documento_repository = documento_repository
+        self.pdf_renderer = pdf_renderer
 
-    def execute(self, rif: str) -> bytes:
+    def execute(self, rif: str) -> PdfDocument:
         estado_cuenta = self.documento_repository.get_estado_cuenta(rif)
         if not estado_cuenta:
             raise EntityNotFoundException(f"Estado de cuenta para cliente/rif {rif} no encontrado")
@@ -380,16 +474,16 @@ class CreateBalancePdfUseCase(UseCase[str, bytes]):
             'quiet': ''
         }
 
-        pdf_bytes = pdfkit.from_string(html, False, options=options)
-        return pdf_bytes
+        return self.pdf_renderer.render_document(html, options, name=f'balance {rif}')
 
-class CreateSellerBalancePdfUseCase(UseCase[str, bytes]):
+class CreateSellerBalancePdfUseCase(UseCase[str, PdfDocument]):
     """Genera un PDF de un balance usando la plantilla balance.html"""
 
-    def __init__(self, documento_repository: DocumentoRepository):
+    def __init__(self, documento_repository: DocumentoRepository, pdf_renderer: PdfRenderer = default_pdf_renderer):
         self.documento_repository = documento_repository
+        self.pdf_renderer = pdf_renderer
 
-    def execute(self, seller_ids: str) -> bytes:
+    def execute(self, seller_ids: str) -> PdfDocument:
         estado_cuenta = self.documento_repository.get_estado_cuenta_vendedor(seller_ids)
         if not estado_cuenta:
             raise EntityNotFoundException(f"Estado de cuenta para vendedores {seller_ids} no encontrado")
@@ -434,5 +528,31 @@ class CreateSellerBalancePdfUseCase(UseCase[str, bytes]):
             'quiet': ''
         }
 
-        pdf_bytes = pdfkit.from_string(html, False, options=options)
-        return pdf_bytes
\ No newline at end of file
+        return self.pdf_renderer.render_document(html, options, name=f'balance vendedor {seller_ids}')
+
+
+class CrearTrabajoBalancesVendedoresUseCase(UseCase[str, str]):
+    """Encola un trabajo que genera el balance de cada vendedor en paralelo y los entrega en un ZIP.
+
+    Retorna el id del trabajo; el estado y el ZIP se consultan con PdfBundleJobs.
+    """
+
+    MAX_VENDEDORES = 200
+
+    def __init__(self, documento_repository: DocumentoRepository, pdf_renderer: PdfRenderer = default_pdf_renderer,
+                 jobs: PdfBundleJobs = default_pdf_jobs):
+        self.balance_use_case = CreateSellerBalancePdfUseCase(documento_repository, pdf_renderer)
+        self.jobs = jobs
+
+    def execute(self, seller_ids: str) -> str:
+        codes = list(dict.fromkeys(c.strip() for c in (seller_ids or "").split(",") if c.strip()))
+        if not codes:
+            raise ValidationException("Debe indicar al menos un vendedor")
+        if len(codes) > self.MAX_VENDEDORES:
+            raise ValidationException(f"Máximo {self.MAX_VENDEDORES} vendedores por trabajo")
+
+        return self.jobs.submit(
+            codes,
+            render=lambda code: self.balance_use_case.execute(code).content,
+            filename=lambda code: f"balance_vendedor_{code}.pdf"
+        )
@@ -1,11 +1,11 @@
 from abc import abstractmethod
-from ast import Dict
 from pickle import DICT
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import date
 from shared.infrastructure.repository import Repository
+from shared.infrastructure.pagination import Page
 from shared.domain.value_objects import DocumentId, ClientId, SellerId, EventId
-from .entities import Documento, ResumenCobranzas, EstadoDocumento, Evento
+from .entities import Documento, ResumenCobranzas, EstadoDocumento, Evento, TipoDocumento
 
 
 class DocumentoRepository(Repository[Documento, DocumentId]):
@@ -17,6 +17,14 @@ class DocumentoRepository(Repository[Documento, DocumentId]):
     @abstractmethod
     def find_vencidos(self) -> List[Documento]:
         pass
+
+    @abstractmethod
+    def iter_all(self, chunk_size: int = 2000) -> Iterator[Documento]:
+        pass
+
+    @abstractmethod
+    def iter_vencidos(self, chunk_size: int = 2000) -> Iterator[Documento]:
+        pass
     
     @abstractmethod
     def find_by_fecha_vencimiento(self, fecha_desde: date, fecha_hasta: date) -> List[Documento]:
@@ -38,10 +46,26 @@ class DocumentoRepository(Repository[Documento, DocumentId]):
     def find_documentos_pendientes(self, seller_id: str) -> List[Documento]:
         pass
 
+    @abstractmethod
+    def find_documentos_pendientes_page(self, seller_id: str, cursor: Optional[str], limit: int) -> Page[Documento]:
+        pass
+
+    @abstractmethod
+    def iter_documentos_pendientes(self, seller_id: str, chunk_size: int = 2000) -> Iterator[Documento]:
+        pass
+
+    @abstractmethod
+    def find_documentos_pendientes_rows(self, seller_id: str) -> List[Dict]:
+        pass
+
     @abstractmethod
     def find_documentos_pendientes_cliente(self, cliente_id: ClientId) -> List[Documento]:
         pass
 
+    @abstractmethod
+    def find_documentos_pendientes_cliente_rows(self, client_id: str) -> List[Dict]:
+        pass
+
     @abstractmethod
     def get_ventas_trimestre(self, seller_id: SellerId) -> List[Dict]:
         pass
@@ -50,6 +74,15 @@ class DocumentoRepository(Repository[Documento, DocumentId]):
     def get_detalle_documento(self, documento_id: str) -> Optional[Documento]:
         pass
 
+    @abstractmethod
+    def get_detalles_documentos(self, documento_ids: List[str]) -> Dict[str, Documento]:
+        pass
+
+    @abstractmethod
+    def get_detalles_pendientes_cliente(self, client_id: str, tipo: str = TipoDocumento.FACTURA.value,
+                                        limit: Optional[int] = None) -> List[Documento]:
+        pass
+
     @abstractmethod
     def get_ventas_trimestre_cliente(self, client_id: ClientId) -> List[Dict]:
         pass
@@ -59,3 +92,12 @@ class EventoRepository(Repository[Evento, EventId]):
     @abstractmethod
     def find_eventos_cliente(self, client_id: str) -> List[Evento]:
         pass
+
+    @abstractmethod
+    def find_eventos_cliente_rows(self, client_id: str) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    def find_eventos_cliente_page(self, client_id: str, since: Optional[date], until: Optional[date],
+                                  cursor: Optional[str], limit: int) -> Page[Dict]:
+        pass
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from django.db.models import Sum, Count, Q, F, Func, IntegerField, QuerySet
+from django.db.models.functions import Now
+
+
+class DateDiff(Func):
+    function = "DATEDIFF"
+    template = "%(function)s(DAY, %(expressions)s)"
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Base SQLite local (settings.database sin MSSQL) y pruebas: días entre las fechas sin hora
+        inicio, fin = self.get_source_expressions()
+        inicio_sql, inicio_params = compiler.compile(inicio)
+        fin_sql, fin_params = compiler.compile(fin)
+        return (
+            f"CAST(julianday(date({fin_sql})) - julianday(date({inicio_sql})) AS INTEGER)",
+            (*fin_params, *inicio_params)
+        )
+
+
+TOTAL = 'total'
+CANTIDAD = 'cantidad'
+DIAS_VENCIDOS = 'dias_vencidos'
+
+
+@dataclass(frozen=True)
+class Bucket:
+    """Grupo de documentos (vencidos, por vencer, ...) definido por una condición sobre docum_cc"""
+    nombre: str
+    condicion: Q
+    metricas: Tuple[str, ...] = (TOTAL, CANTIDAD, DIAS_VENCIDOS)
+
+
+def _metric_expression(metrica: str, condicion: Q):
+    if metrica == TOTAL:
+        return Sum('saldo', filter=condicion, default=0)
+    if metrica == CANTIDAD:
+        return Count('id', filter=condicion)
+    if metrica == DIAS_VENCIDOS:
+        return Sum(DateDiff(F("fecha_vencimiento"), Now()), filter=condicion)
+    raise ValueError(f"Métrica no soportada: {metrica}")
+
+
+def _bucket_expressions(buckets: List[Bucket]) -> Dict[str, Any]:
+    expressions = {}
+    for bucket in buckets:
+        for metrica in bucket.metricas:
+            expressions[f"{bucket.nombre}_{metrica}"] = _metric_expression(metrica, bucket.condicion)
+    return expressions
+
+
+def _split_row(row: Dict[str, Any], buckets: List[Bucket]) -> Dict[str, Dict[str, Any]]:
+    return {
+        bucket.nombre: {metrica: row[f"{bucket.nombre}_{metrica}"] for metrica in bucket.metricas}
+        for bucket in buckets
+    }
+
+
+def aggregate_buckets(queryset: QuerySet, buckets: Iterable[Bucket]) -> Dict[str, Dict[str, Any]]:
+    """Calcula las métricas de todos los buckets en una sola consulta usando agregados filtrados.
+
+    Retorna un diccionario por bucket con las mismas claves que producía cada
+    ``aggregate()`` individual (``total``, ``cantidad``, ``dias_vencidos``).
+    """
+    buckets = list(buckets)
+    row = queryset.aggregate(**_bucket_expressions(buckets))
+    return _split_row(row, buckets)
+
+
+def aggregate_buckets_by(queryset: QuerySet, group_by: Iterable[str], buckets: Iterable[Bucket]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]]:
+    """Como aggregate_buckets pero agrupado (GROUP BY) por los campos indicados, también en una sola consulta.
+
+    Produce tuplas ``({campo: valor}, {bucket: {metrica: valor}})`` por grupo.
+    """
+    group_by = list(group_by)
+    buckets = list(buckets)
+    rows = queryset.order_by().values(*group_by).annotate(**_bucket_expressions(buckets))
+    for row in rows:
+        yield {field: row[field] for field in group_by}, _split_row(row, buckets)
+
+
+def empty_bucket_metrics(buckets: Iterable[Bucket]) -> Dict[str, Dict[str, Any]]:
+    return {bucket.nombre: {metrica: 0 for metrica in bucket.metricas} for bucket in buckets}
+
+
+def merge_bucket_metrics(partials: Iterable[Dict[str, Dict[str, Any]]], buckets: Iterable[Bucket]) -> Dict[str, Dict[str, Any]]:
+    """Suma resultados de aggregate_buckets calculados por separado (p. ej. por vendedor).
+
+    Todas las métricas son sumas o conteos, así que el resultado es el mismo que
+    agregar de una vez el conjunto completo. Los valores nulos cuentan como 0.
+    """
+    merged = empty_bucket_metrics(buckets)
+    for partial in partials:
+        for nombre, metricas in merged.items():
+            for metrica in metricas:
+                metricas[metrica] += partial[nombre][metrica] or 0
+    return merged
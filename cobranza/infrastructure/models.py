@@ -42,7 +42,7 @@ class DocumentoModel(models.Model):
     monto_bruto = models.DecimalField(db_column='monto_bru', max_digits=12, decimal_places=2, blank=True, null=True)
 
     #created_at = models.DateTimeField(db_column='fe_us_in', auto_now_add=True)
-    #updated_at = models.DateTimeField(db_column='fe_us_mo', auto_now=True)
+    updated_at = models.DateTimeField(db_column='fe_us_mo', blank=True, null=True)
     
     class Meta:
         managed = False
@@ -0,0 +1,90 @@
+"""Proyecciones de solo lectura para los listados de cobranza.
+
+Convierten tuplas de ``values_list`` directamente en las filas que devuelven las
+vistas, sin construir ``Documento``/``Evento`` ni sus value objects. Las filas
+tienen las mismas claves y tipos que las respuestas armadas a partir de entidades.
+"""
+from datetime import date, datetime
+from typing import Iterable, Iterator, Optional
+
+
+DOCUMENTO_PENDIENTE_FIELDS = (
+    'id', 'cliente_id', 'cliente__nombre', 'numero', 'tipo', 'monto', 'fecha_emision',
+    'fecha_vencimiento', 'estado', 'descripcion', 'vendedor_id', 'empresa', 'saldo'
+)
+
+EVENTO_FIELDS = (
+    'id', 'co_cli', 'company', 'doc_type', 'doc_number', 'fec_emis', 'fec_venc',
+    'amount', 'amount_pending', 'comment'
+)
+
+# Línea de tiempo paginada: solo lo que muestra cada renglón
+EVENTO_COMPACT_FIELDS = ('id', 'doc_type', 'doc_number', 'fec_emis', 'fec_venc', 'amount', 'amount_pending')
+
+
+def dias_desde(fecha, today: date) -> Optional[int]:
+    """Días transcurridos desde la fecha (positivo si ya pasó), como Documento.dias_vencimiento"""
+    if fecha is None:
+        return None
+    if isinstance(fecha, datetime):
+        fecha = fecha.date()
+    return (today - fecha).days
+
+
+def documento_pendiente_rows(rows: Iterable[tuple]) -> Iterator[dict]:
+    today = date.today()
+    for (doc_id, cliente_id, cliente_nombre, numero, tipo, monto, fecha_emision, fecha_vencimiento,
+         estado, descripcion, vendedor_id, empresa, saldo) in rows:
+        dias = dias_desde(fecha_vencimiento, today)
+        yield {
+            'id': doc_id,
+            'cliente_id': cliente_id,
+            'cliente_nombre': cliente_nombre,
+            'numero': numero,
+            'tipo': tipo,
+            'monto': float(monto),
+            'fecha_emision': fecha_emision,
+            'fecha_vencimiento': fecha_vencimiento,
+            'estado': estado,
+            'dias_vencimiento': dias,
+            'esta_vencido': dias is not None and dias > 0 and estado == 'PENDIENTE',
+            'descripcion': descripcion,
+            'vendedor_id': vendedor_id,
+            'empresa': empresa,
+            'saldo': float(saldo) if saldo is not None else 0.0
+        }
+
+
+def evento_rows(rows: Iterable[tuple]) -> Iterator[dict]:
+    today = date.today()
+    for (evento_id, co_cli, company, doc_type, doc_number, fec_emis, fec_venc,
+         amount, amount_pending, comment) in rows:
+        yield {
+            'id': evento_id,
+            'cliente_id': co_cli,
+            'company_id': company,
+            'tipo': doc_type,
+            'numero': doc_number,
+            'fecha_emision': fec_emis,
+            'fecha_vencimiento': fec_venc,
+            'monto': float(amount),
+            'saldo': float(amount_pending) if amount_pending else 0,
+            'descripcion': comment,
+            'dias_vencimiento': dias_desde(fec_venc, today),
+            'empresa': company
+        }
+
+
+def evento_compact_rows(rows: Iterable[tuple]) -> Iterator[dict]:
+    today = date.today()
+    for evento_id, doc_type, doc_number, fec_emis, fec_venc, amount, amount_pending in rows:
+        yield {
+            'id': evento_id,
+            'tipo': doc_type,
+            'numero': doc_number,
+            'fecha_emision': fec_emis,
+            'fecha_vencimiento': fec_venc,
+            'monto': float(amount),
+            'saldo': float(amount_pending) if amount_pending else 0,
+            'dias_vencimiento': dias_desde(fec_venc, today)
+        }
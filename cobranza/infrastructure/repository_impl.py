@@ -1,23 +1,44 @@
-from typing import List, Optional, Dict
+from typing import Any, Callable, Iterator, List, Optional, Dict
 from datetime import date
 from decimal import Decimal
 from django.db import models
-from django.db.models import Sum, Count, Q, Avg, ExpressionWrapper, F, FloatField, IntegerField, DecimalField , Max, Case, When, Value, BigIntegerField, Func
+from django.db.models import Sum, Count, Q, Avg, ExpressionWrapper, FloatField, DecimalField , Max, Case, When, Value, BigIntegerField
 from django.utils import timezone
 from django.db.models.functions import Now, Cast, Round
-from shared.domain.value_objects import DocumentId, ClientId, SellerId, EventId, MoneySigned
+from shared.domain.value_objects import ALL_SELLERS, DocumentId, ClientId, SellerId, EventId, MoneySigned, parse_seller_codes
 from ..domain.entities import Documento, TipoDocumento, EstadoDocumento, ResumenCobranzas, Evento, Balance, BalanceDocument, BalanceFooter, BalanceSeller, BalanceDocumentSeller
 from ..domain.repository import DocumentoRepository, EventoRepository
 from .models import DocumentoModel, VentaMes, VentaMesCliente, EventoModel
+from .aggregations import Bucket, TOTAL, aggregate_buckets, aggregate_buckets_by, empty_bucket_metrics, merge_bucket_metrics
+from .statement_cache import estado_cuenta_cache
+from .projections import DOCUMENTO_PENDIENTE_FIELDS, EVENTO_FIELDS, EVENTO_COMPACT_FIELDS, documento_pendiente_rows, evento_rows, evento_compact_rows
 from shared.domain.constants import MESES_ES 
 import calendar
 from shared.infrastructure.logging_impl import get_logger
+from shared.infrastructure.pagination import Page, decode_cursor, encode_cursor
+from shared.infrastructure.reference_data import reference_data
+from shared.infrastructure.seller_cache import invalidate_seller_cache, seller_cache
+from shared.infrastructure.stored_procedures import StoredProcedure, StoredProcedureRow
+from shared.domain.exceptions import ValidationException
 logger = get_logger(__name__)
 
-class DateDiff(Func):
-    function = "DATEDIFF"
-    template = "%(function)s(DAY, %(expressions)s)"
-    output_field = IntegerField()
+# Documentos por consulta de renglones: 3 parámetros cada uno, SQL Server admite hasta 2100
+_PRODUCTOS_CHUNK = 500
+
+
+class EstadoCuentaRow(StoredProcedureRow):
+    """pp_consulta_edo_cuenta_bot, primer result set"""
+    __slots__ = ('rif', 'cliente', 'vendedor', 'tipo', 'nro_doc', 'fec_emis', 'fec_venc', 'dias_ven', 'saldo', 'cobrado', 'total_neto')
+
+
+class EstadoCuentaVendedorRow(StoredProcedureRow):
+    """pp_consulta_edo_cuenta_consolidado_vendedor, primer result set"""
+    __slots__ = ('vendedor', 'rif', 'cliente', 'tipo', 'nro_doc', 'fec_emis', 'fec_venc', 'dias_ven', 'saldo', 'total_neto', 'orden')
+
+
+class EstadoCuentaResumenRow(StoredProcedureRow):
+    """Segundo result set de los estados de cuenta: totales por concepto"""
+    __slots__ = ('descripcion', 'valor')
 
 
 class DjangoDocumentoRepository(DocumentoRepository):
@@ -37,6 +58,7 @@ class DjangoDocumentoRepository(DocumentoRepository):
                 'co_ven': entity.co_ven 
             }
         )
+        invalidate_seller_cache([entity.vendedor_id.value] if entity.vendedor_id else None)
         return self._to_domain(documento_model)
     
     def find_by_id(self, entity_id: DocumentId) -> Optional[Documento]:
@@ -50,20 +72,32 @@ class DjangoDocumentoRepository(DocumentoRepository):
         documento_models = DocumentoModel.objects.all()
         return [self._to_domain(model) for model in documento_models]
     
+    def iter_all(self, chunk_size: int = 2000) -> Iterator[Documento]:
+        """Recorre todos los documentos con un cursor del servidor, sin cargarlos todos en memoria"""
+        for model in DocumentoModel.objects.order_by('id').iterator(chunk_size=chunk_size):
+            yield self._to_domain(model)
+    
     def delete(self, entity_id: DocumentId) -> None:
         DocumentoModel.objects.filter(id=entity_id.value).delete()
+        invalidate_seller_cache()
     
     def find_by_cliente(self, cliente_id: ClientId) -> List[Documento]:
         documento_models = DocumentoModel.objects.filter(cliente_id=cliente_id.value)
         return [self._to_domain(model) for model in documento_models]
     
     def find_vencidos(self) -> List[Documento]:
+        return [self._to_domain(model) for model in self._vencidos_query()]
+
+    def iter_vencidos(self, chunk_size: int = 2000) -> Iterator[Documento]:
+        for model in self._vencidos_query().order_by('fecha_vencimiento', 'id').iterator(chunk_size=chunk_size):
+            yield self._to_domain(model)
+
+    def _vencidos_query(self):
         today = timezone.now().date()
-        documento_models = DocumentoModel.objects.filter(
+        return DocumentoModel.objects.filter(
             fecha_vencimiento__lt=today,
             estado='PENDIENTE'
         )
-        return [self._to_domain(model) for model in documento_models]
     
     def find_by_fecha_vencimiento(self, fecha_desde: date, fecha_hasta: date) -> List[Documento]:
         documento_models = DocumentoModel.objects.filter(
@@ -77,82 +111,28 @@ class DjangoDocumentoRepository(DocumentoRepository):
     
     def get_resumen_cobranzas(self, seller_id: SellerId) -> ResumenCobranzas:
         today = timezone.now().date()
-        
-        # Totales por estado
-        vencidos = DocumentoModel.objects.filter(
-            fecha_vencimiento__lte=today,
-            anulado=False
-        ).exclude(saldo=0).exclude(tipo='N/CR')
-
-        seller_flag = True 
-        seller_codes = []
-
-        if "," in seller_id.value:
-            seller_codes = [c.strip() for c in seller_id.value.split(",")]
-        elif seller_id.value != "-1":
-            seller_codes.append(seller_id.value)
-        else:
-            seller_flag = False
-
-        if seller_flag:
-            vencidos  = vencidos.filter(vendedor_id__in=seller_codes) 
-        
-        
-        vencidos = vencidos.aggregate(
-            total=Sum('saldo', default=0),
-            cantidad=Count('id'),
-            dias_vencidos=Sum(DateDiff(
-                            F("fecha_vencimiento"),
-                            Func(function="GETDATE")   
-                        ))
-        )
-        
-        por_vencer = DocumentoModel.objects.filter(
-            fecha_vencimiento__gt=today,
-            anulado=False).exclude(saldo=0).exclude(tipo='N/CR')  # saldo__gt=0,
-        
-        if seller_flag:
-            por_vencer = por_vencer.filter(vendedor_id__in=seller_codes) 
-        
-        por_vencer = por_vencer.aggregate(
-            total=Sum('saldo', default=0),
-            cantidad=Count('id'),
-            dias_vencidos=Sum(DateDiff(
-                            F("fecha_vencimiento"),
-                            Func(function="GETDATE")   
-                        ))
 
-        )
-        
-        creditos = DocumentoModel.objects.filter(
-            tipo__in=['N/CR','ADEL'],
-            saldo__lt=0,
-            anulado=False
-        )
-        
-        if seller_flag:
-            creditos  = creditos.filter(vendedor_id__in=seller_codes)
+        # Totales por estado: suma de los parciales por vendedor (cacheados) del conjunto pedido
+        buckets = self._resumen_buckets(today)
 
-        creditos = creditos.aggregate(
-            total=Sum('saldo', default=0)
-        )
+        def compute(seller_codes: Optional[List[str]]) -> Dict[str, Any]:
+            query = DocumentoModel.objects.filter(anulado=False)
+            if seller_codes is not None:
+                query = query.filter(vendedor_id__in=seller_codes)
 
-        sin_vencimiento = DocumentoModel.objects.filter(
-            anulado=False,
-            tipo='N/CR'
-        ).exclude(saldo=0)
+            partials = {}
+            for group, metricas in aggregate_buckets_by(query, ['vendedor_id'], buckets):
+                code = (group['vendedor_id'] or '').strip()
+                partials[code] = merge_bucket_metrics([partials[code], metricas], buckets) if code in partials else metricas
+            return partials
 
-        if seller_flag:
-            sin_vencimiento  = sin_vencimiento.filter(vendedor_id__in=seller_codes)
+        partials = self._parciales_por_vendedor('resumen', seller_id.codes, compute, empty_bucket_metrics(buckets))
+        totales = merge_bucket_metrics(partials, buckets)
 
-        sin_vencimiento = sin_vencimiento.aggregate(
-            total=Sum('saldo', default=0),
-            cantidad=Count('id'),
-            dias_vencidos=Sum(DateDiff(
-                            F("fecha_vencimiento"),
-                            Func(function="GETDATE")   
-                        ))
-        )
+        vencidos = totales['vencidos']
+        por_vencer = totales['por_vencer']
+        creditos = totales['creditos']
+        sin_vencimiento = totales['sin_vencimiento']
         
         today = timezone.now().date()
 
@@ -186,77 +166,109 @@ class DjangoDocumentoRepository(DocumentoRepository):
             dias_faltantes=dias_faltantes 
         )
 
+    def _resumen_buckets(self, today: date) -> List[Bucket]:
+        pendiente = ~Q(saldo=0) & ~Q(tipo='N/CR')
+        return [
+            Bucket('vencidos', Q(fecha_vencimiento__lte=today) & pendiente),
+            Bucket('por_vencer', Q(fecha_vencimiento__gt=today) & pendiente),
+            Bucket('creditos', Q(tipo__in=['N/CR','ADEL'], saldo__lt=0), metricas=(TOTAL,)),
+            Bucket('sin_vencimiento', Q(tipo='N/CR') & ~Q(saldo=0)),
+        ]
+
+    def _versiones_documentos(self, seller_codes: List[str]) -> Dict[str, str]:
+        """Versión de docum_cc de cada vendedor (cantidad de documentos y último fe_us_mo) para
+        validar sus parciales cacheados ([] = todos; "-1" lleva la de toda la tabla).
+
+        Una sola consulta agrupada, filtrada a los vendedores sin versión reciente en el
+        cache compartido: un cambio en los documentos de un vendedor no invalida los
+        parciales de los demás.
+        """
+        codes = seller_codes or [ALL_SELLERS]
+        versions = seller_cache.get_versions(codes)
+        missing = [code for code in codes if code not in versions]
+        if not missing:
+            return versions
+
+        query = DocumentoModel.objects.all()
+        if seller_codes:
+            query = query.filter(vendedor_id__in=missing)
+
+        computed = {code: self._version(0, None) for code in missing}
+        cantidad_total, modificado_total = 0, None
+        for row in query.values('vendedor_id').annotate(cantidad=Count('id'), modificado=Max('updated_at')).order_by():
+            code = (row['vendedor_id'] or '').strip()
+            computed[code] = self._version(row['cantidad'], row['modificado'])
+            cantidad_total += row['cantidad']
+            if row['modificado'] and (modificado_total is None or row['modificado'] > modificado_total):
+                modificado_total = row['modificado']
+        if not seller_codes:
+            computed[ALL_SELLERS] = self._version(cantidad_total, modificado_total)
+
+        seller_cache.set_versions(computed)
+        versions.update(computed)
+        return versions
+
+    @staticmethod
+    def _version(cantidad: int, modificado) -> str:
+        return f"{cantidad}@{modificado.isoformat() if modificado else ''}"
+
+    def _parciales_por_vendedor(self, kind: str, seller_codes: List[str],
+                                compute: Callable[[Optional[List[str]]], Dict[str, Any]], empty: Any) -> List[Any]:
+        """Resultados parciales por vendedor para un conjunto de vendedores ([] = todos).
+
+        Los parciales ya cacheados se reutilizan entre conjuntos que se solapan; los que
+        faltan se calculan con una sola consulta agrupada por vendedor (compute) y se
+        cachean. Los totales del conjunto se obtienen sumando los parciales.
+
+        Cada parcial se valida con la versión de docum_cc de su vendedor
+        (_versiones_documentos), que cambia también cuando Profit modifica documentos
+        por fuera de la aplicación.
+        """
+        versions = self._versiones_documentos(seller_codes)
+
+        if not seller_codes:
+            cached = seller_cache.get_partials(kind, [ALL_SELLERS], versions)
+            if ALL_SELLERS in cached:
+                return list(cached[ALL_SELLERS].values())
+
+            partials = compute(None)
+            seller_cache.set_partials(kind, {ALL_SELLERS: partials}, versions)
+            # Solo los vendedores con versión conocida (puede venir del cache solo la de "-1")
+            seller_cache.set_partials(kind, {code: value for code, value in partials.items() if code and code in versions}, versions)
+            return list(partials.values())
+
+        partials = seller_cache.get_partials(kind, seller_codes, versions)
+        missing = [code for code in seller_codes if code not in partials]
+        if missing:
+            computed = compute(missing)
+            # Los vendedores sin documentos también se cachean (parcial vacío)
+            computed = {code: computed.get(code, empty) for code in missing}
+            seller_cache.set_partials(kind, computed, versions)
+            partials.update(computed)
+
+        return list(partials.values())
+
     def get_resumen_por_cliente(self, cliente_id: ClientId) -> ResumenCobranzas:
         today = timezone.now().date()
-        
-        # Totales por estado
-        vencidos = DocumentoModel.objects.filter(
-            fecha_vencimiento__lte=today,
-            anulado=False,
-            saldo__gt=0
-        ) #.exclude(saldo=0).exclude(tipo__in=['N/CR','ADEL'])
 
-        if cliente_id.value != "-1":
-            vencidos  = vencidos.filter(cliente_id=cliente_id.value) 
-        
-        
-        vencidos = vencidos.aggregate(
-            total=Sum('saldo', default=0),
-            cantidad=Count('id'),
-            dias_vencidos=Sum(DateDiff(
-                            F("fecha_vencimiento"),
-                            Func(function="GETDATE")   
-                        ))
-        )
-        
-        por_vencer = DocumentoModel.objects.filter(
-            fecha_vencimiento__gt=today,
-            anulado=False,
-            saldo__gt=0) #.exclude(saldo=0).exclude(tipo__in=['N/CR','ADEL'])  # saldo__gt=0,
-        
-        if cliente_id.value != "-1":
-            por_vencer  = por_vencer.filter(cliente_id=cliente_id.value) 
-        
-        por_vencer = por_vencer.aggregate(
-            total=Sum('saldo', default=0),
-            cantidad=Count('id'),
-            dias_vencidos=Sum(DateDiff(
-                            F("fecha_vencimiento"),
-                            Func(function="GETDATE")   
-                        ))
+        query = DocumentoModel.objects.filter(anulado=False)
 
-        )
-        
-        creditos = DocumentoModel.objects.filter(
-            tipo__in=['N/CR','ADEL'],
-            saldo__lt=0,
-            anulado=False
-        )
-        
         if cliente_id.value != "-1":
-            creditos  = creditos.filter(cliente_id=cliente_id.value)
-
-        creditos = creditos.aggregate(
-            total=Sum('saldo', default=0)
-        )
-
-        sin_vencimiento = DocumentoModel.objects.filter(
-            anulado=False,
-            saldo__lt=0,
-            tipo__in=['N/CR','ADEL']
-        )
-
-        if cliente_id.value != "-1":
-            sin_vencimiento  = sin_vencimiento.filter(cliente_id=cliente_id.value)
-
-        sin_vencimiento = sin_vencimiento.aggregate(
-            total=Sum('saldo', default=0),
-            cantidad=Count('id'),
-            dias_vencidos=Sum(DateDiff(
-                            (F("fecha_vencimiento") or F("fecha_emision")),
-                            Func(function="GETDATE")   
-                        ))
-        )
+            query = query.filter(cliente_id=cliente_id.value)
+
+        # Totales por estado (una sola consulta con agregados filtrados)
+        creditos_filter = Q(tipo__in=['N/CR','ADEL'], saldo__lt=0)
+        totales = aggregate_buckets(query, [
+            Bucket('vencidos', Q(fecha_vencimiento__lte=today, saldo__gt=0)),
+            Bucket('por_vencer', Q(fecha_vencimiento__gt=today, saldo__gt=0)),
+            Bucket('creditos', creditos_filter, metricas=(TOTAL,)),
+            Bucket('sin_vencimiento', creditos_filter),
+        ])
+
+        vencidos = totales['vencidos']
+        por_vencer = totales['por_vencer']
+        creditos = totales['creditos']
+        sin_vencimiento = totales['sin_vencimiento']
         
         today = timezone.now().date()
 
@@ -292,68 +304,95 @@ class DjangoDocumentoRepository(DocumentoRepository):
 
     def find_documentos_pendientes(self, seller_id: str) -> List[Documento]:
         """Obtiene todos los documentos pendientes (vencidos y por vencer) con información del cliente"""
+        return [self._to_domain_con_cliente(model) for model in self._pendientes_query(seller_id)]
+
+    def find_documentos_pendientes_page(self, seller_id: str, cursor: Optional[str], limit: int) -> Page[Documento]:
+        """Página de documentos pendientes ordenada por (fecha_vencimiento, id) usando keyset pagination"""
+        query = self._pendientes_query(seller_id)
+
+        after = decode_cursor(cursor, 2)
+        if after:
+            fecha, doc_id = after
+            try:
+                fecha = date.fromisoformat(str(fecha)[:10])
+            except ValueError as e:
+                raise ValidationException(f"Cursor inválido: {cursor}") from e
+            query = query.filter(
+                Q(fecha_vencimiento__gt=fecha) | Q(fecha_vencimiento=fecha, id__gt=doc_id)
+            )
+
+        rows = list(query[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(last.fecha_vencimiento, last.id)
+
+        return Page(items=[self._to_domain_con_cliente(model) for model in rows], next_cursor=next_cursor)
+
+    def iter_documentos_pendientes(self, seller_id: str, chunk_size: int = 2000) -> Iterator[Documento]:
+        """Recorre los documentos pendientes con un cursor del servidor, sin cargarlos todos en memoria"""
+        for model in self._pendientes_query(seller_id).iterator(chunk_size=chunk_size):
+            yield self._to_domain_con_cliente(model)
+
+    def _pendientes_query(self, seller_id: str):
         query = DocumentoModel.objects.select_related('cliente').filter(
             saldo__gt=0,
             anulado=False
         )
         
-        if seller_id != '' and seller_id != "-1":
-            seller_codes = [] 
-            if "," in seller_id:
-                seller_codes = [c.strip() for c in seller_id.split(",")]
-            else:
-                seller_codes.append(seller_id)
-
+        seller_codes = parse_seller_codes(seller_id)
+        if seller_codes:
             query = query.filter(vendedor_id__in=seller_codes)
         
-        query = query.order_by('fecha_vencimiento')
-        
-        documentos = []
-        for model in query:
-            documento = self._to_domain(model)
-            # Agregar nombre del cliente como atributo adicional
-            documento.cliente_nombre = model.cliente.nombre
-            documentos.append(documento)
-        
-        return documentos
+        return query.order_by('fecha_vencimiento', 'id')
+
+    def _to_domain_con_cliente(self, model: DocumentoModel) -> Documento:
+        documento = self._to_domain(model)
+        # Agregar nombre del cliente como atributo adicional
+        documento.cliente_nombre = model.cliente.nombre
+        return documento
     
+    def find_documentos_pendientes_rows(self, seller_id: str) -> List[Dict]:
+        """Proyección de find_documentos_pendientes directo a filas de respuesta (sin entidades)"""
+        query = self._pendientes_query(seller_id).values_list(*DOCUMENTO_PENDIENTE_FIELDS)
+        return list(documento_pendiente_rows(query))
+
     def find_documentos_pendientes_cliente(self, client_id: str) -> List[Documento]:
         """Obtiene todos los documentos pendientes (vencidos y por vencer) con información del cliente"""
-        query = DocumentoModel.objects.select_related('cliente').filter(
+        return [self._to_domain_con_cliente(model) for model in self._pendientes_cliente_query(client_id)]
+
+    def find_documentos_pendientes_cliente_rows(self, client_id: str) -> List[Dict]:
+        """Proyección de find_documentos_pendientes_cliente directo a filas de respuesta (sin entidades)"""
+        query = self._pendientes_cliente_query(client_id).values_list(*DOCUMENTO_PENDIENTE_FIELDS)
+        return list(documento_pendiente_rows(query))
+
+    def _pendientes_cliente_query(self, client_id: str):
+        return DocumentoModel.objects.select_related('cliente').filter(
             anulado=False,
             cliente_id=client_id
         ).exclude(saldo=0).order_by('-fecha_emision')
-        
-      
-        documentos = []
-        for model in query:
-            documento = self._to_domain(model)
-            # Agregar nombre del cliente como atributo adicional
-            documento.cliente_nombre = model.cliente.nombre
-            documentos.append(documento)
-        
-        return documentos
 
     def get_ventas_trimestre(self, seller_id: SellerId) -> List[Dict]:
-        if seller_id.value != "-1":
-            seller_codes = [] 
-            if "," in seller_id.value:
-                seller_codes = [c.strip() for c in seller_id.value.split(",")]
-            else:
-                seller_codes.append(seller_id.value)
+        def compute(seller_codes: Optional[List[str]]) -> Dict[str, Any]:
+            qs = VentaMes.objects.all()
+            if seller_codes is not None:
+                qs = qs.filter(co_ven__in=seller_codes)
 
-            qs = (
-                VentaMes.objects.filter(co_ven__in=seller_codes)
-                .values("sales_date")
-                .annotate(amount=Sum("amount"))
-                .order_by("sales_date")
-            )
-        else:
-            qs = (
-                VentaMes.objects.values("sales_date")
-                .annotate(amount=Sum("amount"))
-                .order_by("sales_date")
-            )
+            partials = {}
+            for row in qs.values("co_ven", "sales_date").annotate(amount=Sum("amount")):
+                ventas = partials.setdefault((row["co_ven"] or '').strip(), {})
+                ventas[row["sales_date"]] = ventas.get(row["sales_date"], 0) + (row["amount"] or 0)
+            return partials
+
+        montos = {}
+        for ventas in self._parciales_por_vendedor('ventas', seller_id.codes, compute, {}):
+            for sales_date, amount in ventas.items():
+                montos[sales_date] = montos.get(sales_date, 0) + amount
+
+        qs = [{"sales_date": sales_date, "amount": montos[sales_date]} for sales_date in sorted(montos)]
 
         sales_list = []
         for row in qs:
@@ -367,28 +406,15 @@ class DjangoDocumentoRepository(DocumentoRepository):
     def get_detalle_documento(self, documento_id: str) -> Optional[Documento]:
         """Obtiene el detalle completo de un documento incluyendo productos y vendedor"""
         try:
-            empresa, tipo, doc_id = documento_id.split('_')
-
-            if tipo[:1] == 'N': 
-                tipo = tipo[:1] + "/" + tipo[1:]
+            empresa, tipo, doc_id = self._parse_documento_key(documento_id)
             
             model = DocumentoModel.objects.select_related('cliente').get(empresa=empresa, tipo=tipo, numero=doc_id)
-            documento = self._to_domain(model)
             
-            # Agregar información adicional
-            documento.cliente_nombre = model.cliente.nombre
-            documento.vendedor_nombre = model.vendedor.nombre  
-            documento.productos = self._get_productos_documento(empresa, tipo, doc_id)
-            documento.subtotal = model.monto_bruto
-            documento.descuentos = Decimal('0')  # TODO: obtener de tabla de descuentos
-            documento.impuestos = model.monto_impuesto
-            documento.total = model.monto
-            documento.saldo = model.saldo
-            documento.comentarios = model.descripcion or ''
-            documento.cliente_rif = model.cliente.rif or ''
-            documento.condicion_pago = self._get_condicion_pago(model.forma_pag) 
-            
-            return documento
+            return self._to_detalle(
+                model,
+                self._get_productos_documento(empresa, tipo, doc_id),
+                self._get_condicion_pago(model.forma_pag)
+            )
             
         except DocumentoModel.DoesNotExist as e:
             logger.error(f"Document not found for document {documento_id}: {e}")
@@ -397,53 +423,150 @@ class DjangoDocumentoRepository(DocumentoRepository):
         except DocumentoModel.MultipleObjectsReturned as e:
             logger.error(f"Multiple objects returned for document {documento_id}: {e}")
             return None
+
+    def get_detalles_documentos(self, documento_ids: List[str]) -> Dict[str, Documento]:
+        """Detalle de varios documentos con un número fijo de consultas: documentos (con cliente)
+        y renglones de vw_renglones_documento; vendedor y condicio salen de reference_data.
+        Retorna {documento_id: Documento}; las claves inválidas o no encontradas se omiten."""
+        keys = {}
+        for documento_id in documento_ids:
+            try:
+                keys[documento_id] = self._parse_documento_key(documento_id)
+            except ValueError:
+                logger.error(f"Invalid document key {documento_id}")
+
+        if not keys:
+            return {}
+
+        key_filter = Q()
+        for empresa, tipo, doc_id in keys.values():
+            key_filter |= Q(empresa=empresa, tipo=tipo, numero=doc_id)
+
+        models_by_key = {}
+        for model in DocumentoModel.objects.select_related('cliente').filter(key_filter):
+            models_by_key.setdefault(self._normalize_documento_key(model.empresa, model.tipo, model.numero), model)
+
+        productos = self._get_productos_documentos([
+            (model.empresa, model.tipo, model.numero) for model in models_by_key.values()
+        ])
+
+        detalles = {}
+        for documento_id, key in keys.items():
+            normalized = self._normalize_documento_key(*key)
+            model = models_by_key.get(normalized)
+            if model is None:
+                logger.error(f"Document not found for document {documento_id}")
+                continue
+
+            detalles[documento_id] = self._to_detalle(
+                model,
+                productos.get(normalized, []),
+                self._get_condicion_pago(model.forma_pag)
+            )
+
+        return detalles
+
+    def get_detalles_pendientes_cliente(self, client_id: str, tipo: str = TipoDocumento.FACTURA.value,
+                                        limit: Optional[int] = None) -> List[Documento]:
+        """Detalle (con renglones) de los documentos pendientes del cliente del tipo indicado,
+        en dos consultas: documentos y renglones de todos ellos. Ordenados por fecha de emisión;
+        con ``limit`` solo los primeros."""
+        query = self._pendientes_cliente_query(client_id).filter(tipo=tipo).order_by('fecha_emision', 'numero')
+        pendientes = list(query[:limit] if limit is not None else query)
+        if not pendientes:
+            return []
+
+        productos = self._get_productos_documentos([(model.empresa, model.tipo, model.numero) for model in pendientes])
+
+        return [
+            self._to_detalle(
+                model,
+                productos.get(self._normalize_documento_key(model.empresa, model.tipo, model.numero), []),
+                self._get_condicion_pago(model.forma_pag)
+            )
+            for model in pendientes
+        ]
+
+    def _parse_documento_key(self, documento_id: str):
+        """'1_NCR_123' -> ('1', 'N/CR', '123')"""
+        empresa, tipo, doc_id = documento_id.split('_')
+
+        if tipo[:1] == 'N': 
+            tipo = tipo[:1] + "/" + tipo[1:]
+
+        return empresa, tipo, doc_id
+
+    @staticmethod
+    def _normalize_documento_key(empresa, tipo, numero):
+        return (str(empresa).strip(), str(tipo).strip(), str(numero).strip())
+
+    def _to_detalle(self, model: DocumentoModel, productos: List[dict], condicion_pago: str) -> Documento:
+        documento = self._to_domain(model)
+            
+        # Agregar información adicional
+        documento.cliente_nombre = model.cliente.nombre
+        documento.vendedor_nombre = reference_data.vendedor_nombre(model.vendedor_id) or ''
+        documento.productos = productos
+        documento.subtotal = model.monto_bruto
+        documento.descuentos = Decimal('0')  # TODO: obtener de tabla de descuentos
+        documento.impuestos = model.monto_impuesto
+        documento.total = model.monto
+        documento.saldo = model.saldo
+        documento.comentarios = model.descripcion or ''
+        documento.cliente_rif = model.cliente.rif or ''
+        documento.condicion_pago = condicion_pago
+
+        return documento
         
     def get_estado_cuenta(self, rif: str) -> Balance:
-        """Genera el estado de cuenta para un cliente identificado por su RIF"""
+        """Genera el estado de cuenta para un cliente identificado por su RIF.
+        Se reutiliza el último resultado mientras la huella de sus documentos no cambie."""
+        fingerprint = self._estado_cuenta_fingerprint(rif)
+        balance = estado_cuenta_cache.get(rif, fingerprint)
+        if balance is not None:
+            return balance
+
+        balance = self._consultar_estado_cuenta(rif)
+        if balance.renglones:
+            estado_cuenta_cache.set(rif, fingerprint, balance)
+        return balance
+
+    def _estado_cuenta_fingerprint(self, rif: str) -> tuple:
+        """Consulta liviana sobre docum_cc: cambia si se agrega, modifica o cobra un documento del cliente"""
+        huella = DocumentoModel.objects.filter(Q(cliente__rif=rif) | Q(cliente_id=rif)).aggregate(
+            cantidad=Count('id'),
+            saldo=Sum('saldo'),
+            modificado=Max('updated_at')
+        )
+        # dias_ven depende de la fecha
+        return (date.today(), huella['cantidad'], huella['saldo'], huella['modificado'])
+
+    def _consultar_estado_cuenta(self, rif: str) -> Balance:
         try:
-            from django.db import connection
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    EXECUTE dbo.pp_consulta_edo_cuenta_bot %s, '-1', -1 
-                """, [rif])
-                
-                documentos = []
-                cliente_nombre = ''
-                vendedor_nombre = ''
-
-                rows = cursor.fetchall()
-
-                for i, row in enumerate(rows, start=1):
-                    rif, cliente, vendedor, tipo, nro_doc, fec_emis, fec_venc, dias_ven, saldo, cobrado, total_neto = row
-                    if i == 1:
-                        cliente_nombre = cliente
-                        vendedor_nombre = vendedor
-
-                    documentos.append(BalanceDocument(
-                        tipo_doc=tipo,
-                        numero=nro_doc,
-                        fecha_emision=fec_emis,
-                        fecha_vencimiento=fec_venc,
-                        total_neto=total_neto,
-                        cobrado=cobrado,
-                        saldo=saldo
-                    ))
-                
-                cursor.nextset()
-                footers = []
-                for row in cursor.fetchall():
-                    descripcion, valor = row
-                    footers.append(BalanceFooter(descripcion=descripcion, amount=valor))
-
-                balance = Balance(
-                    cliente=cliente_nombre,
-                    vendedor=vendedor_nombre,
-                    fecha=date.today(),
-                    renglones=documentos,
-                    resumen=footers
+            with StoredProcedure('dbo.pp_consulta_edo_cuenta_bot', [rif, '-1', -1]) as sp:
+                rows = sp.all(EstadoCuentaRow)
+                footers = [BalanceFooter(descripcion=row.descripcion, amount=row.valor) for row in sp.rows(EstadoCuentaResumenRow)]
+
+            documentos = [
+                BalanceDocument(
+                    tipo_doc=row.tipo,
+                    numero=row.nro_doc,
+                    fecha_emision=row.fec_emis,
+                    fecha_vencimiento=row.fec_venc,
+                    total_neto=row.total_neto,
+                    cobrado=row.cobrado,
+                    saldo=row.saldo
                 )
-                
-                return balance
+                for row in rows
+            ]
+
+            return Balance(
+                cliente=rows[0].cliente if rows else '',
+                vendedor=rows[0].vendedor if rows else '',
+                fecha=date.today(),
+                renglones=documentos,
+                resumen=footers
+            )
                 
         except Exception as e:
             logger.error(f"Error generando estado de cuenta: {str(e)}")
@@ -458,52 +581,34 @@ class DjangoDocumentoRepository(DocumentoRepository):
 
     def get_estado_cuenta_vendedor(self, seller_ids: str) -> BalanceSeller:
         """Genera el estado de cuenta para un cliente identificado por su RIF"""
-        vendedor_nombre = ''
-
         try:
-            from django.db import connection
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    EXECUTE dbo.pp_consulta_edo_cuenta_consolidado_vendedor %s, -1 
-                """, [seller_ids])
-                
-                documentos = []
-                vendedor_nombre = ''
-
-                rows = cursor.fetchall()
-
-                for i, row in enumerate(rows, start=1):
-                    vendedor, rif, cliente, tipo, nro_doc, fec_emis, fec_venc, dias_ven, saldo, total_neto, orden = row
-                    if i == 1:
-                        vendedor_nombre = vendedor
-
-                    documentos.append(BalanceDocumentSeller(
-                        rif=rif,
-                        cliente=cliente,
-                        tipo_doc=tipo,
-                        numero=nro_doc,
-                        fecha_emision=fec_emis,
-                        fecha_vencimiento=fec_venc,
-                        dias_vcto=dias_ven,
-                        total_neto=total_neto,
-                        saldo=saldo,
-                        orden=orden
-                    ))
-                
-                cursor.nextset()
-                footers = []
-                for row in cursor.fetchall():
-                    descripcion, valor = row
-                    footers.append(BalanceFooter(descripcion=descripcion, amount=valor))
-
-                balance = BalanceSeller(
-                    vendedor=vendedor_nombre if vendedor_nombre else seller_ids,
-                    fecha=date.today(),
-                    renglones=documentos,
-                    resumen=footers
+            with StoredProcedure('dbo.pp_consulta_edo_cuenta_consolidado_vendedor', [seller_ids, -1]) as sp:
+                rows = sp.all(EstadoCuentaVendedorRow)
+                footers = [BalanceFooter(descripcion=row.descripcion, amount=row.valor) for row in sp.rows(EstadoCuentaResumenRow)]
+
+            documentos = [
+                BalanceDocumentSeller(
+                    rif=row.rif,
+                    cliente=row.cliente,
+                    tipo_doc=row.tipo,
+                    numero=row.nro_doc,
+                    fecha_emision=row.fec_emis,
+                    fecha_vencimiento=row.fec_venc,
+                    dias_vcto=row.dias_ven,
+                    total_neto=row.total_neto,
+                    saldo=row.saldo,
+                    orden=row.orden
                 )
-                
-                return balance
+                for row in rows
+            ]
+            vendedor_nombre = rows[0].vendedor if rows else ''
+
+            return BalanceSeller(
+                vendedor=vendedor_nombre if vendedor_nombre else seller_ids,
+                fecha=date.today(),
+                renglones=documentos,
+                resumen=footers
+            )
                 
         except Exception as e:
             logger.error(f"Error generando estado de cuenta: {str(e)}")
@@ -540,19 +645,11 @@ class DjangoDocumentoRepository(DocumentoRepository):
         return sales_list
 
     def _get_condicion_pago(self, co_cond: str) -> str:
-        """Obtiene la descripcion de la condición de pago desde la base de datos"""
+        """Obtiene la descripcion de la condición de pago desde el cache de datos de referencia"""
         if not co_cond:
             return "Sin asignar"
         
-        try:
-            from django.db import connection
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT ltrim(rtrim(cond_des)) as cond_des FROM condicio WHERE co_cond = %s", [co_cond])
-                row = cursor.fetchone()
-                return row[0] if row else f"Cond.Pago: {co_cond}"
-        except Exception as e:
-            print(f"Error obteniendo condición de pago: {str(e)}")
-            return f"Cond.Pago: {co_cond}"
+        return reference_data.condicion_pago(co_cond) or f"Cond.Pago: {co_cond}"
     
     def _get_productos_documento(self, empresa: int, tipo: str, documento_id: int) -> List[dict]:
         """Obtiene los productos asociados al documento"""
@@ -572,24 +669,58 @@ class DjangoDocumentoRepository(DocumentoRepository):
                     ORDER BY reng_num
                 """, [empresa, tipo, documento_id])
                 
-                productos = []
-                for row in cursor.fetchall():
-                    productos.append({
-                        'descripcion': row[0],
-                        'codigo': row[1],
-                        'cantidad': float(row[2]),
-                        'precio_unitario': float(row[3]),
-                        'subtotal': float(row[4]),
-                        'unidad': row[5]
-                    })
-                
-                return productos
+                return [self._to_producto(row) for row in cursor.fetchall()]
                 
         except Exception as e:
             logger.error(f"Error obteniendo productos: {str(e)}")
             print(f"Error obteniendo productos: {e}")
             return []
 
+    def _get_productos_documentos(self, keys: List[tuple]) -> Dict[tuple, List[dict]]:
+        """Renglones de varios documentos agrupados por (empresa, tipo, numero), en lotes de
+        _PRODUCTOS_CHUNK documentos para no superar el límite de parámetros de SQL Server"""
+        if not keys:
+            return {}
+
+        from django.db import connection
+
+        productos = {}
+        with connection.cursor() as cursor:
+            for i in range(0, len(keys), _PRODUCTOS_CHUNK):
+                chunk = keys[i:i + _PRODUCTOS_CHUNK]
+                conditions = " OR ".join(["(empresa = %s AND tipo_doc = %s AND nro_doc = %s)"] * len(chunk))
+                params = [value for key in chunk for value in key]
+                cursor.execute(f"""
+                    SELECT 
+                        art_des,
+                        co_art,
+                        total_art,
+                        prec_vta,
+                        (total_art * prec_vta) as subtotal,
+                        uni_venta,
+                        empresa,
+                        tipo_doc,
+                        nro_doc
+                    FROM vw_renglones_documento 
+                    WHERE {conditions}
+                    ORDER BY empresa, tipo_doc, nro_doc, reng_num
+                """, params)
+
+                for row in cursor.fetchall():
+                    key = self._normalize_documento_key(row[6], row[7], row[8])
+                    productos.setdefault(key, []).append(self._to_producto(row))
+        return productos
+
+    def _to_producto(self, row) -> dict:
+        return {
+            'descripcion': row[0],
+            'codigo': row[1],
+            'cantidad': float(row[2]),
+            'precio_unitario': float(row[3]),
+            'subtotal': float(row[4]),
+            'unidad': row[5]
+        }
+
     def _to_domain(self, model: DocumentoModel) -> Documento:
         return Documento(
             id=DocumentId(model.id),
@@ -616,6 +747,41 @@ class DjangoEventoRepository(EventoRepository):
         evento_models = EventoModel.objects.find(id=entity_id.value)
         return [self._to_domain(model) for model in evento_models]
     
+    def find_eventos_cliente_rows(self, client_id: str) -> List[Dict]:
+        """Proyección de find_eventos_cliente directo a filas de respuesta (sin entidades)"""
+        query = EventoModel.objects.filter(co_cli=client_id).order_by('-fec_emis').values_list(*EVENTO_FIELDS)
+        return list(evento_rows(query))
+
+    def find_eventos_cliente_page(self, client_id: str, since: Optional[date], until: Optional[date],
+                                  cursor: Optional[str], limit: int) -> Page[Dict]:
+        """Eventos del cliente entre since y until (inclusive), del más reciente al más antiguo,
+        con keyset pagination sobre (fec_emis, id) y proyección compacta. Una consulta por página."""
+        query = EventoModel.objects.filter(co_cli=client_id)
+        if since:
+            query = query.filter(fec_emis__gte=since)
+        if until:
+            query = query.filter(fec_emis__lte=until)
+
+        before = decode_cursor(cursor, 2)
+        if before:
+            fecha, evento_id = before
+            try:
+                fecha = date.fromisoformat(str(fecha)[:10])
+            except ValueError as e:
+                raise ValidationException(f"Cursor inválido: {cursor}") from e
+            query = query.filter(Q(fec_emis__lt=fecha) | Q(fec_emis=fecha, id__lt=evento_id))
+
+        rows = list(query.order_by('-fec_emis', '-id').values_list(*EVENTO_COMPACT_FIELDS)[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(last[EVENTO_COMPACT_FIELDS.index('fec_emis')], last[0])
+
+        return Page(items=list(evento_compact_rows(rows)), next_cursor=next_cursor)
+
     def find_eventos_cliente(self, client_id: str) -> List[Evento]:
 
         query = EventoModel.objects.filter(co_cli=client_id).order_by('-fec_emis')
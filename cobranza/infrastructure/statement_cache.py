@@ -0,0 +1,58 @@
+import threading
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from shared.infrastructure.logging_impl import get_logger
+logger = get_logger(__name__)
+
+
+class EstadoCuentaCache:
+    """Cache de estados de cuenta por RIF validado con una huella de los documentos del cliente.
+
+    La entrada guarda la huella (fecha, cantidad, suma de saldos y último fe_us_mo de
+    docum_cc) con la que se generó; si la huella actual difiere se descarta. Así el
+    procedimiento almacenado solo se vuelve a ejecutar cuando los documentos cambian.
+    """
+
+    def __init__(self, ttl: Optional[int] = None, prefix: str = "estado_cuenta"):
+        self.ttl = ttl if ttl is not None else getattr(settings, 'ESTADO_CUENTA_CACHE_TTL', 3600)
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, rif: str) -> str:
+        return f"{self.prefix}:{rif.strip().upper()}"
+
+    def get(self, rif: str, fingerprint: tuple):
+        if self.ttl <= 0:
+            return None
+
+        entry = cache.get(self._key(rif))
+        value = entry[1] if entry is not None and entry[0] == fingerprint else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, rif: str, fingerprint: tuple, value) -> None:
+        if self.ttl <= 0:
+            return
+        cache.set(self._key(rif), (fingerprint, value), self.ttl)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 4) if total else 0,
+                'ttl': self.ttl
+            }
+
+
+estado_cuenta_cache = EstadoCuentaCache()
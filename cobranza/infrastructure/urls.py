@@ -6,10 +6,17 @@ urlpatterns = [
     #path('resumen/', views.resumen_cobranzas_view, name='resumen_cobranzas'),
     path('vencidos/', views.documentos_vencidos_view, name='documentos_vencidos'),
     path('pendientes/vendedor/<str:seller_id>/', views.documentos_pendientes_view, name='documentos_pendientes'),
+    path('pendientes/<str:client_id>/pdf/', views.documentos_pendientes_cliente_pdf_view, name='documentos_pendientes_cliente_pdf'),
     path('pendientes/<str:client_id>/', views.documentos_pendientes_cliente_view, name='documentos_pendientes'),
     path('eventos/<str:client_id>/', views.eventos_cliente_view, name='eventos'),
+    path('detalle/batch/pdf/', views.documentos_pdf_view, name='documentos_pdf'),
+    path('detalle/batch/', views.documentos_detalle_batch_view, name='documentos_detalle_batch'),
     path('detalle/<str:documento_id>/', views.documento_detalle_view, name='documento_detalle'),
+    path('pdf/stats/', views.pdf_stats_view, name='pdf_stats'),
     path('detalle/<str:documento_id>/pdf/', views.documento_pdf_view, name='documento_pdf'),
     path('balance/<str:rif>/pdf/', views.balance_pdf_view, name='documento_pdf'),
+    path('balance/vendedor/jobs/', views.balance_seller_pdf_job_view, name='balance_vendedor_job'),
+    path('balance/vendedor/jobs/<str:job_id>/', views.balance_seller_pdf_job_status_view, name='balance_vendedor_job_status'),
+    path('balance/vendedor/jobs/<str:job_id>/zip/', views.balance_seller_pdf_job_zip_view, name='balance_vendedor_job_zip'),
     path('balance/vendedor/<str:seller_ids>/pdf/', views.balance_seller_pdf_view, name='documento_pdf')
 ]
\ No newline at end of file
@@ -1,24 +1,38 @@
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from datetime import datetime
-from shared.domain.exceptions import EntityNotFoundException
+from shared.domain.exceptions import EntityNotFoundException, ValidationException
 from shared.domain.value_objects import SellerId
+from shared.infrastructure.pagination import parse_date, parse_limit
+from shared.infrastructure.pdf_jobs import pdf_jobs
+from shared.infrastructure.pdf_renderer import PdfDocument, PdfRendererBusyException, PdfRenderTimeoutException, pdf_renderer
+from shared.infrastructure.streaming import NDJSONRenderer, streaming_json_response, wants_ndjson, wants_stream
 from ..application.use_cases import (
     CrearDocumentoUseCase,
     ObtenerDocumentosUseCase,
     ObtenerDocumentosVencidosUseCase,
-    VerDocumentosPendientesUseCase,
-    VerDocumentosPendientesClienteUseCase,
-    EventosClienteUseCase,
+    StreamDocumentosUseCase,
+    StreamDocumentosVencidosUseCase,
+    VerDocumentosPendientesPaginadoUseCase,
+    StreamDocumentosPendientesUseCase,
+    ProyeccionDocumentosPendientesUseCase,
+    ProyeccionDocumentosPendientesClienteUseCase,
+    ProyeccionEventosClienteUseCase,
+    VerEventosClientePaginadoUseCase,
     VerDetalleDocumentoClienteUseCase,
+    VerDetallesDocumentosUseCase,
     CreateDocumentPdfUseCase,
+    CreateDocumentsPdfUseCase,
     CreateBalancePdfUseCase, 
-    CreateSellerBalancePdfUseCase
+    CreateSellerBalancePdfUseCase,
+    CrearTrabajoBalancesVendedoresUseCase
 )
-from ..application.dtos import CrearDocumentoRequest, FiltroDocumentosRequest
+from ..application.dtos import CrearDocumentoRequest, FiltroDocumentosRequest, DocumentosPendientesPageRequest, EventosClientePageRequest
 from .repository_impl import DjangoDocumentoRepository, DjangoEventoRepository
-from django.http import HttpResponse
+from .statement_cache import estado_cuenta_cache
+from django.http import FileResponse, HttpResponse
 from uuid import uuid4
 
 
@@ -29,7 +43,24 @@ def get_evento_repository():
     return DjangoEventoRepository()
 
 
+def _documento_to_dict(doc):
+    return {
+        'id': doc.id,
+        'cliente_id': doc.cliente_id,
+        'numero': doc.numero,
+        'tipo': doc.tipo,
+        'monto': float(doc.monto),
+        'fecha_emision': doc.fecha_emision,
+        'fecha_vencimiento': doc.fecha_vencimiento,
+        'estado': doc.estado,
+        'dias_vencimiento': doc.dias_vencimiento,
+        'esta_vencido': doc.esta_vencido,
+        'descripcion': doc.descripcion
+    }
+
+
 @api_view(['GET', 'POST'])
+@renderer_classes([JSONRenderer, NDJSONRenderer])
 def documentos_view(request):
     repository = get_documento_repository()
     
@@ -40,23 +71,16 @@ def documentos_view(request):
             fecha_desde=datetime.strptime(request.GET.get('fecha_desde'), '%Y-%m-%d').date() if request.GET.get('fecha_desde') else None,
             fecha_hasta=datetime.strptime(request.GET.get('fecha_hasta'), '%Y-%m-%d').date() if request.GET.get('fecha_hasta') else None
         )
+
+        if wants_stream(request):
+            use_case = StreamDocumentosUseCase(repository)
+            rows = (_documento_to_dict(doc) for doc in use_case.execute(filtro))
+            return streaming_json_response(rows, ndjson=wants_ndjson(request))
         
         use_case = ObtenerDocumentosUseCase(repository)
         documentos = use_case.execute(filtro)
         
-        return Response([{
-            'id': doc.id,
-            'cliente_id': doc.cliente_id,
-            'numero': doc.numero,
-            'tipo': doc.tipo,
-            'monto': float(doc.monto),
-            'fecha_emision': doc.fecha_emision,
-            'fecha_vencimiento': doc.fecha_vencimiento,
-            'estado': doc.estado,
-            'dias_vencimiento': doc.dias_vencimiento,
-            'esta_vencido': doc.esta_vencido,
-            'descripcion': doc.descripcion
-        } for doc in documentos])
+        return Response([_documento_to_dict(doc) for doc in documentos])
     
     elif request.method == 'POST':
         try:
@@ -73,33 +97,32 @@ def documentos_view(request):
             use_case = CrearDocumentoUseCase(repository)
             documento = use_case.execute(request_dto)
             
-            return Response({
-                'id': documento.id,
-                'cliente_id': documento.cliente_id,
-                'numero': documento.numero,
-                'tipo': documento.tipo,
-                'monto': float(documento.monto),
-                'fecha_emision': documento.fecha_emision,
-                'fecha_vencimiento': documento.fecha_vencimiento,
-                'estado': documento.estado,
-                'dias_vencimiento': documento.dias_vencimiento,
-                'esta_vencido': documento.esta_vencido,
-                'descripcion': documento.descripcion
-            }, status=status.HTTP_201_CREATED)
+            return Response(_documento_to_dict(documento), status=status.HTTP_201_CREATED)
             
         except (ValueError, KeyError) as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
+@renderer_classes([JSONRenderer, NDJSONRenderer])
 def documentos_vencidos_view(request):
     repository = get_documento_repository()
+
+    if wants_stream(request):
+        use_case = StreamDocumentosVencidosUseCase(repository)
+        rows = (_documento_to_dict(doc) for doc in use_case.execute(None))
+        return streaming_json_response(rows, ndjson=wants_ndjson(request))
     
     use_case = ObtenerDocumentosVencidosUseCase(repository)
     documentos = use_case.execute(None)
     
-    return Response([{
+    return Response([_documento_to_dict(doc) for doc in documentos])
+
+
+def _pendiente_to_dict(doc):
+    return {
         'id': doc.id,
         'cliente_id': doc.cliente_id,
+        'cliente_nombre': doc.cliente_nombre,
         'numero': doc.numero,
         'tipo': doc.tipo,
         'monto': float(doc.monto),
@@ -108,63 +131,84 @@ def documentos_vencidos_view(request):
         'estado': doc.estado,
         'dias_vencimiento': doc.dias_vencimiento,
         'esta_vencido': doc.esta_vencido,
-        'descripcion': doc.descripcion
-    } for doc in documentos])
+        'descripcion': doc.descripcion,
+        'vendedor_id': doc.vendedor_id,
+        'empresa': doc.empresa,
+        'saldo': float(doc.saldo)
+    }
 
 
 @api_view(['GET'])
+@renderer_classes([JSONRenderer, NDJSONRenderer])
 def documentos_pendientes_view(request, seller_id):
+    """Sin parámetros retorna la lista completa. Con ?limit= / ?cursor= retorna una página
+    ({results, next_cursor}); con ?stream=1 o ?format=ndjson envía las filas en streaming."""
     repository = get_documento_repository()
     
     #seller_id = request.user.codigo_vendedor_profit if hasattr(request.user, 'codigo_vendedor_profit') else "-1"
+    seller_id = seller_id or "-1"
+
+    if wants_stream(request):
+        use_case = StreamDocumentosPendientesUseCase(repository)
+        rows = (_pendiente_to_dict(doc) for doc in use_case.execute(seller_id))
+        return streaming_json_response(rows, ndjson=wants_ndjson(request))
+
+    if 'limit' in request.GET or 'cursor' in request.GET:
+        try:
+            page_request = DocumentosPendientesPageRequest(
+                seller_id=seller_id,
+                cursor=request.GET.get('cursor'),
+                limit=parse_limit(request.GET.get('limit'))
+            )
+            page = VerDocumentosPendientesPaginadoUseCase(repository).execute(page_request)
+        except ValidationException as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'results': [_pendiente_to_dict(doc) for doc in page.documentos],
+            'next_cursor': page.next_cursor
+        })
+
+    use_case = ProyeccionDocumentosPendientesUseCase(repository)
     
-    use_case = VerDocumentosPendientesUseCase(repository)
-    documentos = use_case.execute(seller_id or "-1")
-    
-    return Response([{
-        'id': doc.id,
-        'cliente_id': doc.cliente_id,
-        'cliente_nombre': doc.cliente_nombre,
-        'numero': doc.numero,
-        'tipo': doc.tipo,
-        'monto': float(doc.monto),
-        'fecha_emision': doc.fecha_emision,
-        'fecha_vencimiento': doc.fecha_vencimiento,
-        'estado': doc.estado,
-        'dias_vencimiento': doc.dias_vencimiento,
-        'esta_vencido': doc.esta_vencido,
-        'descripcion': doc.descripcion,
-        'vendedor_id': doc.vendedor_id,
-        'empresa': doc.empresa,
-        'saldo': float(doc.saldo)
-    } for doc in documentos])
+    return Response(use_case.execute(seller_id))
 
 @api_view(['GET'])
 def documentos_pendientes_cliente_view(request, client_id):
     repository = get_documento_repository()
     
-    use_case = VerDocumentosPendientesClienteUseCase(repository)
-    documentos = use_case.execute(client_id)
+    use_case = ProyeccionDocumentosPendientesClienteUseCase(repository)
     
-    return Response([{
-        'id': doc.id,
-        'cliente_id': doc.cliente_id,
-        'cliente_nombre': doc.cliente_nombre,
-        'numero': doc.numero,
-        'tipo': doc.tipo,
-        'monto': float(doc.monto),
-        'fecha_emision': doc.fecha_emision,
-        'fecha_vencimiento': doc.fecha_vencimiento,
-        'estado': doc.estado,
-        'dias_vencimiento': doc.dias_vencimiento,
-        'esta_vencido': doc.esta_vencido,
-        'descripcion': doc.descripcion,
-        'vendedor_id': doc.vendedor_id,
-        'empresa': doc.empresa,
-        'saldo': float(doc.saldo)
-    } for doc in documentos])
+    return Response(use_case.execute(client_id))
     
 
+def _detalle_to_dict(documento):
+    return {
+        'id': documento.id,
+        'cliente_id': documento.cliente_id,
+        'cliente_nombre': documento.cliente_nombre,
+        'numero': documento.numero,
+        'tipo': documento.tipo,
+        'monto': float(documento.monto),
+        'fecha_emision': documento.fecha_emision,
+        'fecha_vencimiento': documento.fecha_vencimiento,
+        'estado': documento.estado,
+        'dias_vencimiento': documento.dias_vencimiento,
+        'esta_vencido': documento.esta_vencido,
+        'descripcion': documento.descripcion,
+        'vendedor_id': documento.vendedor_id,
+        'vendedor_nombre': documento.vendedor_nombre,
+        'productos': documento.productos,
+        'subtotal': float(documento.subtotal) if documento.subtotal else 0,
+        'descuentos': float(documento.descuentos) if documento.descuentos else 0,
+        'impuestos': float(documento.impuestos) if documento.impuestos else 0,
+        'total': float(documento.total) if documento.total else 0,
+        'saldo': float(documento.saldo) if documento.saldo else 0,
+        'comentarios': documento.comentarios, 
+        'empresa': documento.empresa
+    }
+
+
 @api_view(['GET'])
 def documento_detalle_view(request, documento_id):
     repository = get_documento_repository()
@@ -173,80 +217,159 @@ def documento_detalle_view(request, documento_id):
         use_case = VerDetalleDocumentoClienteUseCase(repository)
         documento = use_case.execute(documento_id)
         
-        return Response({
-            'id': documento.id,
-            'cliente_id': documento.cliente_id,
-            'cliente_nombre': documento.cliente_nombre,
-            'numero': documento.numero,
-            'tipo': documento.tipo,
-            'monto': float(documento.monto),
-            'fecha_emision': documento.fecha_emision,
-            'fecha_vencimiento': documento.fecha_vencimiento,
-            'estado': documento.estado,
-            'dias_vencimiento': documento.dias_vencimiento,
-            'esta_vencido': documento.esta_vencido,
-            'descripcion': documento.descripcion,
-            'vendedor_id': documento.vendedor_id,
-            'vendedor_nombre': documento.vendedor_nombre,
-            'productos': documento.productos,
-            'subtotal': float(documento.subtotal) if documento.subtotal else 0,
-            'descuentos': float(documento.descuentos) if documento.descuentos else 0,
-            'impuestos': float(documento.impuestos) if documento.impuestos else 0,
-            'total': float(documento.total) if documento.total else 0,
-            'saldo': float(documento.saldo) if documento.saldo else 0,
-            'comentarios': documento.comentarios, 
-            'empresa': documento.empresa
-        })
+        return Response(_detalle_to_dict(documento))
         
     except EntityNotFoundException as e:
         return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
 
 
+MAX_DETALLES_BATCH = 200
+
+@api_view(['POST'])
+def documentos_detalle_batch_view(request):
+    """Recibe {"documentos": ["<empresa>_<tipo>_<numero>", ...]} y retorna el detalle de todos"""
+    if not isinstance(request.data, dict):
+        return Response({'error': 'Se requiere un objeto {"documentos": [...]}'}, status=status.HTTP_400_BAD_REQUEST)
+
+    documento_ids = request.data.get('documentos', [])
+
+    if not isinstance(documento_ids, list) or not documento_ids:
+        return Response({'error': 'Se requiere una lista de documentos'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(documento_ids) > MAX_DETALLES_BATCH:
+        return Response({'error': f'Máximo {MAX_DETALLES_BATCH} documentos por solicitud'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Conservar el orden de la solicitud sin repetir documentos
+    documento_ids = list(dict.fromkeys(str(doc_id) for doc_id in documento_ids))
+
+    repository = get_documento_repository()
+    use_case = VerDetallesDocumentosUseCase(repository)
+    detalles = use_case.execute(documento_ids)
+
+    return Response({
+        'documentos': [_detalle_to_dict(detalles[doc_id]) for doc_id in documento_ids if doc_id in detalles],
+        'no_encontrados': [doc_id for doc_id in documento_ids if doc_id not in detalles]
+    })
+
+
 @api_view(['GET'])
 def eventos_cliente_view(request, client_id):
+    """Sin parámetros retorna todos los eventos. Con ?since= / ?until= (YYYY-MM-DD), ?limit= o
+    ?cursor= retorna una página compacta ({results, next_cursor}) del más reciente al más antiguo."""
     repository = get_evento_repository()
-    
-    use_case = EventosClienteUseCase(repository)
 
-    documentos = use_case.execute(client_id)
+    if any(param in request.GET for param in ('since', 'until', 'limit', 'cursor')):
+        try:
+            page_request = EventosClientePageRequest(
+                client_id=client_id,
+                since=parse_date(request.GET.get('since'), 'since'),
+                until=parse_date(request.GET.get('until'), 'until'),
+                cursor=request.GET.get('cursor'),
+                limit=parse_limit(request.GET.get('limit'))
+            )
+            page = VerEventosClientePaginadoUseCase(repository).execute(page_request)
+        except ValidationException as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'results': page.eventos,
+            'next_cursor': page.next_cursor
+        })
+    
+    use_case = ProyeccionEventosClienteUseCase(repository)
    
-    return Response([{
-        'id': doc.id,
-        'cliente_id': doc.cliente_id,
-        'company_id': doc.company_id,
-        'tipo': doc.tipo,
-        'numero': doc.numero,
-        'fecha_emision': doc.fecha_emision,
-        'fecha_vencimiento': doc.fecha_vencimiento,
-        'monto': float(doc.monto),
-        'saldo': float(doc.saldo) if doc.saldo else 0,
-        'descripcion': doc.descripcion, 
-        'dias_vencimiento': doc.dias_vencimiento,
-        'empresa': doc.company_id
-    } for doc in documentos])
+    return Response(use_case.execute(client_id))
+
 
+def _pdf_response(request, pdf: PdfDocument, filename: str) -> HttpResponse:
+    """Respuesta del PDF con ETag (clave de contenido); 304 si el cliente ya tiene esa versión"""
+    etag = f'"{pdf.etag}"'
+    if_none_match = request.headers.get('If-None-Match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')]:
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = HttpResponse(pdf.content, content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['ETag'] = etag
+    # Obliga a revalidar: el contenido puede cambiar con los saldos
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+def _pdf_busy_response(e: PdfRendererBusyException) -> Response:
+    response = Response({'error': str(e)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    response['Retry-After'] = '5'
+    return response
+
+@api_view(['GET'])
+def pdf_stats_view(request):
+    """Métricas del servicio de PDF (workers, cola, rechazos, tiempos de render) y del cache de estados de cuenta"""
+    return Response(dict(pdf_renderer.stats(), estado_cuenta_cache=estado_cuenta_cache.stats()))
 
 @api_view(['GET'])
 def documento_pdf_view(request, documento_id):
     repository = get_documento_repository()
     try:
         use_case = CreateDocumentPdfUseCase(repository)
-        pdf_bytes = use_case.execute(documento_id)
-        response = HttpResponse(pdf_bytes, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="documento_{documento_id}.pdf"'
-        return response
+        pdf = use_case.execute(documento_id)
+        return _pdf_response(request, pdf, f"documento_{documento_id}.pdf")
     except EntityNotFoundException as e:
         return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+    except PdfRendererBusyException as e:
+        return _pdf_busy_response(e)
+    except PdfRenderTimeoutException as e:
+        return Response({'error': str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
     
+@api_view(['GET', 'POST'])
+def documentos_pdf_view(request):
+    """Varias facturas en un solo PDF. GET ?ids=1_FACT_10,1_FACT_11 o POST {"ids": [...]}"""
+    if request.method == 'POST':
+        ids = request.data.get('ids') or []
+    else:
+        ids = request.GET.get('ids', '').split(',')
+    if isinstance(ids, str):
+        ids = ids.split(',')
+    ids = [str(doc_id).strip() for doc_id in ids if str(doc_id).strip()]
+
+    try:
+        use_case = CreateDocumentsPdfUseCase(get_documento_repository())
+        pdf = use_case.execute(ids)
+        return _pdf_response(request, pdf, f"documentos_{uuid4()}.pdf")
+    except ValidationException as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except EntityNotFoundException as e:
+        return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+    except PdfRendererBusyException as e:
+        return _pdf_busy_response(e)
+    except PdfRenderTimeoutException as e:
+        return Response({'error': str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
+
+@api_view(['GET'])
+def documentos_pendientes_cliente_pdf_view(request, client_id):
+    """Todas las facturas pendientes del cliente en un solo PDF"""
+    try:
+        use_case = CreateDocumentsPdfUseCase(get_documento_repository())
+        pdf = use_case.execute_cliente(client_id)
+        return _pdf_response(request, pdf, f"facturas_pendientes_{client_id}.pdf")
+    except ValidationException as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except EntityNotFoundException as e:
+        return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+    except PdfRendererBusyException as e:
+        return _pdf_busy_response(e)
+    except PdfRenderTimeoutException as e:
+        return Response({'error': str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
+
 @api_view(['GET'])
 def balance_pdf_view(request, rif):
     repository = get_documento_repository()
     try:
         use_case = CreateBalancePdfUseCase(repository)
-        pdf_bytes = use_case.execute(rif)
-        response = HttpResponse(pdf_bytes, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="documento_{rif}.pdf"'
-        return response
+        pdf = use_case.execute(rif)
+        return _pdf_response(request, pdf, f"documento_{rif}.pdf")
+    except PdfRendererBusyException as e:
+        return _pdf_busy_response(e)
+    except PdfRenderTimeoutException as e:
+        return Response({'error': str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
     except EntityNotFoundException as e:
         if "no tiene deudas" in str(e):
             return Response({'error': str(e)}, status=512)
@@ -257,13 +380,55 @@ def balance_seller_pdf_view(request, seller_ids):
     repository = get_documento_repository()
     try:
         use_case = CreateSellerBalancePdfUseCase(repository)
-        pdf_bytes = use_case.execute(seller_ids)
-        response = HttpResponse(pdf_bytes, content_type='application/pdf')
+        pdf = use_case.execute(seller_ids)
         uuid = uuid4()
 
-        response['Content-Disposition'] = f'attachment; filename="documento_{uuid}.pdf"'
-        return response
+        return _pdf_response(request, pdf, f"documento_{uuid}.pdf")
+    except PdfRendererBusyException as e:
+        return _pdf_busy_response(e)
+    except PdfRenderTimeoutException as e:
+        return Response({'error': str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
     except EntityNotFoundException as e:
         return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+def balance_seller_pdf_job_view(request):
+    """Encola la generación de un balance PDF por vendedor; body: {"vendedores": "01,02"} o lista"""
+    vendedores = request.data.get('vendedores')
+    if isinstance(vendedores, list):
+        vendedores = ",".join(str(v) for v in vendedores)
+
+    try:
+        use_case = CrearTrabajoBalancesVendedoresUseCase(get_documento_repository())
+        job_id = use_case.execute(vendedores)
+    except ValidationException as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'job_id': job_id,
+        'status_url': request.build_absolute_uri(f'{job_id}/')
+    }, status=status.HTTP_202_ACCEPTED)
+
+@api_view(['GET'])
+def balance_seller_pdf_job_status_view(request, job_id):
+    job = pdf_jobs.status(job_id)
+    if job is None:
+        return Response({'error': f'Trabajo {job_id} no encontrado'}, status=status.HTTP_404_NOT_FOUND)
+
+    if pdf_jobs.bundle_path(job_id):
+        job['zip_url'] = request.build_absolute_uri('zip/')
+    return Response(job)
+
+@api_view(['GET'])
+def balance_seller_pdf_job_zip_view(request, job_id):
+    path = pdf_jobs.bundle_path(job_id)
+    if path is None:
+        job = pdf_jobs.status(job_id)
+        if job is None:
+            return Response({'error': f'Trabajo {job_id} no encontrado'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'error': f"Trabajo {job_id} en estado {job['estado']}"}, status=status.HTTP_409_CONFLICT)
+
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'balances_{job_id}.zip', content_type='application/zip')
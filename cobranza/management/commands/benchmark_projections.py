@@ -0,0 +1,70 @@
+import timeit
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from cliente.infrastructure.models import ClienteModel
+from cobranza.application.use_cases import VerDocumentosPendientesUseCase
+from cobranza.infrastructure.models import DocumentoModel
+from cobranza.infrastructure.projections import DOCUMENTO_PENDIENTE_FIELDS, documento_pendiente_rows
+from cobranza.infrastructure.repository_impl import DjangoDocumentoRepository
+from cobranza.infrastructure.views import _pendiente_to_dict
+
+
+def _synthetic_rows(count: int):
+    """Tuplas con la forma de values_list(*DOCUMENTO_PENDIENTE_FIELDS)"""
+    return [
+        (f"D{i}", f"C{i % 500}", "CLIENTE", str(i), 'FACT', Decimal('123.45'), date(2025, 1, 1),
+         date(2025, 1, 1) + timedelta(days=i % 90), 'PENDIENTE', None, '01', 1, Decimal('100.00'))
+        for i in range(count)
+    ]
+
+
+def _models(rows):
+    """Los mismos documentos como instancias de DocumentoModel (sin base de datos)"""
+    clientes = {}
+    models = []
+    for row in rows:
+        values = dict(zip(DOCUMENTO_PENDIENTE_FIELDS, row))
+        cliente = clientes.setdefault(values['cliente_id'], ClienteModel(id=values['cliente_id'], nombre=values['cliente__nombre']))
+        models.append(DocumentoModel(
+            id=values['id'], cliente=cliente, numero=values['numero'], tipo=values['tipo'], monto=values['monto'],
+            fecha_emision=values['fecha_emision'], fecha_vencimiento=values['fecha_vencimiento'], estado=values['estado'],
+            descripcion=values['descripcion'], vendedor_id=values['vendedor_id'], empresa=values['empresa'], saldo=values['saldo']
+        ))
+    return models
+
+
+class Command(BaseCommand):
+    # Solo CPU: no necesita base de datos ni las comprobaciones del proyecto
+    requires_system_checks = []
+
+    help = ("Compara por fila el camino con entidades (Documento, DocumentoResponse, dict de la vista) "
+            "con la proyección de documentos pendientes, sobre filas sintéticas (no requiere base de datos)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20_000, help='Filas sintéticas')
+        parser.add_argument('--runs', type=int, default=5, help='Repeticiones; se reporta la mejor')
+
+    def handle(self, *args, **options):
+        count = options['rows']
+        rows = _synthetic_rows(count)
+        models = _models(rows)
+
+        repository = DjangoDocumentoRepository()
+        use_case = VerDocumentosPendientesUseCase(repository)
+
+        def entidades():
+            return [_pendiente_to_dict(use_case._to_response(repository._to_domain_con_cliente(model))) for model in models]
+
+        def proyeccion():
+            return list(documento_pendiente_rows(rows))
+
+        if entidades()[0] != proyeccion()[0]:
+            self.stderr.write(self.style.WARNING("Las filas de ambos caminos difieren"))
+
+        entidades_s = min(timeit.repeat(entidades, number=1, repeat=options['runs']))
+        proyeccion_s = min(timeit.repeat(proyeccion, number=1, repeat=options['runs']))
+        self.stdout.write(f"entidades: {entidades_s / count * 1e6:.2f} µs/fila")
+        self.stdout.write(f"proyección: {proyeccion_s / count * 1e6:.2f} µs/fila")
+        self.stdout.write(self.style.SUCCESS(f"{count} filas: x{entidades_s / proyeccion_s:.1f}"))
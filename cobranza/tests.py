@@ -0,0 +1,116 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from cliente.infrastructure.models import ClienteModel
+from shared.domain.value_objects import ClientId, SellerId
+from shared.infrastructure.seller_cache import seller_cache
+from vendedor.infrastructure.models import VendedorModel
+from .infrastructure.models import DocumentoModel
+from .infrastructure.repository_impl import DjangoDocumentoRepository
+
+# Tablas de Profit (managed = False): se crean solo para la base de pruebas
+PROFIT_MODELS = [VendedorModel, ClienteModel, DocumentoModel]
+
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-shared'},
+}
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ResumenCobranzasQueriesTest(TestCase):
+    """Los resúmenes se calculan con agregados filtrados: la cantidad de consultas no
+    depende de la cantidad de buckets ni de vendedores"""
+
+    @classmethod
+    def setUpClass(cls):
+        # El schema editor de SQLite no puede usarse dentro de la transacción de la clase
+        with connection.schema_editor() as editor:
+            for model in PROFIT_MODELS:
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in reversed(PROFIT_MODELS):
+                editor.delete_model(model)
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.now().date()
+        for code in ('01', '02', '03'):
+            VendedorModel.objects.create(id=code, nombre=f'Vendedor {code}', cedula=code)
+        ClienteModel.objects.create(id='C1', nombre='Cliente 1', rif='J1', rif2='J1-2', vendedor_id='01')
+        ClienteModel.objects.create(id='C2', nombre='Cliente 2', rif='J2', rif2='J2-2', vendedor_id='02')
+
+        documentos = [
+            # (cliente, vendedor, tipo, saldo, días hasta el vencimiento)
+            ('C1', '01', 'FACT', '100.00', -10),
+            ('C1', '01', 'FACT', '50.00', 5),
+            ('C1', '01', 'N/CR', '-20.00', 0),
+            ('C2', '02', 'FACT', '200.00', -3),
+            ('C2', '02', 'N/CR', '-30.00', 0),
+            ('C2', '03', 'FACT', '70.00', -1),
+        ]
+        for i, (cliente, vendedor, tipo, saldo, dias) in enumerate(documentos):
+            DocumentoModel.objects.create(
+                id=str(i), cliente_id=cliente, vendedor_id=vendedor, numero=str(i), tipo=tipo,
+                monto=Decimal(saldo), saldo=Decimal(saldo), fecha_emision=today - timedelta(days=30),
+                fecha_vencimiento=today + timedelta(days=dias), updated_at=timezone.now()
+            )
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.repository = DjangoDocumentoRepository()
+
+    def test_resumen_por_cliente_una_consulta(self):
+        with self.assertNumQueries(1):
+            resumen = self.repository.get_resumen_por_cliente(ClientId('C1'))
+
+        self.assertEqual(resumen.total_vencido.amount, Decimal('100.00'))
+        self.assertEqual(resumen.total_por_vencer.amount, Decimal('50.00'))
+        self.assertEqual(resumen.total_creditos.amount, Decimal('20.00'))
+        self.assertEqual(resumen.cantidad_vencidos, 1)
+
+    def test_resumen_cobranzas_parciales_por_vendedor(self):
+        # Versión de docum_cc de los vendedores y una consulta agrupada por vendedor para los que faltan
+        with self.assertNumQueries(2):
+            resumen = self.repository.get_resumen_cobranzas(SellerId('01,02'))
+
+        self.assertEqual(resumen.total_vencido.amount, Decimal('300.00'))
+        self.assertEqual(resumen.total_por_vencer.amount, Decimal('50.00'))
+        self.assertEqual(resumen.cantidad_vencidos, 2)
+
+        # Con los parciales y las versiones en cache no se consulta la base
+        with self.assertNumQueries(0):
+            self.repository.get_resumen_cobranzas(SellerId('02,01'))
+
+        # Un conjunto que se solapa consulta la versión y calcula solo el vendedor nuevo
+        with CaptureQueriesContext(connection) as queries:
+            resumen = self.repository.get_resumen_cobranzas(SellerId('01,02,03'))
+        self.assertEqual(len(queries), 2)
+        self.assertIn("'03'", queries[0]['sql'])
+        self.assertNotIn("'01'", queries[0]['sql'])
+        self.assertEqual(resumen.total_vencido.amount, Decimal('370.00'))
+
+    @mock.patch.object(seller_cache, 'version_ttl', 0)
+    def test_resumen_cobranzas_recalcula_si_cambia_docum_cc(self):
+        self.repository.get_resumen_cobranzas(SellerId('01,02'))
+
+        # Profit modifica docum_cc sin pasar por la aplicación: solo se recalcula ese vendedor
+        DocumentoModel.objects.filter(id='0').update(saldo=Decimal('0'), updated_at=timezone.now() + timedelta(seconds=1))
+
+        with CaptureQueriesContext(connection) as queries:
+            resumen = self.repository.get_resumen_cobranzas(SellerId('01,02'))
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("'02'", queries[1]['sql'])
+        self.assertEqual(resumen.total_vencido.amount, Decimal('200.00'))
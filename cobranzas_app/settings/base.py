@@ -119,6 +119,77 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Caches: "default" es local de cada proceso; "shared" lo comparten todos los workers (dashboard y
+# sus invalidaciones). Por defecto en disco, compartido por los workers del mismo servidor; con
+# varios servidores usar un backend de red (p. ej. django.core.cache.backends.redis.RedisCache)
+SHARED_CACHE_BACKEND = config('SHARED_CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': SHARED_CACHE_BACKEND,
+        'LOCATION': config('SHARED_CACHE_LOCATION', default=str(BASE_DIR / 'shared_cache')),
+        'OPTIONS': {'MAX_ENTRIES': 5000} if 'filebased' in SHARED_CACHE_BACKEND else {},
+    },
+}
+
+# Dashboard: segundos que se cachea el resumen por conjunto de vendedores (0 desactiva el cache)
+DASHBOARD_CACHE_TTL = config('DASHBOARD_CACHE_TTL', default=300, cast=int)
+
+# Parciales por vendedor del resumen (shared.infrastructure.seller_cache): se validan con la versión
+# de docum_cc de cada vendedor y expiran al cambiar el día; segundos de vida (0 desactiva)
+SELLER_PARTIALS_CACHE_TTL = config('SELLER_PARTIALS_CACHE_TTL', default=3600, cast=int)
+# Segundos que se reutiliza la versión de docum_cc por vendedor antes de volver a consultarla
+SELLER_VERSION_CACHE_TTL = config('SELLER_VERSION_CACHE_TTL', default=30, cast=int)
+
+# Consultas independientes del dashboard en paralelo (shared.infrastructure.concurrency): hilos y timeout en segundos
+SUBQUERY_WORKERS = config('SUBQUERY_WORKERS', default=8, cast=int)
+SUBQUERY_TIMEOUT = config('SUBQUERY_TIMEOUT', default=30, cast=int)
+
+# Pool de conexiones pyodbc de import_service: máximo por proceso, segundos de inactividad antes de
+# cerrar, segundos de inactividad tras los que se verifica con SELECT 1 y espera máxima por una conexión
+IMPORT_POOL_MAX_SIZE = config('IMPORT_POOL_MAX_SIZE', default=8, cast=int)
+IMPORT_POOL_IDLE_TIMEOUT = config('IMPORT_POOL_IDLE_TIMEOUT', default=300, cast=int)
+IMPORT_POOL_VALIDATE_AFTER = config('IMPORT_POOL_VALIDATE_AFTER', default=30, cast=int)
+IMPORT_POOL_TIMEOUT = config('IMPORT_POOL_TIMEOUT', default=30, cast=int)
+# Filas leídas por fetchmany en los endpoints de importación (se envían en streaming)
+IMPORT_FETCH_SIZE = config('IMPORT_FETCH_SIZE', default=1000, cast=int)
+# POST /api/import/bootstrap/: hilos para las consultas en paralelo, líneas en espera de envío,
+# segundos sin datos de ninguna consulta antes de cortar la respuesta y segundos que una consulta
+# espera a un cliente que no lee (después se aborta y libera sus hilos y conexiones). Los demás
+# endpoints de importación usan la misma cola (en bloques de IMPORT_FETCH_SIZE filas) y timeouts
+IMPORT_BOOTSTRAP_WORKERS = config('IMPORT_BOOTSTRAP_WORKERS', default=6, cast=int)
+IMPORT_BOOTSTRAP_QUEUE_SIZE = config('IMPORT_BOOTSTRAP_QUEUE_SIZE', default=32, cast=int)
+IMPORT_BOOTSTRAP_IDLE_TIMEOUT = config('IMPORT_BOOTSTRAP_IDLE_TIMEOUT', default=120, cast=int)
+IMPORT_BOOTSTRAP_STALL_TIMEOUT = config('IMPORT_BOOTSTRAP_STALL_TIMEOUT', default=30, cast=int)
+
+# Instantáneas de sincronización por vendedor (manage.py build_sync_snapshots, GET /api/import/snapshot/)
+SYNC_SNAPSHOT_DIR = config('SYNC_SNAPSHOT_DIR', default=str(BASE_DIR / 'sync_snapshots'))
+
+# Segundos entre verificaciones de versión de condicio / vendedor (shared.infrastructure.reference_data)
+REFERENCE_DATA_TTL = config('REFERENCE_DATA_TTL', default=600, cast=int)
+
+# Segundos que se conserva el estado de cuenta por RIF; se invalida antes si cambian los documentos del cliente
+ESTADO_CUENTA_CACHE_TTL = config('ESTADO_CUENTA_CACHE_TTL', default=3600, cast=int)
+
+# Generación de PDF (shared.infrastructure.pdf_renderer): procesos wkhtmltopdf simultáneos,
+# solicitudes en espera antes de responder 429 y timeouts en segundos
+PDF_RENDER_WORKERS = config('PDF_RENDER_WORKERS', default=4, cast=int)
+PDF_RENDER_QUEUE_SIZE = config('PDF_RENDER_QUEUE_SIZE', default=16, cast=int)
+PDF_RENDER_QUEUE_TIMEOUT = config('PDF_RENDER_QUEUE_TIMEOUT', default=30, cast=int)
+PDF_RENDER_TIMEOUT = config('PDF_RENDER_TIMEOUT', default=60, cast=int)
+
+# Cache en disco de PDFs por contenido del HTML (shared.infrastructure.pdf_cache); 0 bytes lo desactiva
+PDF_CACHE_DIR = config('PDF_CACHE_DIR', default=str(BASE_DIR / 'pdf_cache'))
+PDF_CACHE_MAX_BYTES = config('PDF_CACHE_MAX_BYTES', default=256 * 1024 * 1024, cast=int)
+
+# Trabajos de balances PDF por vendedor en ZIP (shared.infrastructure.pdf_jobs); TTL en segundos. Un trabajo
+# sin avances durante PDF_RENDER_QUEUE_TIMEOUT + PDF_RENDER_TIMEOUT (+30 s) se informa como error
+PDF_JOBS_DIR = config('PDF_JOBS_DIR', default=str(BASE_DIR / 'pdf_jobs'))
+PDF_JOB_WORKERS = config('PDF_JOB_WORKERS', default=2, cast=int)
+PDF_JOB_TTL = config('PDF_JOB_TTL', default=24 * 3600, cast=int)
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = True
 
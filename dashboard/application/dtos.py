@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
+from datetime import date
 from decimal import Decimal
 
 
@@ -32,4 +33,21 @@ class IndicadoresResponse:
 class DashboardResponse:
     situacion: SituacionGeneralResponse
     ventas_por_mes: List[VentasMesResponse]
-    indicadores: IndicadoresResponse
\ No newline at end of file
+    indicadores: IndicadoresResponse
+
+@dataclass
+class AntiguedadSaldosResponse:
+    codigo: str
+    corriente: Decimal
+    dias_1_30: Decimal
+    dias_31_60: Decimal
+    dias_61_90: Decimal
+    mas_90: Decimal
+    total: Decimal
+    cantidad_documentos: int
+    fecha_corte: Optional[date]
+
+@dataclass
+class AntiguedadVendedoresResponse:
+    total: AntiguedadSaldosResponse
+    vendedores: List[AntiguedadSaldosResponse]
@@ -1,7 +1,11 @@
 from shared.application.use_case import UseCase
 from cobranza.domain.repository import DocumentoRepository
 from shared.domain.value_objects import SellerId, ClientId
-from .dtos import DashboardResponse, SituacionGeneralResponse, VentasMesResponse, IndicadoresResponse
+from shared.infrastructure.concurrency import run_concurrently
+from ..domain.entities import AntiguedadSaldos
+from ..domain.repository import AntiguedadSaldosRepository
+from .dtos import DashboardResponse, SituacionGeneralResponse, VentasMesResponse, IndicadoresResponse, AntiguedadSaldosResponse, AntiguedadVendedoresResponse
+from typing import List, Optional
 from decimal import Decimal
 
 
@@ -15,9 +19,13 @@ class ObtenerDashboardUseCase(UseCase[SellerId, DashboardResponse]):
         
         #seller_id = SellerId(user_data.get('codigo_vendedor_profit', ''))
 
-        resumen = self.documento_repository.get_resumen_cobranzas(seller_id)
-
-        ventas_por_mes_dict = self.documento_repository.get_ventas_trimestre(seller_id)
+        # Consultas independientes: el tiempo total es el de la más lenta
+        resultados = run_concurrently({
+            'resumen': lambda: self.documento_repository.get_resumen_cobranzas(seller_id),
+            'ventas': lambda: self.documento_repository.get_ventas_trimestre(seller_id)
+        })
+        resumen = resultados['resumen']
+        ventas_por_mes_dict = resultados['ventas']
         
         ventas_por_mes = [
             VentasMesResponse(mes= mes_info["mes"], monto=mes_info["amount"])
@@ -73,6 +81,23 @@ class ObtenerDashboardUseCase(UseCase[SellerId, DashboardResponse]):
             indicadores=indicadores
         )
     
+class ObtenerDashboardCacheadoUseCase(UseCase[SellerId, DashboardResponse]):
+    """Antepone un cache (get/set por código de vendedor) a ObtenerDashboardUseCase"""
+
+    def __init__(self, dashboard_use_case: ObtenerDashboardUseCase, cache):
+        self.dashboard_use_case = dashboard_use_case
+        self.cache = cache
+
+    def execute(self, seller_id: SellerId) -> DashboardResponse:
+        dashboard = self.cache.get(seller_id.value)
+        if dashboard is not None:
+            return dashboard
+
+        dashboard = self.dashboard_use_case.execute(seller_id)
+        self.cache.set(seller_id.value, dashboard)
+        return dashboard
+
+    
 class ObtenerDashboardClientUseCase(UseCase[ClientId, DashboardResponse]):
     
     def __init__(self, documento_repository: DocumentoRepository):
@@ -83,9 +108,12 @@ class ObtenerDashboardClientUseCase(UseCase[ClientId, DashboardResponse]):
         
         #seller_id = SellerId(user_data.get('codigo_vendedor_profit', ''))
 
-        resumen = self.documento_repository.get_resumen_por_cliente(client_id)
-
-        ventas_por_mes_dict = self.documento_repository.get_ventas_trimestre_cliente(client_id)
+        resultados = run_concurrently({
+            'resumen': lambda: self.documento_repository.get_resumen_por_cliente(client_id),
+            'ventas': lambda: self.documento_repository.get_ventas_trimestre_cliente(client_id)
+        })
+        resumen = resultados['resumen']
+        ventas_por_mes_dict = resultados['ventas']
         
         ventas_por_mes = [
             VentasMesResponse(mes= mes_info["mes"], monto=mes_info["amount"])
@@ -147,4 +175,55 @@ class ObtenerDashboardClientUseCase(UseCase[ClientId, DashboardResponse]):
             situacion=situacion,
             ventas_por_mes=ventas_por_mes,
             indicadores=indicadores
-        )
\ No newline at end of file
+        )
+
+
+def _antiguedad_response(antiguedad: AntiguedadSaldos) -> AntiguedadSaldosResponse:
+    return AntiguedadSaldosResponse(
+        codigo=antiguedad.codigo,
+        corriente=antiguedad.corriente,
+        dias_1_30=antiguedad.dias_1_30,
+        dias_31_60=antiguedad.dias_31_60,
+        dias_61_90=antiguedad.dias_61_90,
+        mas_90=antiguedad.mas_90,
+        total=antiguedad.total,
+        cantidad_documentos=antiguedad.cantidad_documentos,
+        fecha_corte=antiguedad.fecha_corte
+    )
+
+
+class ObtenerAntiguedadVendedoresUseCase(UseCase[List[str], AntiguedadVendedoresResponse]):
+    """Antigüedad de saldos precalculada por vendedor, con el consolidado de los vendedores pedidos"""
+
+    def __init__(self, antiguedad_repository: AntiguedadSaldosRepository):
+        self.antiguedad_repository = antiguedad_repository
+
+    def execute(self, seller_codes: List[str]) -> AntiguedadVendedoresResponse:
+        vendedores = self.antiguedad_repository.find_por_vendedores(seller_codes)
+
+        fechas = [v.fecha_corte for v in vendedores if v.fecha_corte]
+        total = AntiguedadSaldos(
+            codigo=",".join(seller_codes),
+            corriente=sum((v.corriente for v in vendedores), Decimal('0')),
+            dias_1_30=sum((v.dias_1_30 for v in vendedores), Decimal('0')),
+            dias_31_60=sum((v.dias_31_60 for v in vendedores), Decimal('0')),
+            dias_61_90=sum((v.dias_61_90 for v in vendedores), Decimal('0')),
+            mas_90=sum((v.mas_90 for v in vendedores), Decimal('0')),
+            cantidad_documentos=sum(v.cantidad_documentos for v in vendedores),
+            fecha_corte=min(fechas) if fechas else None
+        )
+
+        return AntiguedadVendedoresResponse(
+            total=_antiguedad_response(total),
+            vendedores=[_antiguedad_response(v) for v in vendedores]
+        )
+
+
+class ObtenerAntiguedadClienteUseCase(UseCase[ClientId, Optional[AntiguedadSaldosResponse]]):
+
+    def __init__(self, antiguedad_repository: AntiguedadSaldosRepository):
+        self.antiguedad_repository = antiguedad_repository
+
+    def execute(self, client_id: ClientId) -> Optional[AntiguedadSaldosResponse]:
+        antiguedad = self.antiguedad_repository.find_por_cliente(client_id)
+        return _antiguedad_response(antiguedad) if antiguedad else None
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
+from datetime import date
 from decimal import Decimal
 
 
@@ -31,4 +32,20 @@ class IndicadoresVentas:
 class DashboardData:
     situacion: SituacionGeneral
     ventas_por_mes: List[VentasPorMes]
-    indicadores: IndicadoresVentas
\ No newline at end of file
+    indicadores: IndicadoresVentas
+
+@dataclass
+class AntiguedadSaldos:
+    """Saldo pendiente por tramo de días vencidos, precalculado a una fecha de corte"""
+    codigo: str
+    corriente: Decimal
+    dias_1_30: Decimal
+    dias_31_60: Decimal
+    dias_61_90: Decimal
+    mas_90: Decimal
+    cantidad_documentos: int
+    fecha_corte: Optional[date]
+
+    @property
+    def total(self) -> Decimal:
+        return self.corriente + self.dias_1_30 + self.dias_31_60 + self.dias_61_90 + self.mas_90
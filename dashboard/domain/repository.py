@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from shared.domain.value_objects import ClientId
+from .entities import AntiguedadSaldos
+
+
+class AntiguedadSaldosRepository(ABC):
+
+    @abstractmethod
+    def find_por_vendedores(self, seller_codes: List[str]) -> List[AntiguedadSaldos]:
+        """Tramos por vendedor; ["-1"] retorna todos los vendedores"""
+        pass
+
+    @abstractmethod
+    def find_por_cliente(self, client_id: ClientId) -> Optional[AntiguedadSaldos]:
+        pass
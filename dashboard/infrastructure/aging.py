@@ -0,0 +1,154 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from cobranza.infrastructure.aggregations import Bucket, CANTIDAD, TOTAL, aggregate_buckets_by
+from cobranza.infrastructure.models import DocumentoModel
+from shared.infrastructure.logging_impl import get_logger
+from .models import AgingClienteModel, AgingVendedorModel, AgingRefreshStateModel
+logger = get_logger(__name__)
+
+AGING_FIELDS = ('corriente', 'dias_1_30', 'dias_31_60', 'dias_61_90', 'mas_90')
+
+# SQL Server admite hasta 2100 parámetros por consulta
+_IN_CHUNK = 1000
+
+
+def aging_buckets(today: date) -> List[Bucket]:
+    """Tramos de antigüedad como rangos de fecha sargables, con el mismo corte que el resumen
+    de cobranzas: vence hoy ya cuenta como vencido (día 1), corriente es fec_venc > today"""
+    def hace(dias: int) -> date:
+        return today - timedelta(days=dias)
+
+    return [
+        Bucket('corriente', Q(fecha_vencimiento__gt=today), metricas=(TOTAL,)),
+        Bucket('dias_1_30', Q(fecha_vencimiento__lte=today, fecha_vencimiento__gte=hace(29)), metricas=(TOTAL,)),
+        Bucket('dias_31_60', Q(fecha_vencimiento__lt=hace(29), fecha_vencimiento__gte=hace(59)), metricas=(TOTAL,)),
+        Bucket('dias_61_90', Q(fecha_vencimiento__lt=hace(59), fecha_vencimiento__gte=hace(89)), metricas=(TOTAL,)),
+        Bucket('mas_90', Q(fecha_vencimiento__lt=hace(89)), metricas=(TOTAL,)),
+        Bucket('documentos', Q(saldo__gt=0), metricas=(CANTIDAD,)),
+    ]
+
+
+def _chunks(values: List, size: int = _IN_CHUNK) -> Iterable[List]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class AgingRefresher:
+    """Mantiene las tablas de antigüedad de saldos a partir de docum_cc.
+
+    Los tramos dependen de la fecha de corte, así que la primera ejecución de cada
+    día (o con ``full=True``) recalcula todo. Las siguientes ejecuciones del mismo
+    día solo recalculan los clientes con documentos modificados (fe_us_mo) desde la
+    última marca de agua, y luego los vendedores de esos clientes.
+    """
+
+    def refresh(self, full: bool = False) -> Dict:
+        today = timezone.now().date()
+        state = AgingRefreshStateModel.objects.order_by('id').first() or AgingRefreshStateModel()
+
+        # Se toma antes de leer para que los cambios concurrentes se procesen en la próxima corrida
+        watermark = DocumentoModel.objects.aggregate(watermark=Max('updated_at'))['watermark']
+
+        incremental = not full and state.fecha_corte == today and state.watermark is not None
+
+        with transaction.atomic():
+            if incremental:
+                changed = list(
+                    DocumentoModel.objects.filter(updated_at__gt=state.watermark)
+                    .order_by().values_list('cliente_id', flat=True).distinct()
+                )
+                clientes, vendedores = self._refresh_clientes(changed, today)
+                self._refresh_vendedores(vendedores, today)
+            else:
+                clientes = self._rebuild_all(today)
+                vendedores = None
+
+            state.fecha_corte = today
+            state.watermark = watermark or state.watermark
+            state.last_run = timezone.now()
+            state.save()
+
+        stats = {
+            'modo': 'incremental' if incremental else 'completo',
+            'fecha_corte': today.isoformat(),
+            'clientes': clientes,
+            'vendedores': len(vendedores) if vendedores is not None else AgingVendedorModel.objects.count()
+        }
+        logger.info(f"Antigüedad de saldos actualizada: {stats}")
+        return stats
+
+    def _rebuild_all(self, today: date) -> int:
+        AgingClienteModel.objects.all().delete()
+        rows = self._compute_clientes(self._base_query(), today)
+        AgingClienteModel.objects.bulk_create(rows, batch_size=500)
+        self._refresh_vendedores(None, today)
+        return len(rows)
+
+    def _refresh_clientes(self, client_ids: List[str], today: date):
+        """Recalcula los clientes indicados; retorna (cantidad de clientes, vendedores afectados)"""
+        vendedores: Set[str] = set()
+        if not client_ids:
+            return 0, vendedores
+
+        codes = list({c.strip() for c in client_ids})
+        rows = []
+        for chunk in _chunks(codes):
+            vendedores.update(AgingClienteModel.objects.filter(co_cli__in=chunk).values_list('co_ven', flat=True))
+            AgingClienteModel.objects.filter(co_cli__in=chunk).delete()
+
+        for chunk in _chunks(client_ids):
+            rows.extend(self._compute_clientes(self._base_query().filter(cliente_id__in=chunk), today))
+
+        AgingClienteModel.objects.bulk_create(rows, batch_size=500)
+        vendedores.update(row.co_ven for row in rows)
+        return len(codes), vendedores
+
+    def _refresh_vendedores(self, codes: Optional[Set[str]], today: date) -> None:
+        """Reconstruye los totales por vendedor desde AgingClienteModel (todos si codes es None)"""
+        qs = AgingClienteModel.objects.all()
+        vendedores = AgingVendedorModel.objects.all()
+        if codes is not None:
+            if not codes:
+                return
+            qs = qs.filter(co_ven__in=list(codes))
+            vendedores = vendedores.filter(co_ven__in=list(codes))
+
+        totals = qs.order_by().values('co_ven').annotate(
+            cantidad_clientes=Count('co_cli', distinct=True),
+            documentos=Sum('cantidad'),
+            **{field + '_total': Sum(field) for field in AGING_FIELDS}
+        )
+
+        rows = [
+            AgingVendedorModel(
+                co_ven=row['co_ven'],
+                cantidad=row['documentos'] or 0,
+                cantidad_clientes=row['cantidad_clientes'],
+                fecha_corte=today,
+                **{field: row[field + '_total'] or 0 for field in AGING_FIELDS}
+            )
+            for row in totals
+        ]
+
+        vendedores.delete()
+        AgingVendedorModel.objects.bulk_create(rows, batch_size=500)
+
+    def _base_query(self):
+        return DocumentoModel.objects.filter(anulado=False, saldo__gt=0)
+
+    def _compute_clientes(self, query, today: date) -> List[AgingClienteModel]:
+        rows = []
+        for group, buckets in aggregate_buckets_by(query, ['cliente_id', 'vendedor_id'], aging_buckets(today)):
+            rows.append(AgingClienteModel(
+                co_cli=(group['cliente_id'] or '').strip(),
+                co_ven=(group['vendedor_id'] or '').strip(),
+                cantidad=buckets['documentos'][CANTIDAD],
+                fecha_corte=today,
+                **{field: buckets[field][TOTAL] for field in AGING_FIELDS}
+            ))
+        return rows
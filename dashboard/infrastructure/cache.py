@@ -0,0 +1,78 @@
+import threading
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from shared.infrastructure.seller_cache import SellerCache, normalize_seller_codes, seller_cache
+
+
+class DashboardCache:
+    """Cache del dashboard por conjunto de vendedores, con TTL e invalidación explícita.
+
+    Las entradas se guardan en el cache ``shared`` de ``CACHES``, común a todos los
+    workers, para que la invalidación hecha por una importación en un worker alcance
+    a los demás (con el backend en disco por defecto, solo dentro del mismo servidor;
+    ver SHARED_CACHE_BACKEND). Cada clave incluye las generaciones de SellerCache
+    (global y por vendedor): invalidar las reemplaza por tokens nuevos, de modo que
+    las entradas viejas quedan inaccesibles y expiran por TTL.
+    """
+
+    def __init__(self, ttl: Optional[int] = None, prefix: str = "dashboard", alias: str = "shared",
+                 sellers: SellerCache = seller_cache):
+        self.ttl = ttl if ttl is not None else getattr(settings, 'DASHBOARD_CACHE_TTL', 300)
+        self.prefix = prefix
+        self.alias = alias
+        self.sellers = sellers
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _cache(self):
+        return caches[self.alias]
+
+    def _key(self, codes) -> str:
+        versions = ".".join(str(gen) for gen in self.sellers.generations(codes))
+        return f"{self.prefix}:{','.join(codes)}:{versions}"
+
+    def get(self, seller_id: str):
+        if self.ttl <= 0:
+            return None
+
+        value = self._cache.get(self._key(normalize_seller_codes(seller_id)))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, seller_id: str, value) -> None:
+        if self.ttl <= 0:
+            return
+        self._cache.set(self._key(normalize_seller_codes(seller_id)), value, self.ttl)
+
+    def invalidate(self, seller_codes: Optional[Iterable[str]] = None) -> None:
+        """Invalida el dashboard de los vendedores indicados (y el consolidado "-1"), o todo si no se indican"""
+        self.sellers.invalidate(seller_codes)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 4) if total else 0,
+                'ttl': self.ttl
+            }
+        stats.update(self.sellers.stats())
+        return stats
+
+
+dashboard_cache = DashboardCache()
+
+
+def invalidate_dashboard_cache(seller_codes: Optional[Iterable[str]] = None) -> None:
+    """Hook para importaciones y escrituras sobre documentos"""
+    dashboard_cache.invalidate(seller_codes)
@@ -0,0 +1,52 @@
+from django.db import models
+
+
+class AgingClienteModel(models.Model):
+    """Antigüedad de saldos precalculada por cliente y vendedor (ver comando refresh_aging)"""
+    co_cli = models.CharField(db_column='co_cli', max_length=50)
+    co_ven = models.CharField(db_column='co_ven', max_length=50, blank=True, default='')
+    corriente = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    dias_1_30 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    dias_31_60 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    dias_61_90 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    mas_90 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cantidad = models.IntegerField(default=0)
+    fecha_corte = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'dashboard_aging_cliente'
+        verbose_name = 'Antigüedad Cliente'
+        verbose_name_plural = 'Antigüedad Clientes'
+        unique_together = ['co_cli', 'co_ven']
+        indexes = [models.Index(fields=['co_ven'], name='dashboard_aging_cli_ven_idx')]
+
+
+class AgingVendedorModel(models.Model):
+    """Totales de AgingClienteModel consolidados por vendedor"""
+    co_ven = models.CharField(db_column='co_ven', max_length=50, unique=True)
+    corriente = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    dias_1_30 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    dias_31_60 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    dias_61_90 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    mas_90 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cantidad = models.IntegerField(default=0)
+    cantidad_clientes = models.IntegerField(default=0)
+    fecha_corte = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'dashboard_aging_vendedor'
+        verbose_name = 'Antigüedad Vendedor'
+        verbose_name_plural = 'Antigüedad Vendedores'
+
+
+class AgingRefreshStateModel(models.Model):
+    """Marca de agua de la última actualización: fecha_corte y máximo fe_us_mo procesado"""
+    fecha_corte = models.DateField(blank=True, null=True)
+    watermark = models.DateTimeField(blank=True, null=True)
+    last_run = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'dashboard_aging_refresh_state'
+        verbose_name = 'Estado Actualización Antigüedad'
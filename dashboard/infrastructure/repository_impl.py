@@ -0,0 +1,39 @@
+from decimal import Decimal
+from typing import List, Optional
+from django.db.models import Max, Sum
+from shared.domain.value_objects import ALL_SELLERS, ClientId
+from ..domain.entities import AntiguedadSaldos
+from ..domain.repository import AntiguedadSaldosRepository
+from .aging import AGING_FIELDS
+from .models import AgingClienteModel, AgingVendedorModel
+
+
+class DjangoAntiguedadSaldosRepository(AntiguedadSaldosRepository):
+    """Lee las tablas precalculadas por refresh_aging; no consulta docum_cc"""
+
+    def find_por_vendedores(self, seller_codes: List[str]) -> List[AntiguedadSaldos]:
+        queryset = AgingVendedorModel.objects.order_by('co_ven').values('co_ven', 'cantidad', 'fecha_corte', *AGING_FIELDS)
+        if ALL_SELLERS not in seller_codes:
+            queryset = queryset.filter(co_ven__in=seller_codes)
+
+        return [self._to_domain(row['co_ven'], row) for row in queryset]
+
+    def find_por_cliente(self, client_id: ClientId) -> Optional[AntiguedadSaldos]:
+        # Un cliente puede tener documentos de varios vendedores
+        totals = AgingClienteModel.objects.filter(co_cli=client_id.value.strip()).aggregate(
+            cantidad=Sum('cantidad'),
+            fecha_corte=Max('fecha_corte'),
+            **{field: Sum(field) for field in AGING_FIELDS}
+        )
+        if totals['cantidad'] is None:
+            return None
+
+        return self._to_domain(client_id.value, totals)
+
+    def _to_domain(self, codigo: str, values: dict) -> AntiguedadSaldos:
+        return AntiguedadSaldos(
+            codigo=codigo,
+            cantidad_documentos=values['cantidad'] or 0,
+            fecha_corte=values['fecha_corte'],
+            **{field: values[field] or Decimal('0') for field in AGING_FIELDS}
+        )
@@ -3,6 +3,9 @@ from . import views
 
 #  path('', views.dashboard_view, name='dashboard'),
 urlpatterns = [
+    path('cache/', views.dashboard_cache_view, name='dashboard_cache'),
+    path('aging/client/<str:client_id>/', views.aging_client_view, name='aging_client'),
+    path('aging/<str:seller_id>/', views.aging_seller_view, name='aging_seller'),
     path('<str:seller_id>/', views.dashboard_seller_view, name='sellerdashboard'),
     path('client/<str:client_id>/', views.dashboard_client_view, name='clientdashboard'),
 ]
\ No newline at end of file
@@ -1,15 +1,24 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from rest_framework import status
 from cobranza.infrastructure.repository_impl import DjangoDocumentoRepository
 from shared.domain.value_objects import SellerId, ClientId
-from ..application.use_cases import ObtenerDashboardUseCase, ObtenerDashboardClientUseCase
+from shared.infrastructure.concurrency import SubQueryTimeoutException
+from authentication.application.use_cases import ValidateTokenUseCase
+from authentication.infrastructure.repository_impl import DjangoUsuarioRepository
+from ..application.use_cases import ObtenerDashboardUseCase, ObtenerDashboardCacheadoUseCase, ObtenerDashboardClientUseCase, ObtenerAntiguedadVendedoresUseCase, ObtenerAntiguedadClienteUseCase
+from .cache import dashboard_cache, invalidate_dashboard_cache, normalize_seller_codes
+from .repository_impl import DjangoAntiguedadSaldosRepository
 
 
 def get_dashboard(seller_id: SellerId):
     documento_repository = DjangoDocumentoRepository()
-    use_case = ObtenerDashboardUseCase(documento_repository)
+    use_case = ObtenerDashboardCacheadoUseCase(ObtenerDashboardUseCase(documento_repository), dashboard_cache)
        
-    dashboard_data = use_case.execute(seller_id)
+    try:
+        dashboard_data = use_case.execute(seller_id)
+    except SubQueryTimeoutException as e:
+        return Response({'error': str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
 
    
     return Response({
@@ -53,6 +62,21 @@ def get_dashboard(seller_id: SellerId):
 
 #     return get_dashboard(seller_id)        
 
+@api_view(['GET', 'DELETE'])
+def dashboard_cache_view(request):
+    """GET: contadores de hit/miss del cache. DELETE: invalida (opcional ?sellers=01,02);
+    requiere usuario autenticado (Authorization: Bearer <token>)"""
+    if request.method == 'DELETE':
+        auth_header = request.headers.get('Authorization', '')
+        token = auth_header.split(' ', 1)[1] if auth_header.startswith('Bearer ') else ''
+        if not token or not ValidateTokenUseCase(DjangoUsuarioRepository()).execute(token):
+            return Response({'error': 'No autorizado'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        sellers = request.GET.get('sellers')
+        invalidate_dashboard_cache(sellers.split(",") if sellers else None)
+
+    return Response(dashboard_cache.stats())
+
 @api_view(['GET'])
 def dashboard_seller_view(request, seller_id):
     print('dentro de dashboard_view con seller_id:', seller_id)
@@ -68,7 +92,10 @@ def dashboard_client_view(request, client_id):
     documento_repository = DjangoDocumentoRepository()
     use_case = ObtenerDashboardClientUseCase(documento_repository)
        
-    dashboard_data = use_case.execute(client)
+    try:
+        dashboard_data = use_case.execute(client)
+    except SubQueryTimeoutException as e:
+        return Response({'error': str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
    
     return Response({
         'situacion': {
@@ -99,4 +126,39 @@ def dashboard_client_view(request, client_id):
     }) 
 
 
-    
\ No newline at end of file
+    
+
+
+def _antiguedad_to_dict(antiguedad) -> dict:
+    return {
+        'codigo': antiguedad.codigo,
+        'corriente': float(antiguedad.corriente),
+        'dias_1_30': float(antiguedad.dias_1_30),
+        'dias_31_60': float(antiguedad.dias_31_60),
+        'dias_61_90': float(antiguedad.dias_61_90),
+        'mas_90': float(antiguedad.mas_90),
+        'total': float(antiguedad.total),
+        'cantidad_documentos': antiguedad.cantidad_documentos,
+        'fecha_corte': antiguedad.fecha_corte
+    }
+
+@api_view(['GET'])
+def aging_seller_view(request, seller_id):
+    """Antigüedad de saldos precalculada (comando refresh_aging) por vendedor; "-1" para todos"""
+    use_case = ObtenerAntiguedadVendedoresUseCase(DjangoAntiguedadSaldosRepository())
+    aging = use_case.execute(normalize_seller_codes(seller_id))
+
+    return Response({
+        'total': _antiguedad_to_dict(aging.total),
+        'vendedores': [_antiguedad_to_dict(v) for v in aging.vendedores]
+    })
+
+@api_view(['GET'])
+def aging_client_view(request, client_id):
+    use_case = ObtenerAntiguedadClienteUseCase(DjangoAntiguedadSaldosRepository())
+    aging = use_case.execute(ClientId(client_id))
+
+    if aging is None:
+        return Response({'error': 'Cliente sin saldos pendientes'}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response(_antiguedad_to_dict(aging))
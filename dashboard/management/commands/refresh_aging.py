@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from dashboard.infrastructure.aging import AgingRefresher
+
+
+class Command(BaseCommand):
+    help = "Actualiza la antigüedad de saldos precalculada (incremental por fe_us_mo; completa al cambiar de día)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recalcula todos los clientes')
+
+    def handle(self, *args, **options):
+        stats = AgingRefresher().refresh(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Antigüedad {stats['modo']} al {stats['fecha_corte']}: "
+            f"{stats['clientes']} clientes, {stats['vendedores']} vendedores"
+        ))
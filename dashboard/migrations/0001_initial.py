@@ -0,0 +1,68 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='AgingClienteModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('co_cli', models.CharField(db_column='co_cli', max_length=50)),
+                ('co_ven', models.CharField(blank=True, db_column='co_ven', default='', max_length=50)),
+                ('corriente', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('dias_1_30', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('dias_31_60', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('dias_61_90', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('mas_90', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cantidad', models.IntegerField(default=0)),
+                ('fecha_corte', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Antigüedad Cliente',
+                'verbose_name_plural': 'Antigüedad Clientes',
+                'db_table': 'dashboard_aging_cliente',
+                'indexes': [models.Index(fields=['co_ven'], name='dashboard_aging_cli_ven_idx')],
+                'unique_together': {('co_cli', 'co_ven')},
+            },
+        ),
+        migrations.CreateModel(
+            name='AgingVendedorModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('co_ven', models.CharField(db_column='co_ven', max_length=50, unique=True)),
+                ('corriente', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('dias_1_30', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('dias_31_60', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('dias_61_90', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('mas_90', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('cantidad', models.IntegerField(default=0)),
+                ('cantidad_clientes', models.IntegerField(default=0)),
+                ('fecha_corte', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Antigüedad Vendedor',
+                'verbose_name_plural': 'Antigüedad Vendedores',
+                'db_table': 'dashboard_aging_vendedor',
+            },
+        ),
+        migrations.CreateModel(
+            name='AgingRefreshStateModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha_corte', models.DateField(blank=True, null=True)),
+                ('watermark', models.DateTimeField(blank=True, null=True)),
+                ('last_run', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Estado Actualización Antigüedad',
+                'db_table': 'dashboard_aging_refresh_state',
+            },
+        ),
+    ]
@@ -0,0 +1 @@
+from .infrastructure.models import AgingClienteModel, AgingVendedorModel, AgingRefreshStateModel  # re-export for Django model discovery
@@ -0,0 +1,256 @@
+"""Sincronización completa (o incremental) en una sola respuesta.
+
+Las consultas de importación corren en paralelo, cada una con su conexión del pool,
+y sus filas se envían intercaladas a medida que llegan como líneas NDJSON::
+
+    {"format": "bootstrap", "version": 1, "sections": [...], "watermark": "..."}
+    {"s": "documentos", "f": <línea del formato columnar>}
+    {"s": "documentos", "end": true, "rows": 1234, "ms": 850}
+    {"s": "eventos", "error": "..."}
+    {"end": true}
+
+Cada sección trae su propio encabezado columnar (ver shared.infrastructure.streaming.iter_columnar).
+
+Los endpoints de importación de una sola consulta usan el mismo productor con cola acotada
+(iter_import), para que un cliente lento no retenga la conexión del pool indefinidamente.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from django.conf import settings
+
+from shared.infrastructure.logging_impl import get_logger
+from shared.infrastructure.streaming import COLUMNAR_VERSION, iter_columnar, ndjson_line
+from .mssql_connector import DICTIONARY_COLUMNS, MSSQLConnector
+logger = get_logger(__name__)
+
+BOOTSTRAP_VERSION = 1
+
+SECTIONS = {
+    'documentos': lambda connector, seller_code, since, all_sellers: connector.get_documentos_cc(seller_code, since=since, stream=True, all_sellers=all_sellers),
+    'eventos': lambda connector, seller_code, since, all_sellers: connector.get_events_cc(seller_code, since=since, stream=True, all_sellers=all_sellers),
+    'clientes': lambda connector, seller_code, since, all_sellers: connector.get_clientes_vendedor(seller_code, since=since, stream=True, all_sellers=all_sellers),
+    'vendedores': lambda connector, seller_code, since, all_sellers: connector.get_sellers(stream=True),
+    'renglones': lambda connector, seller_code, since, all_sellers: connector.get_document_details(seller_code, since=since, stream=True, all_sellers=all_sellers),
+    'ventas_mensuales': lambda connector, seller_code, since, all_sellers: connector.get_month_sales(seller_code, stream=True, all_sellers=all_sellers),
+}
+
+_DONE = object()
+
+
+class _Cancelled(Exception):
+    """El cliente cortó la respuesta: la sección deja de leer filas"""
+    pass
+
+
+class ImportStalledException(Exception):
+    """El cliente dejó de leer la respuesta: se abortó la consulta y se liberó su conexión"""
+    pass
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'IMPORT_BOOTSTRAP_WORKERS', 6),
+                    thread_name_prefix='import-bootstrap'
+                )
+    return _executor
+
+
+def _put(frames: queue.Queue, item, cancelled: threading.Event, stalled: threading.Event) -> None:
+    # La cola es acotada: si el cliente lee lento las secciones esperan, pero a lo sumo
+    # IMPORT_BOOTSTRAP_STALL_TIMEOUT segundos; después se aborta la sincronización para
+    # liberar los hilos y las conexiones del pool que retiene
+    deadline = time.monotonic() + getattr(settings, 'IMPORT_BOOTSTRAP_STALL_TIMEOUT', 30)
+    while True:
+        if cancelled.is_set():
+            raise _Cancelled()
+        try:
+            frames.put(item, timeout=1)
+            return
+        except queue.Full:
+            if time.monotonic() >= deadline:
+                stalled.set()
+                cancelled.set()
+                raise _Cancelled()
+
+
+def _run_section(name: str, seller_code: str, since: Optional[datetime], all_sellers: bool,
+                 frames: queue.Queue, cancelled: threading.Event, stalled: threading.Event) -> None:
+    started = time.monotonic()
+    counter = {'rows': 0}
+
+    def counted(rows):
+        for row in rows:
+            counter['rows'] += 1
+            yield row
+
+    try:
+        with MSSQLConnector() as connector:
+            source = SECTIONS[name](connector, seller_code, since, all_sellers)
+            try:
+                for line in iter_columnar(counted(source), DICTIONARY_COLUMNS):
+                    _put(frames, f'{{"s":"{name}","f":{line.rstrip()}}}\n', cancelled, stalled)
+            finally:
+                # Cierra el cursor antes de devolver la conexión al pool (p. ej. al cancelar)
+                source.close()
+
+        elapsed = time.monotonic() - started
+        logger.info(f"Bootstrap '{name}': {counter['rows']} filas en {elapsed * 1000:.0f} ms")
+        _put(frames, ndjson_line({'s': name, 'end': True, 'rows': counter['rows'], 'ms': round(elapsed * 1000)}), cancelled, stalled)
+    except _Cancelled:
+        return
+    except Exception as e:
+        logger.error(f"Bootstrap '{name}' falló: {str(e)}")
+        try:
+            _put(frames, ndjson_line({'s': name, 'error': str(e)}), cancelled, stalled)
+        except _Cancelled:
+            return
+    finally:
+        try:
+            _put(frames, _DONE, cancelled, stalled)
+        except _Cancelled:
+            pass
+
+
+def iter_bootstrap(seller_code: str, since: Optional[datetime], watermark: datetime,
+                   all_sellers: bool = False) -> Iterator[str]:
+    """Lanza todas las secciones en paralelo y entrega sus líneas en orden de llegada.
+
+    Sin códigos de vendedor las secciones fallan, salvo con ``all_sellers`` (ver seller_filter).
+    Si ninguna sección produce datos durante IMPORT_BOOTSTRAP_IDLE_TIMEOUT segundos, o el
+    cliente deja de leer durante IMPORT_BOOTSTRAP_STALL_TIMEOUT, la respuesta termina con un
+    error. Al cerrarse la respuesta antes de tiempo las secciones se cancelan y sus conexiones
+    vuelven al pool.
+    """
+    idle_timeout = getattr(settings, 'IMPORT_BOOTSTRAP_IDLE_TIMEOUT', 120)
+    frames = queue.Queue(maxsize=getattr(settings, 'IMPORT_BOOTSTRAP_QUEUE_SIZE', 32))
+    cancelled = threading.Event()
+    stalled = threading.Event()
+
+    executor = _get_executor()
+    futures = [
+        executor.submit(_run_section, name, seller_code, since, all_sellers, frames, cancelled, stalled)
+        for name in SECTIONS
+    ]
+
+    yield ndjson_line({
+        'format': 'bootstrap',
+        'version': BOOTSTRAP_VERSION,
+        'columnar_version': COLUMNAR_VERSION,
+        'sections': list(SECTIONS),
+        'since': since.isoformat() if since else None,
+        'watermark': watermark.isoformat()
+    })
+
+    pending = len(futures)
+    last_frame = time.monotonic()
+    try:
+        while pending:
+            try:
+                frame = frames.get(timeout=1)
+            except queue.Empty:
+                if stalled.is_set():
+                    logger.error(f"Bootstrap abortado: el cliente no leyó la respuesta ({pending} secciones pendientes)")
+                    yield ndjson_line({'error': "Sincronización abortada: el cliente no leyó los datos a tiempo"})
+                    return
+                if time.monotonic() - last_frame >= idle_timeout:
+                    logger.error(f"Bootstrap sin datos durante {idle_timeout}s ({pending} secciones pendientes)")
+                    yield ndjson_line({'error': f"Sin respuesta de la base de datos durante {idle_timeout} segundos"})
+                    return
+                continue
+            last_frame = time.monotonic()
+            if frame is _DONE:
+                pending -= 1
+                continue
+            yield frame
+
+        yield ndjson_line({'end': True})
+    finally:
+        cancelled.set()
+        for future in futures:
+            future.cancel()
+
+
+def _run_import(fetch: Callable[[MSSQLConnector], Iterator[Dict[str, Any]]], state: dict,
+                frames: queue.Queue, cancelled: threading.Event, stalled: threading.Event) -> None:
+    fetch_size = getattr(settings, 'IMPORT_FETCH_SIZE', 1000)
+    try:
+        with MSSQLConnector() as connector:
+            state['watermark'] = connector.sync_watermark()
+            source = fetch(connector)
+            try:
+                while True:
+                    batch: List[Dict[str, Any]] = list(islice(source, fetch_size))
+                    if not batch:
+                        break
+                    _put(frames, batch, cancelled, stalled)
+            finally:
+                # Cierra el cursor antes de devolver la conexión al pool (p. ej. al cancelar)
+                source.close()
+    except _Cancelled:
+        return
+    except Exception as e:
+        try:
+            _put(frames, e, cancelled, stalled)
+        except _Cancelled:
+            return
+    finally:
+        try:
+            _put(frames, _DONE, cancelled, stalled)
+        except _Cancelled:
+            pass
+
+
+def iter_import(fetch: Callable[[MSSQLConnector], Iterator[Dict[str, Any]]], state: dict) -> Iterator[Dict[str, Any]]:
+    """Filas de fetch(connector) leídas en un hilo aparte a través de una cola acotada.
+
+    ``state['watermark']`` queda con la hora del servidor previa a la consulta antes de la
+    primera fila. Los errores de la consulta se relanzan aquí. Si el cliente deja de leer
+    durante IMPORT_BOOTSTRAP_STALL_TIMEOUT segundos con la cola llena, la consulta se aborta
+    y su conexión vuelve al pool; la respuesta termina con ImportStalledException (cortada,
+    para que el cliente no la tome como completa).
+    """
+    idle_timeout = getattr(settings, 'IMPORT_BOOTSTRAP_IDLE_TIMEOUT', 120)
+    frames = queue.Queue(maxsize=getattr(settings, 'IMPORT_BOOTSTRAP_QUEUE_SIZE', 32))
+    cancelled = threading.Event()
+    stalled = threading.Event()
+
+    # Un hilo por respuesta: el pool de conexiones ya limita las consultas simultáneas
+    threading.Thread(
+        target=_run_import, args=(fetch, state, frames, cancelled, stalled),
+        name='import-stream', daemon=True
+    ).start()
+
+    last_frame = time.monotonic()
+    try:
+        while True:
+            try:
+                frame = frames.get(timeout=1)
+            except queue.Empty:
+                if stalled.is_set():
+                    logger.error("Importación abortada: el cliente no leyó la respuesta")
+                    raise ImportStalledException("El cliente no leyó los datos a tiempo")
+                if time.monotonic() - last_frame >= idle_timeout:
+                    raise Exception(f"Sin respuesta de la base de datos durante {idle_timeout} segundos")
+                continue
+            last_frame = time.monotonic()
+            if frame is _DONE:
+                return
+            if isinstance(frame, Exception):
+                raise frame
+            yield from frame
+    finally:
+        cancelled.set()
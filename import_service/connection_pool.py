@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+
+from shared.infrastructure.logging_impl import get_logger
+logger = get_logger(__name__)
+
+
+class PoolTimeoutException(Exception):
+    """No se liberó ninguna conexión dentro del tiempo de espera"""
+    pass
+
+
+class _PooledConnection:
+    __slots__ = ('connection', 'created_at', 'last_used')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class MSSQLConnectionPool:
+    """Pool de conexiones pyodbc compartido por el proceso.
+
+    Reutiliza conexiones abiertas (el handshake TLS/TDS se paga una vez por
+    conexión), limita las conexiones simultáneas a ``max_size``, cierra las que
+    superan ``idle_timeout`` sin uso y verifica con ``SELECT 1`` las que estuvieron
+    inactivas más de ``validate_after`` segundos antes de entregarlas.
+    """
+
+    def __init__(self, factory: Callable[[], object], max_size: Optional[int] = None,
+                 idle_timeout: Optional[float] = None, validate_after: Optional[float] = None,
+                 checkout_timeout: Optional[float] = None):
+        self.factory = factory
+        self.max_size = max_size or getattr(settings, 'IMPORT_POOL_MAX_SIZE', 8)
+        self.idle_timeout = idle_timeout if idle_timeout is not None else getattr(settings, 'IMPORT_POOL_IDLE_TIMEOUT', 300)
+        self.validate_after = validate_after if validate_after is not None else getattr(settings, 'IMPORT_POOL_VALIDATE_AFTER', 30)
+        self.checkout_timeout = checkout_timeout if checkout_timeout is not None else getattr(settings, 'IMPORT_POOL_TIMEOUT', 30)
+
+        self._idle = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._condition = threading.Condition()
+
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.waits = 0
+        self.timeouts = 0
+
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        placeholder = None
+        while placeholder is None:
+            pooled = None
+            with self._condition:
+                while True:
+                    self._close_expired()
+
+                    if self._idle:
+                        # Se reserva la conexión y se verifica fuera del lock: una conexión
+                        # colgada no bloquea los acquire/release del resto del proceso
+                        pooled = self._idle.pop()
+                        self._checkout(pooled)
+                        break
+
+                    if len(self._in_use) < self.max_size:
+                        # Se reserva el lugar antes de conectar fuera del lock
+                        placeholder = object()
+                        self._in_use[id(placeholder)] = None
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeoutException(f"Sin conexiones disponibles tras {self.checkout_timeout}s ({self.max_size} en uso)")
+                    self.waits += 1
+                    self._condition.wait(remaining)
+
+            if pooled is None:
+                continue
+
+            alive = self._is_alive(pooled)
+            with self._condition:
+                if alive:
+                    self.reused += 1
+                    return pooled.connection
+                del self._in_use[id(pooled.connection)]
+                self._discard(pooled)
+                self._condition.notify()
+
+        try:
+            connection = self.factory()
+        except Exception:
+            with self._condition:
+                del self._in_use[id(placeholder)]
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            del self._in_use[id(placeholder)]
+            self.created += 1
+            return self._checkout(_PooledConnection(connection))
+
+    def release(self, connection, broken: bool = False) -> None:
+        with self._condition:
+            pooled = self._in_use.pop(id(connection), None)
+            if pooled is None:
+                return
+
+            if not broken:
+                try:
+                    # Deja la conexión sin transacción abierta para el próximo uso
+                    connection.rollback()
+                except Exception:
+                    broken = True
+
+            if broken:
+                self._discard(pooled)
+            else:
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        broken = False
+        try:
+            yield connection
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(connection, broken=broken)
+
+    def close_all(self) -> None:
+        with self._condition:
+            while self._idle:
+                self._discard(self._idle.pop())
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'created': self.created,
+                'reused': self.reused,
+                'discarded': self.discarded,
+                'waits': self.waits,
+                'timeouts': self.timeouts
+            }
+
+    def _checkout(self, pooled: _PooledConnection):
+        self._in_use[id(pooled.connection)] = pooled
+        return pooled.connection
+
+    def _close_expired(self) -> None:
+        now = time.monotonic()
+        # Las más antiguas quedan al principio (se reutiliza la última devuelta)
+        while self._idle and now - self._idle[0].last_used > self.idle_timeout:
+            self._discard(self._idle.popleft())
+
+    def _is_alive(self, pooled: _PooledConnection) -> bool:
+        if time.monotonic() - pooled.last_used < self.validate_after:
+            return True
+        try:
+            cursor = pooled.connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception as e:
+            logger.warning(f"Conexión del pool descartada en la verificación: {str(e)}")
+            return False
+
+    def _discard(self, pooled: _PooledConnection) -> None:
+        self.discarded += 1
+        try:
+            pooled.connection.close()
+        except Exception:
+            pass
+
+
+_pools: Dict[str, MSSQLConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(connection_string: str, factory: Callable[[], object]) -> MSSQLConnectionPool:
+    """Pool único por cadena de conexión"""
+    with _pools_lock:
+        pool = _pools.get(connection_string)
+        if pool is None:
+            pool = _pools[connection_string] = MSSQLConnectionPool(factory)
+        return pool
+
+
+def pool_stats() -> dict:
+    with _pools_lock:
+        pools = list(_pools.values())
+    stats = [pool.stats() for pool in pools]
+    return stats[0] if len(stats) == 1 else {'pools': stats}
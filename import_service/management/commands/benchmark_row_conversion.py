@@ -0,0 +1,86 @@
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from import_service.mssql_connector import column_converters
+
+# cursor.description de una consulta con la forma de get_documentos_cc
+DESCRIPTION = [
+    ('tipo_doc', str), ('nro_doc', str), ('co_cli', str), ('co_ven', str),
+    ('fec_emis', datetime), ('fec_venc', datetime),
+    ('monto_net', Decimal), ('saldo', Decimal), ('monto_bru', Decimal), ('monto_imp', Decimal),
+    ('observa', str), ('empresa', int), ('anulado', bool), ('moneda', str),
+    ('fe_us_mo', datetime), ('tasa', Decimal),
+]
+
+
+def _synthetic_rows(count: int):
+    fecha = datetime(2026, 1, 1, 10, 30)
+    return [
+        ['FACT', str(100000 + i), f'C{i % 500:04d}', f'{i % 12:02d}', fecha, fecha,
+         Decimal('1234.56'), Decimal('99.10'), Decimal('0.00'), None, 'obs', 3, False, 'USD', fecha, Decimal('12.5')]
+        for i in range(count)
+    ]
+
+
+def _per_cell(columns, rows):
+    """Conversión anterior: hasattr/isinstance en cada celda, Decimal como texto"""
+    result = []
+    for row in rows:
+        row_dict = {}
+        for i, value in enumerate(row):
+            if hasattr(value, 'isoformat'):
+                row_dict[columns[i]] = value.isoformat()
+            elif isinstance(value, (int, float, str, bool)) or value is None:
+                row_dict[columns[i]] = value
+            else:
+                row_dict[columns[i]] = str(value)
+        result.append(row_dict)
+    return result
+
+
+def _per_column(columns, rows):
+    """Conversión de MSSQLConnector.iter_query: plan por columna armado una vez"""
+    plan = column_converters(DESCRIPTION)
+    result = []
+    for row in rows:
+        for index, convert in plan:
+            value = row[index]
+            if value is not None:
+                row[index] = convert(value)
+        result.append(dict(zip(columns, row)))
+    return result
+
+
+class Command(BaseCommand):
+    # Solo CPU: no necesita base de datos ni las comprobaciones del proyecto
+    requires_system_checks = []
+
+    help = ("Compara la conversión de filas por celda con el plan de conversores por columna "
+            "de MSSQLConnector sobre un resultado sintético (no requiere SQL Server)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help='Filas del resultado sintético')
+        parser.add_argument('--runs', type=int, default=5, help='Repeticiones; se reporta la mejor')
+
+    def handle(self, *args, **options):
+        columns = [column[0] for column in DESCRIPTION]
+        base = _synthetic_rows(options['rows'])
+
+        results = {}
+        for name, convert in (('por celda', _per_cell), ('por columna', _per_column)):
+            best = None
+            for _ in range(options['runs']):
+                # Las filas se convierten en el lugar: copia nueva en cada repetición
+                rows = [list(row) for row in base]
+                started = time.perf_counter()
+                convert(columns, rows)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = best
+            self.stdout.write(f"{name}: {best * 1000:.0f} ms ({best / options['rows'] * 1e6:.2f} µs/fila)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['rows']} filas: {(1 - results['por columna'] / results['por celda']) * 100:.0f}% menos tiempo"
+        ))
@@ -0,0 +1,51 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from shared.domain.value_objects import parse_seller_codes
+from import_service.snapshots import SyncSnapshots, sync_snapshots
+
+
+class Command(BaseCommand):
+    help = ("Genera las instantáneas de sincronización por vendedor (GET /api/import/snapshot/). "
+            "Pensado para ejecutarse antes del horario de sincronización, p. ej. desde cron")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sellers', nargs='*', help='Listas de vendedores (p. ej. 01 "02,07"); '
+                                                         'por defecto las de los usuarios activos')
+        parser.add_argument('--all-sellers', action='store_true',
+                            help='Genera también la instantánea de todos los vendedores ("-1"); '
+                                 'sin esta opción se omiten las listas vacías o "-1"')
+
+    def handle(self, *args, **options):
+        seller_codes = options['sellers'] or list(
+            get_user_model().objects.filter(is_active=True)
+            .exclude(codigo_vendedor_profit='')
+            .values_list('codigo_vendedor_profit', flat=True)
+        )
+
+        # Usuarios con la misma lista de vendedores comparten instantánea
+        pending = {}
+        for seller_code in seller_codes:
+            if not parse_seller_codes(seller_code) and not options['all_sellers']:
+                self.stderr.write(f"Se omite '{seller_code}': todos los vendedores requiere --all-sellers")
+                continue
+            pending.setdefault(SyncSnapshots.key(seller_code), seller_code)
+
+        failed = 0
+        for key, seller_code in pending.items():
+            started = time.monotonic()
+            try:
+                meta = sync_snapshots.build(seller_code, all_sellers=options['all_sellers'])
+            except Exception as e:
+                failed += 1
+                self.stderr.write(self.style.ERROR(f"{key}: {str(e)}"))
+                continue
+            self.stdout.write(
+                f"{key}: {meta['bytes']} bytes en {time.monotonic() - started:.1f}s, etag {meta['etag'][:12]}, "
+                + ", ".join(f"{section} {rows}" for section, rows in meta['rows'].items())
+            )
+
+        if failed:
+            raise CommandError(f"{failed} de {len(pending)} instantáneas fallaron")
+        self.stdout.write(self.style.SUCCESS(f"{len(pending)} instantáneas generadas"))
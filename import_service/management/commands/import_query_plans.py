@@ -0,0 +1,68 @@
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from shared.domain.value_objects import parse_seller_codes
+from import_service.mssql_connector import MSSQLConnector
+
+QUERIES = {
+    'documentos': ('docum_cc', lambda connector, code: connector.get_documentos_cc(code, stream=True)),
+    'eventos': ('vw_eventos', lambda connector, code: connector.get_events_cc(code, stream=True)),
+    'renglones': ('vw_renglones_documento', lambda connector, code: connector.get_document_details(code, stream=True)),
+    'ventas_mensuales': ('vw_ventas_mensuales_vendedor', lambda connector, code: connector.get_month_sales(code, stream=True)),
+}
+
+PLAN_STATS = """
+    SELECT qs.plan_handle, qs.execution_count, cast(qp.query_plan as nvarchar(max)) as query_plan
+    FROM sys.dm_exec_query_stats qs
+    CROSS APPLY sys.dm_exec_sql_text(qs.sql_handle) st
+    CROSS APPLY sys.dm_exec_query_plan(qs.plan_handle) qp
+    WHERE st.text LIKE ? AND st.text LIKE '%cast(@P1 as varchar(20))%'
+      AND st.text NOT LIKE '%dm_exec_query_stats%'
+"""
+
+
+class Command(BaseCommand):
+    help = ("Ejecuta las consultas de importación con distintas listas de vendedores y reporta "
+            "tiempos, planes en cache (sys.dm_exec_query_stats) y operadores seek/scan. "
+            "Requiere permiso VIEW SERVER STATE")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sellers', required=True, help='Códigos de vendedor separados por coma')
+        parser.add_argument('--runs', type=int, default=2, help='Repeticiones de cada lista')
+
+    def handle(self, *args, **options):
+        codes = parse_seller_codes(options['sellers'])
+        if not codes:
+            raise CommandError("Indique al menos un código de vendedor")
+
+        # Cada vendedor solo y luego listas crecientes: con parámetros de aridad fija
+        # las listas distintas del mismo tamaño deben reutilizar el mismo plan
+        seller_lists = codes + [",".join(codes[:n]) for n in range(2, len(codes) + 1)]
+
+        with MSSQLConnector() as connector:
+            for name, (source, fetch) in QUERIES.items():
+                elapsed, rows = [], 0
+                for _ in range(options['runs']):
+                    for seller_code in seller_lists:
+                        started = time.perf_counter()
+                        rows += sum(1 for _ in fetch(connector, seller_code))
+                        elapsed.append(time.perf_counter() - started)
+
+                plans = connector.execute_query(PLAN_STATS, [f"%FROM {source}%"])
+                executions = sum(plan['execution_count'] for plan in plans)
+                operators = sorted({
+                    op for plan in plans
+                    for op in re.findall(r'PhysicalOp="([^"]*(?:Seek|Scan))"', plan['query_plan'] or '')
+                })
+
+                self.stdout.write(
+                    f"{name}: {len(elapsed)} ejecuciones, {rows} filas, "
+                    f"promedio {sum(elapsed) / len(elapsed) * 1000:.1f} ms, máx {max(elapsed) * 1000:.1f} ms | "
+                    f"{len(plans)} planes en cache, {executions} ejecuciones sobre ellos | "
+                    f"operadores: {', '.join(operators) or '-'}"
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(seller_lists)} listas de vendedores x {options['runs']} repeticiones"
+        ))
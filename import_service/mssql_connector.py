@@ -1,6 +1,90 @@
 import pyodbc
-from typing import List, Dict, Any
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from django.conf import settings
+from shared.domain.value_objects import parse_seller_codes
+from .connection_pool import get_pool
+
+
+# Conversión por tipo de columna (type_code de cursor.description) a un valor serializable en
+# JSON. None: el valor de pyodbc se usa tal cual. Decimal (montos, saldos) sale como número.
+# Tipos no listados (binary, uniqueidentifier, ...) se convierten con str.
+COLUMN_CONVERTERS: Dict[type, Optional[Callable[[Any], Any]]] = {
+    str: None,
+    int: None,
+    float: None,
+    bool: None,
+    Decimal: float,
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    time: time.isoformat,
+}
+
+
+def column_converters(description) -> List[Tuple[int, Callable[[Any], Any]]]:
+    """Plan de conversión de una consulta: (índice, conversor) de las columnas que lo necesitan"""
+    plan = []
+    for index, column in enumerate(description):
+        converter = COLUMN_CONVERTERS.get(column[1], str)
+        if converter is not None:
+            plan.append((index, converter))
+    return plan
+
+
+# Aridades fijas de la lista de vendedores: la lista se completa repitiendo el último
+# código hasta el tamaño siguiente, así cada tamaño es un solo plan en el cache de SQL Server
+SELLER_PARAM_SIZES = (1, 2, 4, 8, 16, 32, 64)
+
+
+def seller_filter(seller_code: Optional[str], column: str = 'co_ven',
+                  all_sellers: bool = False, negate: bool = False) -> Tuple[str, List[str]]:
+    """Predicado ``and co_ven in (?, ...)`` con parámetros de aridad fija.
+
+    La columna se compara sin ltrim/rtrim para que el predicado use el índice (char
+    ignora los espacios finales al comparar) y los parámetros se convierten a varchar
+    para no forzar la conversión de la columna a nvarchar. Sin códigos o con "-1" lanza
+    ValueError, salvo que el llamador pida explícitamente todos los vendedores. Con
+    ``negate`` el predicado es ``not in``.
+    """
+    codes = parse_seller_codes(seller_code)
+    if not codes:
+        if all_sellers:
+            return "", []
+        raise ValueError("Código de vendedor requerido")
+
+    size = next((n for n in SELLER_PARAM_SIZES if n >= len(codes)), len(codes))
+    params = codes + [codes[-1]] * (size - len(codes))
+    placeholders = ", ".join(["cast(? as varchar(20))"] * size)
+    return f"and {column} {'not in' if negate else 'in'} ({placeholders})", params
+
+
+# Columnas de clientes que usa la aplicación (importación por códigos y por vendedor)
+CLIENTES_COLUMNS = """
+                co_cli,
+                cli_des,
+                rif,
+                rif2,
+                ltrim(rtrim(telefonos)) as telefonos,
+                ltrim(rtrim(email)) as email,
+                ltrim(rtrim(direccion)) as direccion,
+                dias_ult_fact, 
+                dias_promedio_emision,
+                neto, 
+                creditos,
+                total,
+                ventas_ultimo_trimestre,
+                plaz_pag,
+                ltrim(rtrim(co_ven)) as co_ven,
+                case when ltrim(rtrim(co_pais)) = '' then 'VE' else ltrim(rtrim(co_pais)) end as co_pais,
+                ltrim(rtrim(ciudad)) as ciudad"""
+
+# Columnas de pocos valores distintos que se repiten en miles de filas: en formato
+# columnar viajan como índice a un diccionario por columna
+DICTIONARY_COLUMNS = (
+    'tipo_doc', 'co_ven', 'co_cli', 'empresa', 'anulado', 'doc_id',
+    'co_art', 'art_des', 'uni_venta', 'co_pais', 'ciudad', 'mes', 'plaz_pag'
+)
 
 
 class MSSQLConnector:
@@ -15,22 +99,29 @@ class MSSQLConnector:
         self.password = config('DATABASE_PASSWORD', default='')
         self.driver = config('DATABASE_DRIVER', default='{ODBC Driver 17 for SQL Server}')
         self.connection = None
+        self._broken = False
+
+    def _connection_string(self) -> str:
+        return (
+            f'DRIVER={self.driver};'
+            f'SERVER={self.server};'
+            f'DATABASE={self.database};'
+            f'UID={self.username};'
+            f'PWD={self.password};'
+            'Trusted_Connection=no;'
+            'Encrypt=yes;'
+            'TrustServerCertificate=yes;'
+        )
+
+    def _pool(self):
+        connection_string = self._connection_string()
+        return get_pool(connection_string, lambda: pyodbc.connect(connection_string, timeout=30))
 
     def connect(self):
-        """Establece conexión con SQL Server"""
+        """Toma una conexión del pool del proceso (la abre solo si no hay una libre)"""
         try:
-            connection_string = (
-                f'DRIVER={self.driver};'
-                f'SERVER={self.server};'
-                f'DATABASE={self.database};'
-                f'UID={self.username};'
-                f'PWD={self.password};'
-                'Trusted_Connection=no;'
-                'Encrypt=yes;'
-                'TrustServerCertificate=yes;'
-            )
-            
-            self.connection = pyodbc.connect(connection_string, timeout=30)
+            self.connection = self._pool().acquire()
+            self._broken = False
             return True
         except Exception as e:
             print(f"Error connecting to MSSQL: {str(e)}")
@@ -52,50 +143,140 @@ class MSSQLConnector:
         return False
 
     
-    def execute_query(self, query: str) -> List[Dict[str, Any]]:
+    def execute_query(self, query: str, params: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
         """Ejecuta una consulta y retorna los resultados como lista de diccionarios"""
+        return list(self.iter_query(query, params))
+
+    def iter_query(self, query: str, params: Optional[List[Any]] = None,
+                   fetch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Ejecuta una consulta y entrega las filas a medida que se leen, en bloques de ``fetch_size``"""
+        fetch_size = fetch_size or getattr(settings, 'IMPORT_FETCH_SIZE', 1000)
+
         if not self.connection:
             if not self.connect():
                 raise Exception("No se pudo establecer conexión con la base de datos")
 
+        cursor = self.connection.cursor()
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query)
+            cursor.execute(query, params or [])
             
-            # Obtener nombres de columnas
+            # Obtener nombres de columnas y, una sola vez, el conversor de cada una
             columns = [column[0] for column in cursor.description]
-            
-            # Obtener datos y convertir a lista de diccionarios
-            results = []
-            for row in cursor.fetchall():
-                row_dict = {}
-                for i, value in enumerate(row):
-                    # Convertir tipos de datos especiales
-                    if hasattr(value, 'isoformat'):  # datetime objects
-                        row_dict[columns[i]] = value.isoformat()
-                    elif isinstance(value, (int, float, str, bool)) or value is None:
-                        row_dict[columns[i]] = value
-                    else:
-                        row_dict[columns[i]] = str(value)
-                results.append(row_dict)
-            
-            cursor.close()
-            return results
+            plan = column_converters(cursor.description)
+
+            while True:
+                batch = cursor.fetchmany(fetch_size)
+                if not batch:
+                    break
+                if not plan:
+                    for row in batch:
+                        yield dict(zip(columns, row))
+                    continue
+                for row in batch:
+                    # Las filas de pyodbc admiten asignación: se convierte en el lugar
+                    for index, convert in plan:
+                        value = row[index]
+                        if value is not None:
+                            row[index] = convert(value)
+                    yield dict(zip(columns, row))
             
         except Exception as e:
+            # La conexión puede haber quedado inutilizable: no se devuelve al pool
+            self._broken = True
             raise Exception(f"Error ejecutando consulta: {str(e)}")
+        finally:
+            cursor.close()
+
+    def _rows(self, query: str, stream: bool, params: Optional[List[Any]] = None):
+        return self.iter_query(query, params) if stream else self.execute_query(query, params)
+
+    def sync_watermark(self) -> datetime:
+        """Hora del servidor SQL, tomada antes de consultar: marca de agua para el próximo ``since``.
+
+        Se usa el reloj del servidor (el mismo que escribe fe_us_mo) y no el de la aplicación.
+        """
+        if not self.connection:
+            if not self.connect():
+                raise Exception("No se pudo establecer conexión con la base de datos")
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT GETDATE()")
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
 
     
-    def get_documentos_cc(self, seller_code) -> List[Dict[str, Any]]:
-        seller_codes = []
-        if "," in seller_code:
-            seller_codes = [c.strip() for c in seller_code.split(",")]
-        else:
-            seller_codes.append(seller_code)
+    def get_documentos_cc(self, seller_code, since: Optional[datetime] = None, stream: bool = False,
+                          all_sellers: bool = False) -> List[Dict[str, Any]]:
+        """Obtiene documentos de cuentas por cobrar según criterios específicos.
 
-        placeholders = ", ".join([f"'{c}'" for c in seller_codes])
+        Con ``since`` retorna solo los documentos modificados después (fe_us_mo), incluidos
+        los ya cancelados o anulados, marcados con eliminado = 1 para que el cliente los borre.
+        Como docum_cc no guarda el vendedor anterior, los documentos modificados después de
+        ``since`` que hoy pertenecen a otro vendedor se envían como baja si son de clientes que
+        atienden los vendedores solicitados (tipo_doc, nro_doc, co_cli y empresa; el resto en
+        NULL): así el vendedor anterior borra los reasignados sin recibir los documentos del
+        resto de la empresa. Una reasignación que no actualiza fe_us_mo (SQL directo) o que
+        mueve también al cliente de vendedor requiere una sincronización completa (sin ``since``)
+        de los vendedores afectados.
+        """
+        sellers, params = seller_filter(seller_code, all_sellers=all_sellers)
+
+        if since is not None:
+            query = f"""
+                SELECT 
+                    tipo_doc,
+                    nro_doc,
+                    co_cli,
+                    ltrim(rtrim(co_ven)) as co_ven,
+                    fec_emis,
+                    fec_venc,
+                    monto_net,
+                    saldo,
+                    anulado,
+                    empresa,
+                    monto_bru,
+                    monto_imp,
+                    case when saldo = 0 or anulado = 1 then 1 else 0 end as eliminado
+                FROM docum_cc 
+                WHERE fe_us_mo > ?
+                {sellers}
+            """
+            params = [since] + params
+
+            if sellers:
+                # Bajas de los documentos de sus clientes que ya no pertenecen a los vendedores solicitados
+                others, others_params = seller_filter(seller_code, negate=True)
+                clients, clients_params = seller_filter(seller_code)
+                query += f"""
+                UNION ALL
+                SELECT 
+                    tipo_doc,
+                    nro_doc,
+                    co_cli,
+                    NULL as co_ven,
+                    NULL as fec_emis,
+                    NULL as fec_venc,
+                    NULL as monto_net,
+                    NULL as saldo,
+                    NULL as anulado,
+                    empresa,
+                    NULL as monto_bru,
+                    NULL as monto_imp,
+                    1 as eliminado
+                FROM docum_cc 
+                WHERE fe_us_mo > ?
+                {others}
+                and co_cli in (SELECT co_cli FROM clientes WHERE 1 = 1 {clients})
+                """
+                params += [since] + others_params + clients_params
+
+            query += """
+                ORDER BY fec_venc DESC, tipo_doc, nro_doc
+            """
+            return self._rows(query, stream, params)
 
-        """Obtiene documentos de cuentas por cobrar según criterios específicos"""
         query = f"""
             SELECT 
                 tipo_doc,
@@ -112,23 +293,28 @@ class MSSQLConnector:
                 monto_imp
             FROM docum_cc 
             WHERE saldo <> 0 AND anulado = 0
-            and ltrim(rtrim(co_ven)) in ({placeholders})
-            ORDER BY fec_venc DESC
+            {sellers}
+            ORDER BY fec_venc DESC, tipo_doc, nro_doc
         """
 
-        return self.execute_query(query)
+        return self._rows(query, stream, params)
 
 
-    def get_events_cc(self, seller_code) -> List[Dict[str, Any]]:
-        seller_codes = []
-        if "," in seller_code:
-            seller_codes = [c.strip() for c in seller_code.split(",")]
-        else:
-            seller_codes.append(seller_code)
+    def get_events_cc(self, seller_code, since: Optional[datetime] = None, stream: bool = False,
+                      all_sellers: bool = False) -> List[Dict[str, Any]]:
+        """Obtiene los eventos (documentos emitidos y cobros) de los vendedores"""
+        sellers, params = seller_filter(seller_code, all_sellers=all_sellers)
 
-        placeholders = ", ".join([f"'{c}'" for c in seller_codes])
+        # vw_eventos no tiene fe_us_mo: con since se envían los eventos emitidos desde esa
+        # fecha y los de documentos modificados después
+        delta = ""
+        if since is not None:
+            delta = """and (fec_emis >= cast(? as date)
+                 or exists (select 1 from docum_cc d
+                            where d.tipo_doc = vw_eventos.tipo_doc and d.nro_doc = vw_eventos.nro_doc
+                              and d.fe_us_mo > ?))"""
+            params = params + [since, since]
 
-        """Obtiene documentos de cuentas por cobrar según criterios específicos"""
         query = f"""
             SELECT 
                 tipo_doc,
@@ -141,22 +327,29 @@ class MSSQLConnector:
                 saldo,
                 empresa
             FROM vw_eventos 
-            WHERE ltrim(rtrim(co_ven)) in ({placeholders})
-            ORDER BY fec_emis DESC
+            WHERE 1 = 1
+            {sellers}
+            {delta}
+            ORDER BY fec_emis DESC, tipo_doc, nro_doc
         """
-        return self.execute_query(query)
+        return self._rows(query, stream, params)
   
     
-    def get_document_details(self, seller_code) -> List[Dict[str, Any]]:
-        seller_codes = []
-        if "," in seller_code:
-            seller_codes = [c.strip() for c in seller_code.split(",")]
-        else:
-            seller_codes.append(seller_code)
+    def get_document_details(self, seller_code, since: Optional[datetime] = None, stream: bool = False,
+                             all_sellers: bool = False) -> List[Dict[str, Any]]:
+        """Obtiene los renglones de los documentos de los vendedores"""
+        sellers, params = seller_filter(seller_code, all_sellers=all_sellers)
 
-        placeholders = ", ".join([f"'{c}'" for c in seller_codes])
+        # Con since se reenvían completos los renglones de los documentos modificados después
+        delta = ""
+        if since is not None:
+            delta = """and exists (select 1 from docum_cc d
+                            where d.empresa = vw_renglones_documento.empresa
+                              and d.tipo_doc = vw_renglones_documento.tipo_doc
+                              and d.nro_doc = vw_renglones_documento.nro_doc
+                              and d.fe_us_mo > ?)"""
+            params = params + [since]
 
-        """Obtiene documentos de cuentas por cobrar según criterios específicos"""
         query = f"""
             SELECT
                 rtrim(convert(varchar, empresa)) + '-' + ltrim(rtrim(tipo_doc)) + '-' + convert(varchar, nro_doc) + '-' + convert(varchar, reng_num) as id,
@@ -173,20 +366,17 @@ class MSSQLConnector:
                 total, 
                 uni_venta
             FROM vw_renglones_documento 
-            WHERE ltrim(rtrim(co_ven)) in ({placeholders})
+            WHERE 1 = 1
+            {sellers}
+            {delta}
+            ORDER BY empresa, tipo_doc, nro_doc, reng_num
         """
-        return self.execute_query(query)
+        return self._rows(query, stream, params)
 
-    def get_month_sales(self, seller_code) -> List[Dict[str, Any]]:
-        seller_codes = []
-        if "," in seller_code:
-            seller_codes = [c.strip() for c in seller_code.split(",")]
-        else:
-            seller_codes.append(seller_code)
-
-        placeholders = ", ".join([f"'{c}'" for c in seller_codes])
+    def get_month_sales(self, seller_code, stream: bool = False, all_sellers: bool = False) -> List[Dict[str, Any]]:
+        """Obtiene las ventas mensuales de los vendedores"""
+        sellers, params = seller_filter(seller_code, all_sellers=all_sellers)
 
-        """Obtiene documentos de cuentas por cobrar según criterios específicos"""
         query = f"""
             SELECT
                 right(mes,2) as id,
@@ -206,16 +396,21 @@ class MSSQLConnector:
                 else mes end as mes,
                 sum(monto_net) as monto
             FROM [vw_ventas_mensuales_vendedor] 
-            WHERE ltrim(rtrim(co_ven)) in ({placeholders})
+            WHERE 1 = 1
+            {sellers}
             group by mes
             order by id
         """
-        return self.execute_query(query)
+        return self._rows(query, stream, params)
 
     
-    def get_clientes(self, cliente_codes: List[str]) -> List[Dict[str, Any]]:
-        """Obtiene clientes activos que están en la lista de códigos proporcionada"""
-        if not cliente_codes:
+    def get_clientes(self, cliente_codes: List[str], since: Optional[datetime] = None,
+                     seller_code: Optional[str] = None, stream: bool = False) -> List[Dict[str, Any]]:
+        """Obtiene clientes activos que están en la lista de códigos proporcionada.
+
+        Con ``since`` agrega los clientes del vendedor modificados después (fe_us_mo).
+        """
+        if not cliente_codes and since is None:
             return []
         
         # Crear lista de códigos para la consulta IN
@@ -223,34 +418,51 @@ class MSSQLConnector:
             codes_string = cliente_codes
         else:
             codes_string = "', '".join(cliente_codes)
+
+        conditions, params = [], []
+        if cliente_codes:
+            conditions.append(f"co_cli IN ({codes_string})")
+        if since is not None:
+            # Sin vendedor se envían todos los clientes modificados, como en la importación completa
+            sellers, seller_params = seller_filter(seller_code, all_sellers=not seller_code)
+            conditions.append(f"(fe_us_mo > ? {sellers})")
+            params = [since] + seller_params
         
         query = f"""
-            SELECT 
-                co_cli,
-                cli_des,
-                rif,
-                rif2,
-                ltrim(rtrim(telefonos)) as telefonos,
-                ltrim(rtrim(email)) as email,
-                ltrim(rtrim(direccion)) as direccion,
-                dias_ult_fact, 
-                dias_promedio_emision,
-                neto, 
-                creditos,
-                total,
-                ventas_ultimo_trimestre,
-                plaz_pag,
-                ltrim(rtrim(co_ven)) as co_ven,
-                case when ltrim(rtrim(co_pais)) = '' then 'VE' else ltrim(rtrim(co_pais)) end as co_pais,
-                ltrim(rtrim(ciudad)) as ciudad
+            SELECT {CLIENTES_COLUMNS}
             FROM clientes 
-            WHERE co_cli IN ({codes_string})
-            ORDER BY cli_des
+            WHERE {" or ".join(conditions)}
+            ORDER BY cli_des, co_cli
         """
-        return self.execute_query(query)
+        return self._rows(query, stream, params)
 
+    def get_clientes_vendedor(self, seller_code, since: Optional[datetime] = None, stream: bool = False,
+                              all_sellers: bool = False) -> List[Dict[str, Any]]:
+        """Clientes con documentos pendientes de los vendedores (los mismos que trae la importación
+        a partir de los co_cli de get_documentos_cc), resueltos en el servidor con una subconsulta.
+
+        Con ``since``: clientes con documentos modificados después y clientes del vendedor modificados.
+        """
+        sellers, seller_params = seller_filter(seller_code, all_sellers=all_sellers)
+
+        if since is not None:
+            where = f"""co_cli in (select co_cli from docum_cc where fe_us_mo > ? {sellers})
+                 or (fe_us_mo > ? {sellers})"""
+            params = [since] + seller_params + [since] + seller_params
+        else:
+            where = f"co_cli in (select co_cli from docum_cc where saldo <> 0 and anulado = 0 {sellers})"
+            params = seller_params
 
-    def get_sellers(self) -> List[Dict[str, Any]]:
+        query = f"""
+            SELECT {CLIENTES_COLUMNS}
+            FROM clientes 
+            WHERE {where}
+            ORDER BY cli_des, co_cli
+        """
+        return self._rows(query, stream, params)
+
+
+    def get_sellers(self, stream: bool = False) -> List[Dict[str, Any]]:
         query = f"""
             SELECT 
                 ltrim(rtrim(co_ven)) as co_ven,
@@ -259,18 +471,20 @@ class MSSQLConnector:
                 telefonos,
                 email
             FROM vendedor 
+            ORDER BY co_ven
         """
-        return self.execute_query(query)
+        return self._rows(query, stream)
 
     
     def disconnect(self):
-        """Cierra la conexión"""
+        """Devuelve la conexión al pool (se descarta si falló una consulta)"""
         if self.connection:
             try:
-                self.connection.close()
-                self.connection = None
+                self._pool().release(self.connection, broken=self._broken)
             except Exception as e:
                 print(f"Error closing connection: {str(e)}")
+            finally:
+                self.connection = None
 
     def __enter__(self):
         self.connect()
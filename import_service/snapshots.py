@@ -0,0 +1,130 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+from shared.domain.value_objects import ALL_SELLERS, parse_seller_codes
+from shared.infrastructure.logging_impl import get_logger
+from .bootstrap import iter_bootstrap
+from .mssql_connector import MSSQLConnector
+logger = get_logger(__name__)
+
+
+class SnapshotBuildException(Exception):
+    """Alguna sección de la sincronización falló: se conserva la instantánea anterior"""
+    pass
+
+
+class SyncSnapshots:
+    """Instantáneas precalculadas de la sincronización completa por vendedor.
+
+    Cada instantánea es la respuesta de POST /api/import/bootstrap/ (sin ``since``)
+    comprimida con gzip, más un JSON con su ETag y marca de agua. El ETag se calcula
+    sobre las filas de cada sección (no sobre el encabezado ni los tiempos): si los
+    datos no cambiaron entre dos construcciones el ETag se mantiene. El archivo lleva
+    el ETag en el nombre, así reemplazar una instantánea no afecta a quien esté
+    leyendo la anterior.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or getattr(settings, 'SYNC_SNAPSHOT_DIR', Path(tempfile.gettempdir()) / 'sync_snapshots'))
+
+    @staticmethod
+    def key(seller_code: Optional[str]) -> str:
+        """Nombre de archivo para la lista de vendedores (normalizada: "07, 01" y "01,07" coinciden)"""
+        codes = parse_seller_codes(seller_code) or [ALL_SELLERS]
+        key = "_".join(codes)
+        if re.fullmatch(r'[A-Za-z0-9_\-]{1,100}', key):
+            return key
+        return hashlib.sha1(",".join(codes).encode('utf-8')).hexdigest()
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def meta(self, seller_code: Optional[str]) -> Optional[dict]:
+        try:
+            with open(self._meta_path(self.key(seller_code)), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def path(self, meta: dict) -> Path:
+        return self.directory / meta['file']
+
+    def build(self, seller_code: str, all_sellers: bool = False) -> dict:
+        """Genera la instantánea; la de todos los vendedores ("-1") solo con ``all_sellers``"""
+        if not parse_seller_codes(seller_code) and not all_sellers:
+            raise ValueError("Código de vendedor requerido")
+        key = self.key(seller_code)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        with MSSQLConnector() as connector:
+            watermark = connector.sync_watermark()
+
+        digests = {}
+        sections = {}
+        lines = iter_bootstrap(seller_code, None, watermark, all_sellers=all_sellers)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+                for index, line in enumerate(lines):
+                    f.write(line.encode('utf-8'))
+                    if index == 0:
+                        continue
+
+                    # Las líneas de datos empiezan con {"s":"<sección>","f":; el resto son de control
+                    if '"f":' in line[:40]:
+                        section = line[6:line.index('"', 6)]
+                        digests.setdefault(section, hashlib.sha256()).update(line.encode('utf-8'))
+                        continue
+
+                    frame = json.loads(line)
+                    if 'error' in frame:
+                        raise SnapshotBuildException(f"{frame.get('s', 'bootstrap')}: {frame['error']}")
+                    if frame.get('s'):
+                        sections[frame['s']] = frame['rows']
+
+            # Las secciones llegan intercaladas en orden variable: se combina el hash de cada una
+            etag = hashlib.sha256("".join(
+                f"{section}:{digests[section].hexdigest()}" for section in sorted(digests)
+            ).encode('utf-8')).hexdigest()
+            data_file = f"{key}.{etag[:16]}.ndjson.gz"
+            os.replace(tmp, self.directory / data_file)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        finally:
+            # Cancela las consultas pendientes si se abortó la construcción
+            lines.close()
+
+        meta = {
+            'seller_code': seller_code,
+            'file': data_file,
+            'etag': etag,
+            'watermark': watermark.isoformat(),
+            'created': datetime.now().isoformat(),
+            'bytes': (self.directory / data_file).stat().st_size,
+            'rows': sections
+        }
+
+        previous = self.meta(seller_code)
+        meta_tmp = self._meta_path(key).with_suffix('.json.tmp')
+        with open(meta_tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_tmp, self._meta_path(key))
+
+        if previous and previous['file'] != data_file:
+            (self.directory / previous['file']).unlink(missing_ok=True)
+
+        logger.info(f"Instantánea de sincronización '{key}': {meta['bytes']} bytes, {sections}")
+        return meta
+
+
+sync_snapshots = SyncSnapshots()
@@ -8,5 +8,8 @@ urlpatterns = [
     path('custom-query/', views.execute_custom_query_view, name='custom_query'),
     path('document-details/', views.import_document_details, name='docs_details'),
     path('month-sales/', views.import_month_sales_view, name='month_sales'),
-    path('eventos/', views.import_events_view, name='events')
+    path('eventos/', views.import_events_view, name='events'),
+    path('bootstrap/', views.import_bootstrap_view, name='bootstrap'),
+    path('snapshot/', views.import_snapshot_view, name='snapshot'),
+    path('pool/stats/', views.pool_stats_view, name='pool_stats')
 ]
\ No newline at end of file
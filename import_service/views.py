@@ -1,12 +1,28 @@
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 import json
 import os
+from itertools import chain
 from decouple import config
-from .mssql_connector import MSSQLConnector
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+import gzip
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.views.decorators.gzip import gzip_page
+from shared.infrastructure.streaming import (
+    NDJSON_CONTENT_TYPE, ColumnarRenderer, NDJSONRenderer, iter_chunks, streaming_columnar_response, streaming_json_response,
+    wants_columnar, wants_ndjson
+)
+from shared.domain.value_objects import parse_seller_codes
+from .mssql_connector import DICTIONARY_COLUMNS, MSSQLConnector
+from .connection_pool import pool_stats
+from .bootstrap import iter_bootstrap, iter_import
+from .snapshots import sync_snapshots
+from dashboard.infrastructure.cache import invalidate_dashboard_cache
 
 
 def get_sql_config_view():
@@ -25,34 +41,150 @@ def get_sql_config_view():
         return None
 
 
+def _parse_since(request):
+    """Marca de agua ``since`` (ISO 8601) de una sincronización incremental; None para importación completa"""
+    value = request.data.get('since')
+    if not value:
+        return None
+    since = parse_datetime(value)
+    if since is None:
+        raise ValueError(f"since inválido: {value}")
+    # fe_us_mo se guarda en hora local del servidor, sin zona
+    return timezone.make_naive(since) if timezone.is_aware(since) else since
+
+
+def _seller_code(value):
+    """Código(s) de vendedor obligatorios: las importaciones no exponen todos los vendedores (vacío o "-1")"""
+    if not parse_seller_codes(value):
+        raise ValueError("sellerCode requerido")
+    return value
+
+
+def _stream_import(request, fetch):
+    """Envía las filas de fetch(connector) en streaming: JSON, NDJSON (?format=ndjson) o
+    columnar (?format=columnar, ver shared.infrastructure.streaming.iter_columnar).
+
+    La primera fila se lee antes de responder: los errores de conexión o de la consulta
+    siguen devolviendo 500. Las filas pasan por la cola acotada de iter_import: la conexión
+    vuelve al pool al terminar el envío, al cortarlo el cliente o si deja de leer durante
+    IMPORT_BOOTSTRAP_STALL_TIMEOUT segundos. X-Sync-Watermark lleva la hora del servidor previa a la consulta, que el cliente envía
+    como ``since`` en la próxima sincronización.
+    """
+    state = {}
+    rows = iter_import(fetch, state)
+    first = next(rows, None)
+    if first is not None:
+        rows = chain([first], rows)
+    if wants_columnar(request):
+        response = streaming_columnar_response(rows, DICTIONARY_COLUMNS)
+    else:
+        response = streaming_json_response(rows, ndjson=wants_ndjson(request))
+    response['X-Sync-Watermark'] = state['watermark'].isoformat()
+    return response
+
+
+@gzip_page
 @api_view(['POST'])
+@renderer_classes([JSONRenderer, NDJSONRenderer, ColumnarRenderer])
 def import_documentos_view(request):
-    """Importa documentos desde SQL Server"""
+    """Importa documentos desde SQL Server (con ``since``, solo los modificados y las bajas)"""
 
-    seller_code = request.data.get('sellerCode', None)
+    try:
+        seller_code = _seller_code(request.data.get('sellerCode', None))
+        since = _parse_since(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        with MSSQLConnector() as connector:
-            documentos = connector.get_documentos_cc(seller_code)
-            
-            return Response(documentos)
+        response = _stream_import(request, lambda connector: connector.get_documentos_cc(seller_code, since=since, stream=True))
+
+        # La sincronización trae los saldos vigentes: el dashboard cacheado ya no aplica
+        invalidate_dashboard_cache([seller_code])
+
+        return response
 
     except Exception as e:
         return Response({
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
+@gzip_page
 @api_view(['POST'])
+def import_bootstrap_view(request):
+    """Sincronización en una sola respuesta: todas las consultas de importación en paralelo,
+    enviadas como secciones intercaladas (ver import_service.bootstrap). Acepta ``since``."""
+    try:
+        seller_code = _seller_code(request.data.get('sellerCode', None))
+        since = _parse_since(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        with MSSQLConnector() as connector:
+            watermark = connector.sync_watermark()
+    except Exception as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    # La sincronización trae los saldos vigentes: el dashboard cacheado ya no aplica
+    invalidate_dashboard_cache([seller_code])
+
+    response = StreamingHttpResponse(iter_chunks(iter_bootstrap(seller_code, since, watermark)), content_type=NDJSON_CONTENT_TYPE)
+    response['X-Sync-Watermark'] = watermark.isoformat()
+    return response
+
+
+@api_view(['GET'])
+def import_snapshot_view(request):
+    """Última instantánea de sincronización completa del vendedor (build_sync_snapshots), en el
+    formato de bootstrap. Con If-None-Match responde 304 si el cliente ya tiene esa versión;
+    404 si no hay instantánea (el cliente usa POST bootstrap/)."""
+    try:
+        seller_code = _seller_code(request.GET.get('sellerCode', None))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    meta = sync_snapshots.meta(seller_code)
+    if meta is None:
+        return Response({'error': 'No hay instantánea para el vendedor'}, status=status.HTTP_404_NOT_FOUND)
+
+    etag = f'"{meta["etag"]}"'
+    if_none_match = request.headers.get('If-None-Match', '')
+    try:
+        if etag in [tag.strip() for tag in if_none_match.split(',')]:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+            # El archivo ya está comprimido: se envía tal cual
+            response = FileResponse(open(sync_snapshots.path(meta), 'rb'), content_type=NDJSON_CONTENT_TYPE)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = StreamingHttpResponse(gzip.open(sync_snapshots.path(meta), 'rb'), content_type=NDJSON_CONTENT_TYPE)
+    except FileNotFoundError:
+        # Se reemplazó entre la lectura del JSON y la apertura del archivo
+        return Response({'error': 'Instantánea en actualización, intente nuevamente'}, status=status.HTTP_404_NOT_FOUND)
+
+    response['ETag'] = etag
+    response['X-Sync-Watermark'] = meta['watermark']
+    response['Cache-Control'] = 'private, no-cache'
+    response['Vary'] = 'Accept-Encoding'
+    return response
+
+
+@gzip_page
+@api_view(['POST'])
+@renderer_classes([JSONRenderer, NDJSONRenderer, ColumnarRenderer])
 def import_events_view(request):
     """Importa documentos desde SQL Server"""
 
-    seller_code = request.data.get('sellerCode', None)
+    try:
+        seller_code = _seller_code(request.data.get('sellerCode', None))
+        since = _parse_since(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        with MSSQLConnector() as connector:
-            documentos = connector.get_events_cc(seller_code)
-            
-            return Response(documentos)
+        return _stream_import(request, lambda connector: connector.get_events_cc(seller_code, since=since, stream=True))
 
     except Exception as e:
         return Response({
@@ -60,10 +192,22 @@ def import_events_view(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@gzip_page
 @api_view(['POST'])
+@renderer_classes([JSONRenderer, NDJSONRenderer, ColumnarRenderer])
 @csrf_exempt
 def import_clientes_view(request):
     """Importa clientes desde SQL Server"""
+    seller_code = request.data.get('sellerCode', None)
+
+    try:
+        since = _parse_since(request)
+        # El vendedor es opcional (sin él se envían los clientes modificados de todos), pero no "-1"
+        if seller_code:
+            _seller_code(seller_code)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     try:
         #custom_query = request.data.get('query')
         cliente_codes = request.data.get('list_codes', [])
@@ -91,13 +235,9 @@ def import_clientes_view(request):
             ORDER BY cli_des
         """
         
-        with MSSQLConnector() as connector:
-            if len(cliente_codes) == 0:
-                clientes = connector.execute_query(query)
-            else:
-                clientes = connector.get_clientes(cliente_codes)
-            
-            return Response(clientes)
+        if len(cliente_codes) == 0 and since is None:
+            return _stream_import(request, lambda connector: connector.iter_query(query))
+        return _stream_import(request, lambda connector: connector.get_clientes(cliente_codes, since=since, seller_code=seller_code, stream=True))
 
     except Exception as e:
         return Response({
@@ -105,16 +245,14 @@ def import_clientes_view(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     
+@gzip_page
 @api_view(['POST'])
+@renderer_classes([JSONRenderer, NDJSONRenderer, ColumnarRenderer])
 @csrf_exempt
 def import_sellers_view(request):
     """Importa Vendedores desde SQL Server"""
     try:
-        
-        with MSSQLConnector() as connector:
-            sellers = connector.get_sellers()
-            
-            return Response(sellers)
+        return _stream_import(request, lambda connector: connector.get_sellers(stream=True))
 
     except Exception as e:
         return Response({
@@ -122,17 +260,20 @@ def import_sellers_view(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     
+@gzip_page
 @api_view(['POST'])
+@renderer_classes([JSONRenderer, NDJSONRenderer, ColumnarRenderer])
 @csrf_exempt
 def import_document_details(request):
     """Importa Renglones de Documentos desde SQL Server"""
-    seller_code = request.data.get('sellerCode', None)
+    try:
+        seller_code = _seller_code(request.data.get('sellerCode', None))
+        since = _parse_since(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        with MSSQLConnector() as connector:
-            sellers = connector.get_document_details(seller_code)
-            
-            return Response(sellers)
+        return _stream_import(request, lambda connector: connector.get_document_details(seller_code, since=since, stream=True))
 
     except Exception as e:
         return Response({
@@ -140,16 +281,18 @@ def import_document_details(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
 
+@gzip_page
 @api_view(['POST'])
+@renderer_classes([JSONRenderer, NDJSONRenderer, ColumnarRenderer])
 @csrf_exempt
 def import_month_sales_view(request):
-    seller_code = request.data.get('sellerCode', None)
-
     try:
-        with MSSQLConnector() as connector:
-            sales = connector.get_month_sales(seller_code)
+        seller_code = _seller_code(request.data.get('sellerCode', None))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-            return Response(sales)
+    try:
+        return _stream_import(request, lambda connector: connector.get_month_sales(seller_code, stream=True))
     
     except Exception as e:
         return Response({
@@ -176,4 +319,10 @@ def execute_custom_query_view(request):
     except Exception as e:
         return Response({
             'error': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+def pool_stats_view(request):
+    """Métricas del pool de conexiones de MSSQLConnector"""
+    return Response(pool_stats())
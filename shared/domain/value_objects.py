@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Union
+from typing import List, Union
 from decimal import Decimal
 
 
@@ -28,6 +28,17 @@ class ClientId:
         if not self.value or len(self.value.strip()) == 0:
             raise ValueError("Client ID cannot be empty")
 
+ALL_SELLERS = "-1"
+
+
+def parse_seller_codes(value: str) -> List[str]:
+    """Convierte "07, 01,07" en ['01', '07']; "-1" o vacío (todos los vendedores) retorna []"""
+    codes = sorted({c.strip() for c in (value or "").split(",") if c.strip()})
+    if ALL_SELLERS in codes:
+        return []
+    return codes
+
+
 @dataclass(frozen=True)
 class SellerId:
     value: str 
@@ -35,6 +46,11 @@ class SellerId:
     def __post_init__(self):
         if not self.value or len(self.value.strip()) == 0:
             raise ValueError("Seller ID cannot be empty")
+
+    @property
+    def codes(self) -> List[str]:
+        """Códigos de vendedor; lista vacía significa todos los vendedores"""
+        return parse_seller_codes(self.value)
         
 
 @dataclass(frozen=True)
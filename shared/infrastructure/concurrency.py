@@ -0,0 +1,71 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .logging_impl import get_logger
+logger = get_logger(__name__)
+
+
+class SubQueryTimeoutException(Exception):
+    """Una consulta lanzada con run_concurrently no terminó dentro del timeout"""
+    pass
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'SUBQUERY_WORKERS', 8),
+                    thread_name_prefix='subquery'
+                )
+    return _executor
+
+
+def _run_task(name: str, task: Callable[[], Any]) -> Any:
+    # Cada hilo del pool usa su propia conexión; se libera según CONN_MAX_AGE como en un request
+    close_old_connections()
+    started = time.monotonic()
+    try:
+        return task()
+    finally:
+        logger.debug(f"Subconsulta '{name}' en {(time.monotonic() - started) * 1000:.0f} ms")
+        close_old_connections()
+
+
+def run_concurrently(tasks: Dict[str, Callable[[], Any]], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Ejecuta lecturas independientes en paralelo y retorna {nombre: resultado}.
+
+    El tiempo total se acerca al de la consulta más lenta. Cada consulta tiene
+    ``timeout`` segundos (SUBQUERY_TIMEOUT por defecto) contados desde el inicio;
+    si alguna lo excede se lanza SubQueryTimeoutException. Las excepciones de las
+    consultas se propagan tal cual.
+    """
+    timeout = timeout if timeout is not None else getattr(settings, 'SUBQUERY_TIMEOUT', 30)
+    executor = _get_executor()
+    started = time.monotonic()
+    futures = {name: executor.submit(_run_task, name, task) for name, task in tasks.items()}
+
+    results = {}
+    try:
+        for name, future in futures.items():
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                logger.error(f"Subconsulta '{name}' excedió {timeout}s")
+                raise SubQueryTimeoutException(f"La consulta '{name}' excedió {timeout} segundos")
+    finally:
+        for future in futures.values():
+            future.cancel()
+
+    return results
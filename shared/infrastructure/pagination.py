@@ -0,0 +1,66 @@
+import base64
+import json
+from datetime import date
+from dataclasses import dataclass, field
+from typing import Any, Generic, List, Optional, TypeVar
+
+from shared.domain.exceptions import ValidationException
+
+ItemType = TypeVar('ItemType')
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+@dataclass
+class Page(Generic[ItemType]):
+    """Página de resultados de una consulta keyset; next_cursor es None en la última página"""
+    items: List[ItemType] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(*values: Any) -> str:
+    """Codifica la última clave de ordenamiento devuelta como un cursor opaco"""
+    raw = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """Decodifica un cursor generado por encode_cursor; retorna None si no se envió cursor"""
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError) as e:
+        raise ValidationException(f"Cursor inválido: {cursor}") from e
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValidationException(f"Cursor inválido: {cursor}")
+
+    return values
+
+
+def parse_limit(value: Optional[str], default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    """Normaliza el parámetro ?limit= al rango [1, maximum]"""
+    if value in (None, ''):
+        return default
+
+    try:
+        limit = int(value)
+    except (TypeError, ValueError) as e:
+        raise ValidationException(f"limit inválido: {value}") from e
+
+    return max(1, min(limit, maximum))
+
+
+def parse_date(value: Optional[str], name: str = 'fecha') -> Optional[date]:
+    """Parámetro de fecha ISO (YYYY-MM-DD) opcional"""
+    if value in (None, ''):
+        return None
+
+    try:
+        return date.fromisoformat(value[:10])
+    except (TypeError, ValueError) as e:
+        raise ValidationException(f"{name} inválido: {value}") from e
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.conf import settings
+
+from .logging_impl import get_logger
+logger = get_logger(__name__)
+
+
+class PdfCache:
+    """Cache en disco de PDFs direccionado por contenido (sha256 del HTML + opciones).
+
+    Un mismo HTML siempre produce el mismo PDF, así que la clave sirve también de
+    ETag. El tamaño total se limita a ``max_bytes``; al excederlo se eliminan los
+    archivos menos usados (cada hit actualiza el mtime del archivo).
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = Path(directory or getattr(settings, 'PDF_CACHE_DIR', Path(tempfile.gettempdir()) / 'pdf_cache'))
+        self.max_bytes = max_bytes if max_bytes is not None else getattr(settings, 'PDF_CACHE_MAX_BYTES', 256 * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(html: str, options: Optional[Dict] = None) -> str:
+        digest = hashlib.sha256(html.encode('utf-8'))
+        digest.update(json.dumps(options or {}, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            content = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return content
+
+    def set(self, key: str, content: bytes) -> None:
+        if not self.enabled or len(content) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Escritura atómica: otro worker puede estar leyendo la misma clave
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.error(f"No se pudo guardar el PDF {key} en cache: {str(e)}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(content)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _files(self):
+        return [p for p in self.directory.glob('*/*.pdf') if p.is_file()]
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self._files():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self) -> None:
+        """Elimina los archivos con mtime más antiguo hasta quedar en el 90% del límite"""
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+
+        self._size = total
+        logger.info(f"PDF cache: {removed} archivos eliminados, {total} bytes en uso")
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 4) if total else 0,
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes
+            }
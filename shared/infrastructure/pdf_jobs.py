@@ -0,0 +1,221 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+from shared.domain.exceptions import DomainException
+from .logging_impl import get_logger
+from .pdf_renderer import PdfRendererBusyException
+logger = get_logger(__name__)
+
+PENDIENTE = 'pendiente'
+PROCESANDO = 'procesando'
+COMPLETADO = 'completado'
+ERROR = 'error'
+
+
+class PdfBundleJobs:
+    """Trabajos en segundo plano que generan un PDF por clave y los entregan en un ZIP.
+
+    El estado de cada trabajo se guarda como JSON junto al ZIP en ``directory`` para
+    que cualquier worker del servidor pueda responder la consulta de estado. Los
+    PDFs de un trabajo se generan en paralelo (``workers`` hilos) y pasan por el
+    PdfRenderer compartido, que sigue limitando los procesos wkhtmltopdf.
+
+    Los trabajos corren en hilos del proceso que los creó: cada estado guarda ese
+    proceso (``worker``) y la hora de la última actualización, y el proceso renueva
+    un latido en ``directory/.workers`` con cada PDF que empieza o termina. Un
+    trabajo sin terminar que no avanza durante ``stale_after`` segundos (por defecto
+    la espera en cola más el timeout del renderer, con margen) se informa como error:
+    el proceso que lo generaba se reinició.
+    """
+
+    def __init__(self, directory: Optional[str] = None, workers: Optional[int] = None, ttl: Optional[int] = None,
+                 stale_after: Optional[int] = None):
+        self.directory = Path(directory or getattr(settings, 'PDF_JOBS_DIR', Path(tempfile.gettempdir()) / 'pdf_jobs'))
+        self.workers = workers or getattr(settings, 'PDF_JOB_WORKERS', 2)
+        self.ttl = ttl if ttl is not None else getattr(settings, 'PDF_JOB_TTL', 24 * 3600)
+        self.stale_after = stale_after if stale_after is not None else (
+            getattr(settings, 'PDF_RENDER_QUEUE_TIMEOUT', 30) + getattr(settings, 'PDF_RENDER_TIMEOUT', 60) + 30
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='pdf-job')
+        self._locks: Dict[str, threading.Lock] = {}
+        self._worker_id = uuid.uuid4().hex
+
+    def _job_dir(self, job_id: str) -> Optional[Path]:
+        try:
+            return self.directory / uuid.UUID(job_id).hex
+        except (ValueError, TypeError):
+            return None
+
+    def submit(self, keys: List[str], render: Callable[[str], bytes], filename: Callable[[str], str]) -> str:
+        self.cleanup()
+
+        job_id = uuid.uuid4().hex
+        job_dir = self.directory / job_id
+        job_dir.mkdir(parents=True)
+
+        self._locks[job_id] = threading.Lock()
+        self._write_status(job_dir, {
+            'id': job_id,
+            'estado': PENDIENTE,
+            'claves': keys,
+            'total': len(keys),
+            'completados': 0,
+            'errores': {},
+            'creado': datetime.now().isoformat(),
+            'finalizado': None,
+            'worker': self._worker_id
+        })
+        self._heartbeat()
+
+        zip_file = zipfile.ZipFile(job_dir / 'bundle.zip.tmp', 'w', compression=zipfile.ZIP_STORED)
+        pending = {'count': len(keys)}
+        for key in keys:
+            self._executor.submit(self._run, job_id, job_dir, zip_file, pending, key, render, filename)
+
+        logger.info(f"Trabajo PDF {job_id} creado con {len(keys)} documentos")
+        return job_id
+
+    def _run(self, job_id: str, job_dir: Path, zip_file: zipfile.ZipFile, pending: dict,
+             key: str, render: Callable[[str], bytes], filename: Callable[[str], str]) -> None:
+        lock = self._locks[job_id]
+        self._heartbeat()
+        with lock:
+            self._update_status(job_dir, estado=PROCESANDO)
+
+        error = None
+        try:
+            content = self._render_with_retry(render, key)
+            with lock:
+                zip_file.writestr(filename(key), content)
+        except DomainException as e:
+            error = str(e)
+        except Exception as e:
+            logger.error(f"Trabajo PDF {job_id}: error generando '{key}': {str(e)}")
+            error = str(e)
+        finally:
+            # Cada hilo abre su propia conexión a la base de datos
+            connections.close_all()
+
+        self._heartbeat()
+        with lock:
+            status = self._read_status(job_dir)
+            if error is None:
+                status['completados'] += 1
+            else:
+                status['errores'][key] = error
+
+            pending['count'] -= 1
+            if pending['count'] == 0:
+                zip_file.close()
+                if status['completados']:
+                    os.replace(job_dir / 'bundle.zip.tmp', job_dir / 'bundle.zip')
+                    status['estado'] = COMPLETADO
+                else:
+                    (job_dir / 'bundle.zip.tmp').unlink(missing_ok=True)
+                    status['estado'] = ERROR
+                status['finalizado'] = datetime.now().isoformat()
+                self._locks.pop(job_id, None)
+                logger.info(f"Trabajo PDF {job_id} {status['estado']}: {status['completados']}/{status['total']}")
+            self._write_status(job_dir, status)
+
+    def _render_with_retry(self, render: Callable[[str], bytes], key: str, attempts: int = 5) -> bytes:
+        """Ante cola llena del renderer espera y reintenta en lugar de fallar el trabajo"""
+        for attempt in range(attempts):
+            self._heartbeat()
+            try:
+                return render(key)
+            except PdfRendererBusyException:
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(2 ** attempt)
+
+    def status(self, job_id: str) -> Optional[dict]:
+        job_dir = self._job_dir(job_id)
+        if job_dir is None:
+            return None
+        try:
+            status = self._read_status(job_dir)
+        except (OSError, ValueError):
+            return None
+
+        if status['estado'] in (PENDIENTE, PROCESANDO) and self._is_stale(status):
+            status['estado'] = ERROR
+            status['error'] = "El trabajo dejó de avanzar (se reinició el servidor); vuelva a solicitarlo"
+        return status
+
+    def _heartbeat_path(self, worker_id: str) -> Path:
+        return self.directory / '.workers' / worker_id
+
+    def _heartbeat(self) -> None:
+        path = self._heartbeat_path(self._worker_id)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+        except OSError as e:
+            logger.warning(f"Trabajos PDF: no se pudo registrar el latido: {str(e)}")
+
+    def _is_stale(self, status: dict) -> bool:
+        """Sin actualizaciones del trabajo ni latidos de su proceso durante ``stale_after`` segundos"""
+        last = datetime.fromisoformat(status.get('actualizado') or status['creado']).timestamp()
+        try:
+            last = max(last, self._heartbeat_path(status.get('worker') or '').stat().st_mtime)
+        except (OSError, ValueError):
+            pass
+        return time.time() - last > self.stale_after
+
+    def bundle_path(self, job_id: str) -> Optional[Path]:
+        job_dir = self._job_dir(job_id)
+        if job_dir is None:
+            return None
+        path = job_dir / 'bundle.zip'
+        return path if path.is_file() else None
+
+    def cleanup(self) -> None:
+        """Elimina los trabajos más antiguos que el TTL"""
+        if not self.directory.is_dir():
+            return
+        limit = time.time() - self.ttl
+        for job_dir in self.directory.iterdir():
+            try:
+                if job_dir.name == '.workers':
+                    # Latidos de procesos que ya no existen
+                    for heartbeat in job_dir.iterdir():
+                        if heartbeat.stat().st_mtime < limit:
+                            heartbeat.unlink(missing_ok=True)
+                elif job_dir.is_dir() and job_dir.stat().st_mtime < limit:
+                    shutil.rmtree(job_dir, ignore_errors=True)
+            except OSError:
+                pass
+
+    def _read_status(self, job_dir: Path) -> dict:
+        with open(job_dir / 'status.json', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_status(self, job_dir: Path, status: dict) -> None:
+        status['actualizado'] = datetime.now().isoformat()
+        tmp = job_dir / 'status.json.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(status, f)
+        os.replace(tmp, job_dir / 'status.json')
+
+    def _update_status(self, job_dir: Path, **values) -> None:
+        status = self._read_status(job_dir)
+        if status['estado'] == PENDIENTE:
+            status.update(values)
+            self._write_status(job_dir, status)
+
+
+pdf_jobs = PdfBundleJobs()
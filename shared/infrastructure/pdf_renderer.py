@@ -0,0 +1,175 @@
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import pdfkit
+from django.conf import settings
+
+from .logging_impl import get_logger
+from .pdf_cache import PdfCache
+logger = get_logger(__name__)
+
+
+class PdfRendererBusyException(Exception):
+    """La cola de render está llena; el cliente debe reintentar (429)"""
+    pass
+
+
+class PdfRenderTimeoutException(Exception):
+    """El PDF no se generó dentro del tiempo permitido (espera en cola + render)"""
+    pass
+
+
+@dataclass(frozen=True)
+class PdfDocument:
+    """PDF generado; etag es la clave de contenido del HTML que lo produjo"""
+    content: bytes
+    etag: str
+    cached: bool = False
+
+
+class PdfRenderer:
+    """Servicio compartido de generación de PDF con wkhtmltopdf.
+
+    Limita los procesos wkhtmltopdf simultáneos a ``workers`` y admite a lo sumo
+    ``queue_size`` solicitudes en espera; por encima de eso rechaza de inmediato con
+    PdfRendererBusyException. Cada render tiene timeout y el proceso se termina si
+    lo excede. La configuración de pdfkit (ruta del binario) se resuelve una sola vez.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 queue_timeout: Optional[float] = None, render_timeout: Optional[float] = None,
+                 cache: Optional[PdfCache] = None):
+        self.workers = workers or getattr(settings, 'PDF_RENDER_WORKERS', 4)
+        self.queue_size = queue_size if queue_size is not None else getattr(settings, 'PDF_RENDER_QUEUE_SIZE', 16)
+        self.queue_timeout = queue_timeout or getattr(settings, 'PDF_RENDER_QUEUE_TIMEOUT', 30)
+        self.render_timeout = render_timeout or getattr(settings, 'PDF_RENDER_TIMEOUT', 60)
+
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='pdf-render')
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._configuration = None
+        self._lock = threading.Lock()
+
+        self._in_flight = 0
+        self.rendered = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._render_times = deque(maxlen=200)
+        self._wait_times = deque(maxlen=200)
+
+    def _get_configuration(self):
+        if self._configuration is None:
+            self._configuration = pdfkit.configuration()
+        return self._configuration
+
+    def render_document(self, html: str, options: Optional[Dict] = None, name: str = 'pdf') -> PdfDocument:
+        """Como render() pero consultando primero el cache de PDFs: un hit no ejecuta wkhtmltopdf"""
+        key = PdfCache.key(html, options)
+        if self.cache is not None:
+            content = self.cache.get(key)
+            if content is not None:
+                logger.info(f"PDF '{name}' servido desde cache ({len(content)} bytes)")
+                return PdfDocument(content=content, etag=key, cached=True)
+
+        content = self.render(html, options, name=name)
+        if self.cache is not None:
+            self.cache.set(key, content)
+        return PdfDocument(content=content, etag=key)
+
+    def render(self, html: str, options: Optional[Dict] = None, name: str = 'pdf') -> bytes:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            logger.warning(f"PDF '{name}' rechazado: cola llena ({self.workers} workers, {self.queue_size} en cola)")
+            raise PdfRendererBusyException("Servicio de PDF ocupado, intente nuevamente")
+
+        with self._lock:
+            self._in_flight += 1
+
+        enqueued_at = time.monotonic()
+        try:
+            future = self._executor.submit(self._render, html, options or {}, name, enqueued_at)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+
+        try:
+            return future.result(timeout=self.queue_timeout + self.render_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise PdfRenderTimeoutException(f"Tiempo de espera agotado generando PDF '{name}'")
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _render(self, html: str, options: Dict, name: str, enqueued_at: float) -> bytes:
+        waited = time.monotonic() - enqueued_at
+        if waited > self.queue_timeout:
+            # El solicitante ya no espera este resultado
+            with self._lock:
+                self.timeouts += 1
+            raise PdfRenderTimeoutException(f"PDF '{name}' descartado tras {waited:.1f}s en cola")
+
+        started = time.monotonic()
+        command = pdfkit.PDFKit(html, 'string', options=options, configuration=self._get_configuration()).command()
+        try:
+            result = subprocess.run(command, input=html.encode('utf-8'), capture_output=True, timeout=self.render_timeout)
+        except subprocess.TimeoutExpired:
+            with self._lock:
+                self.timeouts += 1
+            raise PdfRenderTimeoutException(f"wkhtmltopdf excedió {self.render_timeout}s generando '{name}'")
+
+        elapsed = time.monotonic() - started
+        if result.returncode != 0 or not result.stdout:
+            with self._lock:
+                self.failed += 1
+            stderr = result.stderr.decode('utf-8', errors='replace')
+            logger.error(f"wkhtmltopdf falló generando '{name}' (exit {result.returncode}): {stderr}")
+            raise IOError(f"wkhtmltopdf reported an error:\n{stderr}")
+
+        with self._lock:
+            self.rendered += 1
+            self._render_times.append(elapsed)
+            self._wait_times.append(waited)
+
+        logger.info(f"PDF '{name}' generado en {elapsed * 1000:.0f} ms (cola {waited * 1000:.0f} ms, {len(result.stdout)} bytes)")
+        return result.stdout
+
+    def stats(self) -> dict:
+        def summary(values) -> dict:
+            ordered = sorted(values)
+            if not ordered:
+                return {'avg_ms': 0, 'p95_ms': 0, 'max_ms': 0}
+            return {
+                'avg_ms': round(sum(ordered) / len(ordered) * 1000, 1),
+                'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+                'max_ms': round(ordered[-1] * 1000, 1)
+            }
+
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queue_size': self.queue_size,
+                'in_flight': self._in_flight,
+                'rendered': self.rendered,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'render': summary(self._render_times),
+                'queue_wait': summary(self._wait_times),
+                'cache': self.cache.stats() if self.cache is not None else None
+            }
+
+
+pdf_renderer = PdfRenderer(cache=PdfCache())
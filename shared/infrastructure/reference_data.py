@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from .logging_impl import get_logger
+logger = get_logger(__name__)
+
+
+class ReferenceTable:
+    """Tabla de referencia (código -> descripción) cargada completa en memoria"""
+
+    def __init__(self, name: str, load_sql: str, version_sql: str):
+        self.name = name
+        self.load_sql = load_sql
+        self.version_sql = version_sql
+        self.values: Dict[str, str] = {}
+        self.version = None
+
+    def load(self, cursor) -> None:
+        cursor.execute(self.version_sql)
+        version = tuple(cursor.fetchone() or ())
+        cursor.execute(self.load_sql)
+        self.values = {str(code).strip(): (desc.strip() if isinstance(desc, str) else desc) for code, desc in cursor.fetchall()}
+        self.version = version
+
+    def is_stale(self, cursor) -> bool:
+        cursor.execute(self.version_sql)
+        return tuple(cursor.fetchone() or ()) != self.version
+
+
+class ReferenceDataCache:
+    """Cache en proceso de tablas que casi no cambian (condicio, vendedor).
+
+    Se carga completo en el primer acceso. Al vencer el TTL se ejecuta una consulta
+    de versión por tabla (cantidad de filas + checksum); solo las tablas cuya versión
+    cambió se vuelven a leer. Mientras alguna tabla no se haya podido cargar, cada
+    acceso reintenta la carga en lugar de esperar al TTL.
+    """
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else getattr(settings, 'REFERENCE_DATA_TTL', 600)
+        self._lock = threading.RLock()
+        self._checked_at = 0.0
+        self.tables = {
+            'condicio': ReferenceTable(
+                'condicio',
+                "SELECT co_cond, cond_des FROM condicio",
+                "SELECT COUNT(*), CHECKSUM_AGG(BINARY_CHECKSUM(co_cond, cond_des)) FROM condicio"
+            ),
+            'vendedor': ReferenceTable(
+                'vendedor',
+                "SELECT co_ven, ven_des FROM vendedor",
+                "SELECT COUNT(*), CHECKSUM_AGG(BINARY_CHECKSUM(co_ven, ven_des)) FROM vendedor"
+            ),
+        }
+
+    def _is_loaded(self) -> bool:
+        return all(table.version is not None for table in self.tables.values())
+
+    def _is_fresh(self) -> bool:
+        return self._is_loaded() and time.monotonic() - self._checked_at < self.ttl
+
+    def _ensure_fresh(self) -> None:
+        if self._is_fresh():
+            return
+
+        with self._lock:
+            if self._is_fresh():
+                return
+
+            with connection.cursor() as cursor:
+                for table in self.tables.values():
+                    try:
+                        if table.version is None or table.is_stale(cursor):
+                            table.load(cursor)
+                            logger.info(f"Reference data '{table.name}' cargada: {len(table.values)} registros")
+                    except Exception as e:
+                        # Se conservan los valores anteriores; si la tabla nunca se cargó se
+                        # reintenta en el próximo acceso, si no al próximo vencimiento
+                        logger.error(f"Error cargando reference data '{table.name}': {str(e)}")
+            self._checked_at = time.monotonic()
+
+    def get(self, table: str, code) -> Optional[str]:
+        if code is None:
+            return None
+        self._ensure_fresh()
+        return self.tables[table].values.get(str(code).strip())
+
+    def condicion_pago(self, co_cond: Optional[str]) -> Optional[str]:
+        return self.get('condicio', co_cond)
+
+    def vendedor_nombre(self, co_ven: Optional[str]) -> Optional[str]:
+        return self.get('vendedor', co_ven)
+
+    def invalidate(self) -> None:
+        """Fuerza la verificación de versión en el próximo acceso"""
+        with self._lock:
+            self._checked_at = float('-inf')
+
+
+reference_data = ReferenceDataCache()
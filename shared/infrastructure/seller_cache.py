@@ -0,0 +1,148 @@
+import threading
+import uuid
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from shared.domain.value_objects import ALL_SELLERS, parse_seller_codes
+from shared.infrastructure.logging_impl import get_logger
+logger = get_logger(__name__)
+
+
+def normalize_seller_codes(seller_id: str) -> List[str]:
+    """Como parse_seller_codes pero "todos los vendedores" se representa como ["-1"]"""
+    return parse_seller_codes(seller_id) or [ALL_SELLERS]
+
+
+class SellerCache:
+    """Contadores de generación por vendedor y resultados parciales por vendedor.
+
+    Se guarda en el cache ``shared`` de ``CACHES``, común a los workers. Invalidar un
+    vendedor le asigna una generación nueva (y al consolidado "-1"); las claves que
+    dependen de él dejan de coincidir y expiran por TTL. Las generaciones son tokens
+    aleatorios, no contadores: si el backend descarta una (el cache en disco elimina
+    entradas al llenarse) se crea otra que tampoco coincide con ninguna clave vieja. Lo usan los repositorios
+    (parciales del resumen) y el cache del dashboard (respuestas completas).
+
+    El parcial de cada vendedor lleva además la versión de sus datos con que se calculó
+    (ver get_partials): Profit modifica docum_cc sin pasar por la aplicación, así que la
+    invalidación explícita no alcanza. Las versiones se guardan unos segundos
+    (version_ttl) para no repetir la consulta en cada pedido.
+    """
+
+    def __init__(self, ttl: Optional[int] = None, prefix: str = "sellers", alias: str = "shared",
+                 version_ttl: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else getattr(settings, 'SELLER_PARTIALS_CACHE_TTL', 3600)
+        self.version_ttl = version_ttl if version_ttl is not None else getattr(settings, 'SELLER_VERSION_CACHE_TTL', 30)
+        self.prefix = prefix
+        self.alias = alias
+        self._lock = threading.Lock()
+        self.partial_hits = 0
+        self.partial_misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _generation_key(self, code: str) -> str:
+        return f"{self.prefix}:gen:{code}"
+
+    @property
+    def _global_generation_key(self) -> str:
+        return self._generation_key("*")
+
+    @staticmethod
+    def _new_generation() -> str:
+        return uuid.uuid4().hex[:16]
+
+    def generations(self, codes: List[str]) -> List[str]:
+        """Generación global seguida de la de cada vendedor, en el orden de ``codes``"""
+        gen_keys = [self._global_generation_key] + [self._generation_key(c) for c in codes]
+        found = self.cache.get_many(gen_keys)
+        missing = [k for k in gen_keys if k not in found]
+        if missing:
+            # add() no pisa la generación que otro worker haya creado mientras tanto
+            for key in missing:
+                self.cache.add(key, self._new_generation(), None)
+            found.update(self.cache.get_many(missing))
+        return [str(found.get(k, '')) for k in gen_keys]
+
+    def _version_key(self, code: str) -> str:
+        return f"{self.prefix}:version:{code}"
+
+    def get_versions(self, codes: List[str]) -> Dict[str, Any]:
+        """Versiones de datos por vendedor consultadas hace menos de ``version_ttl`` segundos"""
+        if self.version_ttl <= 0 or not codes:
+            return {}
+
+        keys = {code: self._version_key(code) for code in codes}
+        found = self.cache.get_many(list(keys.values()))
+        return {code: found[key] for code, key in keys.items() if key in found}
+
+    def set_versions(self, versions: Dict[str, Any]) -> None:
+        if self.version_ttl <= 0 or not versions:
+            return
+        self.cache.set_many({self._version_key(code): value for code, value in versions.items()}, self.version_ttl)
+
+    def _partial_keys(self, kind: str, codes: List[str], versions: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        global_gen, *seller_gens = self.generations(codes)
+        day = date.today().isoformat()
+        versions = versions or {}
+        return {
+            code: f"{self.prefix}:partial:{kind}:{day}:{versions.get(code)}:{global_gen}.{gen}:{code}"
+            for code, gen in zip(codes, seller_gens)
+        }
+
+    def get_partials(self, kind: str, codes: List[str], versions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Resultados parciales por vendedor ya calculados hoy con la misma versión de los
+        datos de ese vendedor (``versions``; "-1" guarda el de todos los vendedores)"""
+        if self.ttl <= 0 or not codes:
+            return {}
+
+        keys = self._partial_keys(kind, codes, versions)
+        found = self.cache.get_many(list(keys.values()))
+        partials = {code: found[key] for code, key in keys.items() if key in found}
+        with self._lock:
+            self.partial_hits += len(partials)
+            self.partial_misses += len(codes) - len(partials)
+        return partials
+
+    def set_partials(self, kind: str, partials: Dict[str, Any], versions: Optional[Dict[str, Any]] = None) -> None:
+        if self.ttl <= 0 or not partials:
+            return
+
+        keys = self._partial_keys(kind, list(partials), versions)
+        self.cache.set_many({keys[code]: value for code, value in partials.items()}, self.ttl)
+
+    def invalidate(self, seller_codes: Optional[Iterable[str]] = None) -> None:
+        """Invalida los vendedores indicados (y el consolidado "-1"), o todos si no se indican"""
+        if seller_codes is None:
+            keys = [self._global_generation_key]
+        else:
+            codes = set()
+            for code in seller_codes:
+                codes.update(normalize_seller_codes(code))
+            keys = [self._generation_key(c) for c in codes | {ALL_SELLERS}]
+
+        self.cache.set_many({key: self._new_generation() for key in keys}, None)
+
+        logger.info(f"Cache por vendedor invalidado: {seller_codes if seller_codes is not None else 'todos'}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'partial_hits': self.partial_hits,
+                'partial_misses': self.partial_misses,
+                'partial_ttl': self.ttl,
+                'version_ttl': self.version_ttl
+            }
+
+
+seller_cache = SellerCache()
+
+
+def invalidate_seller_cache(seller_codes: Optional[Iterable[str]] = None) -> None:
+    """Hook para importaciones y escrituras sobre documentos"""
+    seller_cache.invalidate(seller_codes)
@@ -0,0 +1,172 @@
+"""Ejecución de procedimientos almacenados de Profit con filas tipadas.
+
+Ejemplo::
+
+    with StoredProcedure('dbo.pp_consulta_edo_cuenta_bot', [rif, '-1', -1]) as sp:
+        documentos = sp.all(EstadoCuentaRow)     # primer result set
+        resumen = sp.all(ResumenRow)             # siguiente result set
+
+Cada llamada a ``rows``/``all``/``one`` consume un result set y avanza al siguiente.
+"""
+import threading
+import time
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Sequence, Type, TypeVar, Union
+
+from django.db import connections
+
+from .logging_impl import get_logger
+logger = get_logger(__name__)
+
+
+class StoredProcedureRow:
+    """Fila de un result set con atributos en ``__slots__``.
+
+    Cada atributo se toma de la columna del mismo nombre (sin distinguir mayúsculas)
+    solo si todos los atributos tienen una; si falta alguna, todos se toman por el
+    orden de ``__slots__`` (no se mezclan nombres y posiciones). Para procedimientos
+    cuyas columnas solo se conocen por posición, ``positions`` fija el índice de los
+    atributos indicados. Si el result set tiene menos columnas que atributos o dos
+    atributos caen en la misma columna se lanza ValueError.
+    """
+    __slots__ = ()
+    positions: Dict[str, int] = {}
+
+    def __init__(self, **values):
+        for field in self.__slots__:
+            setattr(self, field, values.get(field))
+
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.as_dict().items())})"
+
+    @classmethod
+    def column_indexes(cls, description) -> List[int]:
+        description = description or []
+        by_name = {column[0].lower(): index for index, column in enumerate(description) if column[0]}
+        named = [field for field in cls.__slots__ if field not in cls.positions]
+        use_names = all(field.lower() in by_name for field in named)
+
+        indexes = [
+            cls.positions[field] if field in cls.positions
+            else by_name[field.lower()] if use_names else position
+            for position, field in enumerate(cls.__slots__)
+        ]
+
+        if len(description) < len(cls.__slots__) or max(indexes, default=-1) >= len(description):
+            raise ValueError(
+                f"{cls.__name__}: el result set tiene {len(description)} columnas, se esperaban {len(cls.__slots__)}"
+            )
+        if len(set(indexes)) != len(indexes):
+            raise ValueError(f"{cls.__name__}: dos atributos corresponden a la misma columna ({indexes})")
+        return indexes
+
+
+R = TypeVar('R', bound=StoredProcedureRow)
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, dict] = {}
+
+
+def _record(procedure: str, elapsed: float, rows: int) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(procedure, {'calls': 0, 'rows': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        stats['calls'] += 1
+        stats['rows'] += rows
+        stats['total_ms'] += elapsed * 1000
+        stats['max_ms'] = max(stats['max_ms'], elapsed * 1000)
+
+
+def procedure_stats() -> Dict[str, dict]:
+    """Llamadas, filas y tiempos (total/máximo en ms) por procedimiento desde el arranque"""
+    with _stats_lock:
+        return {
+            name: dict(stats, avg_ms=round(stats['total_ms'] / stats['calls'], 1))
+            for name, stats in _stats.items()
+        }
+
+
+class StoredProcedure:
+    """Ejecuta un procedimiento almacenado y lee sus result sets como filas tipadas.
+
+    ``params`` puede ser una lista (argumentos posicionales) o un diccionario
+    (``@nombre = valor``). Las filas se leen con ``fetchmany`` para no cargar
+    completos los result sets grandes cuando se consumen con ``rows``.
+    """
+
+    def __init__(self, procedure: str, params: Union[Sequence, Dict, None] = None,
+                 using: str = 'default', fetch_size: int = 500):
+        self.procedure = procedure
+        self.params = params or []
+        self.using = using
+        self.fetch_size = fetch_size
+        self._cursor = None
+        self._started = 0.0
+        self._pending_set = False
+        self._row_count = 0
+
+    def _sql(self):
+        if isinstance(self.params, dict):
+            args = ", ".join(f"@{name} = %s" for name in self.params)
+            return f"EXECUTE {self.procedure} {args}", list(self.params.values())
+        args = ", ".join("%s" for _ in self.params)
+        return f"EXECUTE {self.procedure} {args}", list(self.params)
+
+    def __enter__(self) -> 'StoredProcedure':
+        sql, params = self._sql()
+        self._started = time.monotonic()
+        self._cursor = connections[self.using].cursor()
+        try:
+            self._cursor.execute(sql, params)
+        except Exception:
+            self._cursor.close()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = time.monotonic() - self._started
+        self._cursor.close()
+        _record(self.procedure, elapsed, self._row_count)
+        logger.info(f"{self.procedure}: {elapsed * 1000:.0f} ms, {self._row_count} filas")
+
+    def _advance(self) -> bool:
+        """Se posiciona en el próximo result set con columnas (omite los de solo conteo de filas)"""
+        if self._pending_set and not self._cursor.nextset():
+            return False
+        self._pending_set = True
+        while self._cursor.description is None:
+            if not self._cursor.nextset():
+                return False
+        return True
+
+    def rows(self, row_type: Type[R]) -> Iterator[R]:
+        """Itera el siguiente result set en bloques de ``fetch_size`` filas"""
+        if not self._advance():
+            return
+
+        getter = itemgetter(*row_type.column_indexes(self._cursor.description))
+        fields = row_type.__slots__
+        single = len(fields) == 1
+
+        while True:
+            batch = self._cursor.fetchmany(self.fetch_size)
+            if not batch:
+                break
+            self._row_count += len(batch)
+            for raw in batch:
+                values = (getter(raw),) if single else getter(raw)
+                row = row_type.__new__(row_type)
+                for field, value in zip(fields, values):
+                    setattr(row, field, value)
+                yield row
+
+    def all(self, row_type: Type[R]) -> List[R]:
+        return list(self.rows(row_type))
+
+    def one(self, row_type: Type[R]) -> Optional[R]:
+        """Primera fila del siguiente result set (el resto del result set se descarta)"""
+        for row in self.rows(row_type):
+            return row
+        return None
@@ -0,0 +1,158 @@
+from typing import Any, Dict, Iterable, Iterator, List
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+_encoder = DjangoJSONEncoder(separators=(',', ':'))
+
+# Tamaño aproximado de cada fragmento enviado: evita una escritura al socket por fila
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_array(rows: Iterable[Any]) -> Iterator[str]:
+    """Serializa las filas como un arreglo JSON, una fila por fragmento"""
+    yield '['
+    first = True
+    for row in rows:
+        if first:
+            first = False
+            yield _encoder.encode(row)
+        else:
+            yield ',' + _encoder.encode(row)
+    yield ']'
+
+
+def ndjson_line(value: Any) -> str:
+    return _encoder.encode(value) + '\n'
+
+
+def iter_ndjson(rows: Iterable[Any]) -> Iterator[str]:
+    """Serializa las filas como NDJSON (un objeto JSON por línea)"""
+    for row in rows:
+        yield ndjson_line(row)
+
+
+COLUMNAR_VERSION = 1
+
+
+def iter_columnar(rows: Iterable[Dict[str, Any]], dictionary_columns: Iterable[str] = (),
+                  batch_size: int = 500) -> Iterator[str]:
+    """Serializa filas (dict) en formato columnar sobre NDJSON.
+
+    La primera línea es el encabezado::
+
+        {"format": "columnar", "version": 1, "columns": [...], "dictionary": [...]}
+
+    y cada línea siguiente es un bloque de hasta ``batch_size`` filas::
+
+        {"d": {"tipo_doc": ["FACT", "N/CR"]}, "r": [[0, 1234, ...], ...]}
+
+    Las filas van como arreglos en el orden de ``columns``. Las columnas de
+    ``dictionary`` (presentes en el resultado) llevan el índice del valor en un
+    diccionario por columna que crece bloque a bloque: ``d`` trae solo los valores
+    nuevos de ese bloque, en orden de índice. Los nulos se envían como null.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    columns: List[str] = list(first.keys()) if first is not None else []
+    dictionary_columns = set(dictionary_columns)
+    encoded = [column for column in columns if column in dictionary_columns]
+
+    yield _encoder.encode({
+        'format': 'columnar',
+        'version': COLUMNAR_VERSION,
+        'columns': columns,
+        'dictionary': encoded
+    }) + '\n'
+    if first is None:
+        return
+
+    positions = [(columns.index(column), column, {}) for column in encoded]
+
+    def frame(batch: List[list]) -> str:
+        new_values = {}
+        for index, column, dictionary in positions:
+            added = []
+            for values in batch:
+                value = values[index]
+                if value is None:
+                    continue
+                code = dictionary.get(value)
+                if code is None:
+                    code = dictionary[value] = len(dictionary)
+                    added.append(value)
+                values[index] = code
+            if added:
+                new_values[column] = added
+        return _encoder.encode({'d': new_values, 'r': batch}) + '\n'
+
+    batch = [list(first.values())]
+    for row in rows:
+        batch.append(list(row.values()))
+        if len(batch) >= batch_size:
+            yield frame(batch)
+            batch = []
+    if batch:
+        yield frame(batch)
+
+
+def iter_chunks(parts: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Agrupa fragmentos pequeños en bloques de al menos ``size`` caracteres"""
+    buffer = []
+    length = 0
+    for part in parts:
+        buffer.append(part)
+        length += len(part)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def streaming_json_response(rows: Iterable[Any], ndjson: bool = False) -> StreamingHttpResponse:
+    """Respuesta que envía las filas a medida que se producen, sin materializar la lista completa"""
+    if ndjson:
+        return StreamingHttpResponse(iter_chunks(iter_ndjson(rows)), content_type=NDJSON_CONTENT_TYPE)
+    return StreamingHttpResponse(iter_chunks(iter_json_array(rows)), content_type='application/json')
+
+
+def streaming_columnar_response(rows: Iterable[Dict[str, Any]], dictionary_columns: Iterable[str] = ()) -> StreamingHttpResponse:
+    """Como streaming_json_response pero en el formato columnar de iter_columnar"""
+    response = StreamingHttpResponse(iter_chunks(iter_columnar(rows, dictionary_columns)), content_type=NDJSON_CONTENT_TYPE)
+    response['X-Wire-Format'] = f'columnar; version={COLUMNAR_VERSION}'
+    return response
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Permite ?format=ndjson en vistas DRF; las vistas responden con streaming_json_response"""
+    media_type = NDJSON_CONTENT_TYPE
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(iter_ndjson(rows)).encode(self.charset)
+
+
+class ColumnarRenderer(NDJSONRenderer):
+    """Permite ?format=columnar; las vistas responden con streaming_columnar_response"""
+    format = 'columnar'
+
+
+def wants_columnar(request) -> bool:
+    return request.GET.get('format') == 'columnar'
+
+
+def wants_ndjson(request) -> bool:
+    return request.GET.get('format') == 'ndjson'
+
+
+def wants_stream(request) -> bool:
+    return wants_ndjson(request) or request.GET.get('stream') in ['1', 'true', 'True']
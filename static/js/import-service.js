@@ -88,7 +88,45 @@ class ImportService {
         return state;
     }
 
-    async importFromMSSQL(userInfo) {
+    // Contacto por defecto de cada cliente a partir de sus datos en Profit
+    addClientContacts(clientes) {
+        clientes.forEach(cliente => {
+           cliente["contacts"] = [
+             { 
+               id: -1, 
+               client_id: cliente.co_cli, 
+               name: cliente.cli_des, 
+               first_name: '', 
+               last_name: '', 
+               phones: (cliente.telefonos && cliente.telefonos.trim() != '') ? [
+                {
+                    id: -1,
+                    phone: cliente.telefonos,
+                    phone_type: 'work'
+                }
+               ] : [], 
+               emails: (cliente.email && cliente.email.trim() != '') ? [
+                {
+                    id: -1,
+                    email: cliente.email,
+                    mail_type: 'work'
+                }
+               ] : [], 
+               addresses: (cliente.direccion && cliente.direccion.trim() != '') ? [
+                {
+                    id: -1,
+                    address: cliente.direccion,
+                    state: this.getAddressState(cliente),
+                    zipcode: cliente.zip,
+                    country_id: 1
+                }
+               ] : []
+             }
+           ] 
+        });
+    }
+
+    async importFromMSSQL(userInfo, { full = false } = {}) {
         if (this.isImporting) {
             throw new Error('Ya hay una importación en progreso');
         }
@@ -101,55 +139,26 @@ class ImportService {
                 await window.indexedDBService.init();
             }
 
-            // Paso 1: Obtener documentos de MSSQL
-            this.updateProgress('Obteniendo documentos...', 0, 100);
-            const documentos = await this.fetchDocumentosFromMSSQL(userInfo.codigo_vendedor_profit);
-    
-            // Paso 2: Obtener eventos de MSSQL
-            this.updateProgress('Obteniendo eventos...', 5, 100);
-            const events = await this.fetchEventsFromMSSQL(userInfo.codigo_vendedor_profit);
-
-            // Paso 2: Obtener clientes relacionados
-            this.updateProgress('Obteniendo clientes...', 10, 100);
-            const clientesCodes = [...new Set(documentos.map(doc => doc.co_cli))];
-            let clientes = await this.fetchClientesFromMSSQL(clientesCodes);
-
-            debugger;
-
-            clientes.map(cliente => {
-               cliente["contacts"] = [
-                 { 
-                   id: -1, 
-                   client_id: cliente.co_cli, 
-                   name: cliente.cli_des, 
-                   first_name: '', 
-                   last_name: '', 
-                   phones: (cliente.telefonos && cliente.telefonos.trim() != '') ? [
-                    {
-                        id: -1,
-                        phone: cliente.telefonos,
-                        phone_type: 'work'
-                    }
-                   ] : [], 
-                   emails: (cliente.email && cliente.email.trim() != '') ? [
-                    {
-                        id: -1,
-                        email: cliente.email,
-                        mail_type: 'work'
-                    }
-                   ] : [], 
-                   addresses: (cliente.direccion && cliente.direccion.trim() != '') ? [
-                    {
-                        id: -1,
-                        address: cliente.direccion,
-                        state: this.getAddressState(cliente),
-                        zipcode: cliente.zip,
-                        country_id: 1
-                    }
-                   ] : []
-                 }
-               ] 
-            });
+            // Con una sincronización previa del mismo vendedor solo se traen los cambios
+            const watermark = await window.indexedDBService.getSyncMetadata('sync_watermark');
+            const lastSeller = await window.indexedDBService.getSyncMetadata('codigo_vendedor_profit');
+            if (!full && watermark && lastSeller === userInfo.codigo_vendedor_profit) {
+                return await this.syncDeltaFromMSSQL(userInfo, watermark);
+            }
+
+            // Paso 1: Obtener documentos, eventos, clientes, vendedores, renglones y ventas
+            // mensuales: de la instantánea precalculada del vendedor si existe, si no de MSSQL
+            // en una sola respuesta (consultas en paralelo en el servidor)
+            const snapshot = await this.fetchSnapshotFromMSSQL(userInfo.codigo_vendedor_profit, 0, 40);
+            const data = snapshot || await this.fetchBootstrapFromMSSQL(userInfo.codigo_vendedor_profit, null, 0, 50);
+            const documentos = data.documentos;
+            const events = data.eventos;
+            let clientes = data.clientes;
+            const sellers = data.vendedores;
+            const lines = data.renglones;
+            const month_sales = data.ventas_mensuales;
+
+            this.addClientContacts(clientes);
 
             // Paso 2.1: Obtener contactos relacionados
             /*
@@ -186,18 +195,6 @@ class ImportService {
 
             */
 
-            // Paso 3: Obtener vendedores
-            this.updateProgress('Obteniendo vendedores...', 20, 100);
-            const sellers = await this.fetchSellersFromMSSQL();
-
-            // Paso 4: Obtener renglones de documentos
-            this.updateProgress('Obteniendo renglones de documentos...', 30, 100);
-            const lines = await this.fetchDocsDetailsFromMSSQL(userInfo.codigo_vendedor_profit);
-
-            // Paso: 5 Obtener Ventas Mensuales
-            this.updateProgress('Obteniendo ventas mensuales...', 40, 100);
-            const month_sales = await this.fetchMonthSalesFromMSSQL(userInfo.codigo_vendedor_profit);
-
             // Paso 6: Limpiar datos locales
             this.updateProgress('Limpiando datos locales...', 50, 100);
             await window.indexedDBService.clearAllData();
@@ -231,6 +228,7 @@ class ImportService {
             this.updateProgress('Finalizando...', 97, 100);
 
             await window.indexedDBService.setSyncMetadata('last_sync', new Date().toISOString());
+            await window.indexedDBService.setSyncMetadata('sync_watermark', data.watermark);
             await window.indexedDBService.setSyncMetadata('total_clientes', clientes.length);
             await window.indexedDBService.setSyncMetadata('total_documentos', documentos.length);
             await window.indexedDBService.setSyncMetadata('total_renglones_documentos', lines.length);
@@ -239,6 +237,11 @@ class ImportService {
             await window.indexedDBService.setSyncMetadata('nombre_completo', userInfo.nombre_completo);
             await window.indexedDBService.setSyncMetadata('codigo_vendedor_profit', userInfo.codigo_vendedor_profit);
 
+            // La instantánea se generó antes: se completa con los cambios posteriores
+            if (snapshot) {
+                await this.syncDeltaFromMSSQL(userInfo, data.watermark);
+            }
+
             this.updateProgress('Importación completada', 100, 100);
 
             return {
@@ -258,107 +261,254 @@ class ImportService {
         }
     }
 
-    async fetchDocumentosFromMSSQL(sellerCode) {
-        const response = await fetch(`${this.apiBaseUrl}/import/documentos/`, {
+    // Sincronización incremental: solo filas modificadas desde la marca de agua anterior
+    async syncDeltaFromMSSQL(userInfo, since) {
+        const sellerCode = userInfo.codigo_vendedor_profit;
+
+        // Los clientes llegan ya filtrados en el servidor: los de documentos modificados
+        // (sus saldos cambian) y los del vendedor modificados
+        const data = await this.fetchBootstrapFromMSSQL(sellerCode, since, 0, 70);
+        const documentos = data.documentos;
+        const events = data.eventos;
+        const clientes = data.clientes;
+        const sellers = data.vendedores;
+        const lines = data.renglones;
+        const month_sales = data.ventas_mensuales;
+        this.addClientContacts(clientes);
+
+        this.updateProgress('Aplicando cambios...', 70, 100);
+        const removed = documentos.filter(doc => doc.eliminado);
+        const changed = documentos.filter(doc => !doc.eliminado);
+
+        await window.indexedDBService.deleteByKeys('documentos', removed.map(doc => `${doc.tipo_doc}_${doc.nro_doc}`));
+        await window.indexedDBService.saveDocs(changed);
+
+        // Los renglones de un documento modificado llegan completos: se reemplazan
+        const docIds = documentos.map(doc => `${String(doc.empresa).trim()}-${doc.tipo_doc.trim()}-${doc.nro_doc}`);
+        await window.indexedDBService.deleteByIndex('renglones', 'doc_id', docIds);
+        await window.indexedDBService.saveDocLines(lines);
+
+        await window.indexedDBService.saveEvents(events);
+        await window.indexedDBService.saveClients(clientes);
+        await window.indexedDBService.saveSellers(sellers);
+
+        await window.indexedDBService.clearStore('ventas_mensuales');
+        await window.indexedDBService.saveMonthSales(month_sales);
+
+        this.updateProgress('Finalizando...', 95, 100);
+        await window.indexedDBService.setSyncMetadata('last_sync', new Date().toISOString());
+        await window.indexedDBService.setSyncMetadata('sync_watermark', data.watermark);
+
+        this.updateProgress('Sincronización completada', 100, 100);
+
+        return {
+            success: true,
+            incremental: true,
+            clientes_imported: clientes.length,
+            documentos_imported: changed.length,
+            documentos_removed: removed.length,
+            eventos_imported: events.length,
+            renglones_imported: lines.length,
+            timestamp: new Date().toISOString()
+        };
+    }
+
+    // Lee una respuesta en formato columnar (encabezado + bloques NDJSON) a medida que llega
+    // y la devuelve como lista de objetos. En meta.watermark queda la marca de agua del
+    // servidor para la próxima sincronización.
+    async fetchRows(path, body, errorMessage, meta = {}) {
+        const response = await fetch(`${this.apiBaseUrl}/import/${path}?format=columnar`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
                 'X-CSRFToken': this.getCsrfToken() || ''
             },
-            body: JSON.stringify({'sellerCode': sellerCode })
+            body: body !== undefined ? JSON.stringify(body) : undefined
         });
 
         if (!response.ok) {
-            throw new Error(`Error al obtener documentos: ${response.statusText}`);
+            throw new Error(`${errorMessage}: ${response.statusText}`);
         }
 
-        return await response.json();
+        meta.watermark = response.headers.get('X-Sync-Watermark');
+
+        const rows = [];
+        const decoder = this.columnarDecoder(rows);
+        const reader = response.body.getReader();
+        const textDecoder = new TextDecoder();
+        let pending = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            pending += textDecoder.decode(value, { stream: true });
+            const lines = pending.split('\n');
+            pending = lines.pop();
+            for (const line of lines) {
+                if (line) decoder(JSON.parse(line));
+            }
+        }
+
+        pending += textDecoder.decode();
+        if (pending.trim()) decoder(JSON.parse(pending));
+
+        return rows;
     }
 
-    async fetchEventsFromMSSQL(sellerCode) {
-        const response = await fetch(`${this.apiBaseUrl}/import/eventos/`, {
+    // POST /api/import/bootstrap/: todas las secciones intercaladas en una respuesta NDJSON.
+    // Retorna { documentos, eventos, clientes, vendedores, renglones, ventas_mensuales, watermark }
+    // y reporta el avance entre progressFrom y progressTo a medida que terminan las secciones.
+    async fetchBootstrapFromMSSQL(sellerCode, since = null, progressFrom = 0, progressTo = 50) {
+        this.updateProgress('Obteniendo datos...', progressFrom, 100);
+
+        const response = await fetch(`${this.apiBaseUrl}/import/bootstrap/`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
                 'X-CSRFToken': this.getCsrfToken() || ''
             },
-            body: JSON.stringify({'sellerCode': sellerCode })
+            body: JSON.stringify({ sellerCode: sellerCode, since: since })
         });
 
         if (!response.ok) {
-            throw new Error(`Error al obtener eventos: ${response.statusText}`);
+            throw new Error(`Error al obtener los datos: ${response.statusText}`);
         }
 
-        return await response.json();
+        return this.readBootstrapResponse(response, progressFrom, progressTo);
     }
 
-    async fetchClientesFromMSSQL(clientesCodes) {
-        const codesString = clientesCodes.map(code => `'${code}'`).join(',');
-       
-        const response = await fetch(`${this.apiBaseUrl}/import/clientes/`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                'X-CSRFToken': this.getCsrfToken() || ''
-            },
-            body: JSON.stringify({ list_codes: codesString })
-        });
+    // GET /api/import/snapshot/: instantánea precalculada en el mismo formato que bootstrap.
+    // El navegador la guarda en su cache y la revalida con ETag (un 304 no vuelve a
+    // descargarla). Retorna null si no hay instantánea para el vendedor.
+    async fetchSnapshotFromMSSQL(sellerCode, progressFrom = 0, progressTo = 50) {
+        this.updateProgress('Obteniendo datos...', progressFrom, 100);
 
+        const response = await fetch(`${this.apiBaseUrl}/import/snapshot/?sellerCode=${encodeURIComponent(sellerCode)}`);
         if (!response.ok) {
-            throw new Error(`Error al obtener clientes: ${response.statusText}`);
+            return null;
         }
 
-        return await response.json();
+        return this.readBootstrapResponse(response, progressFrom, progressTo);
     }
 
-    async fetchSellersFromMSSQL() {
-        const response = await fetch(`${this.apiBaseUrl}/import/sellers/`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                'X-CSRFToken': this.getCsrfToken() || ''
+    // Lee una respuesta en formato bootstrap (secciones columnares intercaladas)
+    async readBootstrapResponse(response, progressFrom, progressTo) {
+        const result = {};
+        const decoders = {};
+        let sections = [];
+        let completed = 0;
+        let finished = false;
+
+        const handle = (frame) => {
+            if (frame.format === 'bootstrap') {
+                if (frame.version !== 1) {
+                    throw new Error(`Formato de sincronización no soportado: v${frame.version}`);
+                }
+                sections = frame.sections;
+                result.watermark = frame.watermark;
+                for (const section of sections) {
+                    result[section] = [];
+                    decoders[section] = this.columnarDecoder(result[section]);
+                }
+            } else if (frame.error) {
+                throw new Error(`Error al obtener ${frame.s || 'los datos'}: ${frame.error}`);
+            } else if (frame.f) {
+                decoders[frame.s](frame.f);
+            } else if (frame.s && frame.end) {
+                completed += 1;
+                const current = progressFrom + Math.round((progressTo - progressFrom) * completed / sections.length);
+                this.updateProgress(`Recibido: ${frame.s} (${frame.rows})`, current, 100);
+            } else if (frame.end) {
+                finished = true;
             }
-        });
+        };
 
-        if (!response.ok) {
-            throw new Error(`Error al obtener Vendedores: ${response.statusText}`);
+        const reader = response.body.getReader();
+        const textDecoder = new TextDecoder();
+        let pending = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            pending += textDecoder.decode(value, { stream: true });
+            const lines = pending.split('\n');
+            pending = lines.pop();
+            for (const line of lines) {
+                if (line) handle(JSON.parse(line));
+            }
         }
 
-        return await response.json();
+        pending += textDecoder.decode();
+        if (pending.trim()) handle(JSON.parse(pending));
+
+        if (!finished) {
+            throw new Error('La sincronización se interrumpió antes de terminar');
+        }
+
+        return result;
     }
 
-    async fetchDocsDetailsFromMSSQL(sellerCode) {
-        const response = await fetch(`${this.apiBaseUrl}/import/document-details/`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                'X-CSRFToken': this.getCsrfToken() || ''
-            },
-            body: JSON.stringify({'sellerCode': sellerCode })
-        });
+    // Decodifica las líneas del formato columnar (versión 1) agregando las filas a rows
+    columnarDecoder(rows) {
+        let columns = null;
+        let dictionaries = [];
+
+        return (frame) => {
+            if (columns === null) {
+                if (frame.format !== 'columnar' || frame.version !== 1) {
+                    throw new Error(`Formato de importación no soportado: ${frame.format} v${frame.version}`);
+                }
+                columns = frame.columns;
+                dictionaries = frame.dictionary.map(column => ({ column, index: columns.indexOf(column), values: [] }));
+                return;
+            }
 
-        if (!response.ok) {
-            throw new Error(`Error al obtener los renglones de documentos: ${response.statusText}`);
-        }
+            for (const dictionary of dictionaries) {
+                const added = frame.d[dictionary.column];
+                if (added) dictionary.values.push(...added);
+            }
 
-        return await response.json();
+            for (const values of frame.r) {
+                for (const dictionary of dictionaries) {
+                    const code = values[dictionary.index];
+                    if (code !== null) values[dictionary.index] = dictionary.values[code];
+                }
+
+                const row = {};
+                for (let i = 0; i < columns.length; i++) {
+                    row[columns[i]] = values[i];
+                }
+                rows.push(row);
+            }
+        };
     }
 
-    async fetchMonthSalesFromMSSQL(sellerCode) {
-        const response = await fetch(`${this.apiBaseUrl}/import/month-sales/`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                'X-CSRFToken': this.getCsrfToken() || ''
-            },
-            body: JSON.stringify({'sellerCode': sellerCode })
-        });
+    async fetchDocumentosFromMSSQL(sellerCode, since = null, meta = {}) {
+        return this.fetchRows('documentos/', {'sellerCode': sellerCode, 'since': since }, 'Error al obtener documentos', meta);
+    }
 
-        if (!response.ok) {
-            throw new Error(`Error al obtener las ventas mensuales: ${response.statusText}`);
-        }
+    async fetchEventsFromMSSQL(sellerCode, since = null) {
+        return this.fetchRows('eventos/', {'sellerCode': sellerCode, 'since': since }, 'Error al obtener eventos');
+    }
 
-        return await response.json();
+    async fetchClientesFromMSSQL(clientesCodes, since = null, sellerCode = null) {
+        const codesString = clientesCodes.map(code => `'${code}'`).join(',');
+
+        return this.fetchRows('clientes/', { list_codes: codesString, since: since, sellerCode: sellerCode }, 'Error al obtener clientes');
+    }
+
+    async fetchSellersFromMSSQL() {
+        return this.fetchRows('sellers/', undefined, 'Error al obtener Vendedores');
+    }
+
+    async fetchDocsDetailsFromMSSQL(sellerCode, since = null) {
+        return this.fetchRows('document-details/', {'sellerCode': sellerCode, 'since': since }, 'Error al obtener los renglones de documentos');
+    }
+
+    async fetchMonthSalesFromMSSQL(sellerCode) {
+        return this.fetchRows('month-sales/', {'sellerCode': sellerCode }, 'Error al obtener las ventas mensuales');
     }
 
     updateProgress(step, current, total) {
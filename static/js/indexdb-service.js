@@ -140,6 +140,41 @@ class IndexedDBService {
         return transaction.complete;
     }
 
+    async deleteByKeys(storeName, keys) {
+        const transaction = this.db.transaction([storeName], 'readwrite');
+        const store = transaction.objectStore(storeName);
+
+        for (const key of keys) {
+            await store.delete(key);
+        }
+
+        return transaction.complete;
+    }
+
+    async deleteByIndex(storeName, indexName, values) {
+        const transaction = this.db.transaction([storeName], 'readwrite');
+        const index = transaction.objectStore(storeName).index(indexName);
+
+        for (const value of values) {
+            const keys = await new Promise((resolve, reject) => {
+                const request = index.getAllKeys(value);
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => reject(request.error);
+            });
+            for (const key of keys) {
+                transaction.objectStore(storeName).delete(key);
+            }
+        }
+
+        return transaction.complete;
+    }
+
+    async clearStore(storeName) {
+        const transaction = this.db.transaction([storeName], 'readwrite');
+        await transaction.objectStore(storeName).clear();
+        return transaction.complete;
+    }
+
     async getClientes() {
         const transaction = this.db.transaction(['clientes'], 'readonly');
         const store = transaction.objectStore('clientes');